@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""Decompressors for compressed data used by Apple formats."""
+
+import abc
+import struct
+import zlib
+
+import lz4.block
+
+try:
+  import liblzfse
+except ImportError:
+  liblzfse = None
+
+from dtformats import errors
+
+
+class Decompressor(object, metaclass=abc.ABCMeta):
+  """Decompressor interface."""
+
+  # Signatures of the compressed data supported by the decompressor.
+  SIGNATURES = ()
+
+  @abc.abstractmethod
+  def Decompress(self, compressed_data, uncompressed_data_size=None):
+    """Decompresses the data.
+
+    Args:
+      compressed_data (bytes): compressed data.
+      uncompressed_data_size (Optional[int]): expected size of the
+          uncompressed data or None if not known.
+
+    Returns:
+      tuple[bytes, int]: uncompressed data, as bytes or bytearray, and size of
+          the compressed data that was consumed.
+
+    Raises:
+      ParseError: if the data cannot be decompressed.
+    """
+
+
+class LZ4BlockStreamDecompressor(Decompressor):
+  """Apple LZ4 block stream decompressor.
+
+  An Apple LZ4 block stream consists of a chain of blocks, where each block
+  starts with a 4-byte marker:
+    bv41: LZ4 compressed block, followed by 32-bit uncompressed and compressed
+        data sizes;
+    bv4-: uncompressed block, followed by a 32-bit data size;
+    bv4$: end of stream.
+
+  Compressed blocks can refer to the uncompressed data of preceding blocks.
+  """
+
+  SIGNATURES = (b'bv41', b'bv4-')
+
+  _BLOCK_SIZES = struct.Struct('<II')
+
+  _BLOCK_SIZE = struct.Struct('<I')
+
+  # Maximum distance of a LZ4 back reference.
+  _MAXIMUM_DICTIONARY_SIZE = 65536
+
+  def _GetBlocks(self, compressed_data):
+    """Retrieves the blocks in the stream.
+
+    Args:
+      compressed_data (bytes): compressed data.
+
+    Returns:
+      tuple[list[tuple[bytes, int, int, int]], int]: blocks as tuples of
+          marker, data offset, compressed and uncompressed data size, and
+          the size of the compressed data up to and including the end of
+          stream marker.
+
+    Raises:
+      ParseError: if the blocks cannot be determined.
+    """
+    compressed_data_size = len(compressed_data)
+
+    blocks = []
+    data_offset = 0
+    while True:
+      marker = bytes(compressed_data[data_offset:data_offset + 4])
+
+      if marker == b'bv4$':
+        return blocks, data_offset + 4
+
+      if marker == b'bv41':
+        uncompressed_block_size, compressed_block_size = (
+            self._BLOCK_SIZES.unpack_from(compressed_data, data_offset + 4))
+        block_data_offset = data_offset + 12
+
+      elif marker == b'bv4-':
+        uncompressed_block_size = self._BLOCK_SIZE.unpack_from(
+            compressed_data, data_offset + 4)[0]
+        compressed_block_size = uncompressed_block_size
+        block_data_offset = data_offset + 8
+
+      elif not marker:
+        raise errors.ParseError(
+            'Missing LZ4 end of compressed data marker')
+
+      else:
+        raise errors.ParseError((
+            f'Unsupported LZ4 block marker at offset: 0x{data_offset:08x}'))
+
+      data_offset = block_data_offset + compressed_block_size
+      if data_offset > compressed_data_size:
+        raise errors.ParseError((
+            f'LZ4 block at offset: 0x{block_data_offset:08x} exceeds '
+            f'compressed data size'))
+
+      blocks.append((
+          marker, block_data_offset, compressed_block_size,
+          uncompressed_block_size))
+
+  def Decompress(self, compressed_data, uncompressed_data_size=None):
+    """Decompresses the data.
+
+    Args:
+      compressed_data (bytes): compressed data.
+      uncompressed_data_size (Optional[int]): expected size of the
+          uncompressed data or None if not known.
+
+    Returns:
+      tuple[bytearray, int]: uncompressed data and size of the compressed data
+          that was consumed.
+
+    Raises:
+      ParseError: if the data cannot be decompressed.
+    """
+    try:
+      blocks, compressed_data_size = self._GetBlocks(compressed_data)
+    except struct.error:
+      raise errors.ParseError('Truncated LZ4 block header')
+
+    total_size = sum(block[3] for block in blocks)
+    if (uncompressed_data_size is not None and
+        uncompressed_data_size != total_size):
+      raise errors.ParseError((
+          f'Mismatch between LZ4 uncompressed data size: {total_size:d} and '
+          f'expected size: {uncompressed_data_size:d}'))
+
+    compressed_data = memoryview(compressed_data)
+
+    if len(blocks) == 1 and blocks[0][0] == b'bv4-':
+      _, data_offset, block_size, _ = blocks[0]
+      return bytearray(compressed_data[data_offset:data_offset + block_size]), (
+          compressed_data_size)
+
+    uncompressed_data = bytearray(total_size)
+    uncompressed_view = memoryview(uncompressed_data)
+
+    uncompressed_data_offset = 0
+    for marker, data_offset, compressed_block_size, block_size in blocks:
+      block_data = compressed_data[
+          data_offset:data_offset + compressed_block_size]
+      block_end_offset = uncompressed_data_offset + block_size
+
+      if marker == b'bv4-':
+        uncompressed_view[uncompressed_data_offset:block_end_offset] = (
+            block_data)
+
+      else:
+        dictionary_offset = max(
+            0, uncompressed_data_offset - self._MAXIMUM_DICTIONARY_SIZE)
+        dictionary = uncompressed_view[
+            dictionary_offset:uncompressed_data_offset]
+
+        # The lz4 module cannot decompress into an existing buffer, hence the
+        # uncompressed block is copied into the preallocated buffer.
+        try:
+          block_data = lz4.block.decompress(
+              block_data, uncompressed_size=block_size, dict=dictionary)
+        except lz4.block.LZ4BlockError as exception:
+          raise errors.ParseError((
+              f'Unable to decompress LZ4 block at offset: '
+              f'0x{data_offset:08x} with error: {exception!s}'))
+
+        if len(block_data) != block_size:
+          raise errors.ParseError((
+              f'Mismatch in size of LZ4 block at offset: '
+              f'0x{data_offset:08x}'))
+
+        uncompressed_view[uncompressed_data_offset:block_end_offset] = (
+            block_data)
+
+      uncompressed_data_offset = block_end_offset
+
+    return uncompressed_data, compressed_data_size
+
+
+class LZFSEDecompressor(Decompressor):
+  """Apple LZFSE decompressor.
+
+  Requires the optional liblzfse Python module.
+  """
+
+  SIGNATURES = (b'bvx-', b'bvx1', b'bvx2', b'bvxn')
+
+  def Decompress(self, compressed_data, uncompressed_data_size=None):
+    """Decompresses the data.
+
+    Args:
+      compressed_data (bytes): compressed data.
+      uncompressed_data_size (Optional[int]): expected size of the
+          uncompressed data or None if not known.
+
+    Returns:
+      tuple[bytes, int]: uncompressed data and size of the compressed data
+          that was consumed.
+
+    Raises:
+      ParseError: if the data cannot be decompressed.
+    """
+    if not liblzfse:
+      raise errors.ParseError(
+          'Unable to decompress LZFSE data, missing liblzfse module')
+
+    try:
+      uncompressed_data = liblzfse.decompress(bytes(compressed_data))
+    except Exception as exception:  # pylint: disable=broad-except
+      raise errors.ParseError((
+          f'Unable to decompress LZFSE data with error: {exception!s}'))
+
+    if (uncompressed_data_size is not None and
+        len(uncompressed_data) != uncompressed_data_size):
+      raise errors.ParseError((
+          f'Mismatch between LZFSE uncompressed data size: '
+          f'{len(uncompressed_data):d} and expected size: '
+          f'{uncompressed_data_size:d}'))
+
+    return uncompressed_data, len(compressed_data)
+
+
+class ZlibDecompressor(Decompressor):
+  """Zlib decompressor."""
+
+  # Zlib data with a 32k window starts with 0x78 followed by a check byte.
+  SIGNATURES = (b'\x78\x01', b'\x78\x5e', b'\x78\x9c', b'\x78\xda')
+
+  def Decompress(self, compressed_data, uncompressed_data_size=None):
+    """Decompresses the data.
+
+    Args:
+      compressed_data (bytes): compressed data.
+      uncompressed_data_size (Optional[int]): expected size of the
+          uncompressed data or None if not known.
+
+    Returns:
+      tuple[bytes, int]: uncompressed data and size of the compressed data
+          that was consumed.
+
+    Raises:
+      ParseError: if the data cannot be decompressed.
+    """
+    decompressor = zlib.decompressobj()
+
+    try:
+      uncompressed_data = decompressor.decompress(compressed_data)
+    except zlib.error as exception:
+      raise errors.ParseError((
+          f'Unable to decompress zlib data with error: {exception!s}'))
+
+    if (uncompressed_data_size is not None and
+        len(uncompressed_data) != uncompressed_data_size):
+      raise errors.ParseError((
+          f'Mismatch between zlib uncompressed data size: '
+          f'{len(uncompressed_data):d} and expected size: '
+          f'{uncompressed_data_size:d}'))
+
+    compressed_data_size = len(compressed_data) - len(
+        decompressor.unused_data)
+
+    return uncompressed_data, compressed_data_size
+
+
+class DecompressorManager(object):
+  """Decompressor manager."""
+
+  _decompressors_by_signature = {}
+
+  @classmethod
+  def DeregisterDecompressor(cls, decompressor_class):
+    """Deregisters a decompressor class.
+
+    Args:
+      decompressor_class (type): decompressor class.
+
+    Raises:
+      KeyError: if the decompressor class is not registered.
+    """
+    for signature in decompressor_class.SIGNATURES:
+      decompressor = cls._decompressors_by_signature.get(signature, None)
+      if not isinstance(decompressor, decompressor_class):
+        raise KeyError((
+            f'Decompressor class: {decompressor_class.__name__:s} not set '
+            f'for signature: {signature!r}'))
+
+    for signature in decompressor_class.SIGNATURES:
+      del cls._decompressors_by_signature[signature]
+
+  @classmethod
+  def Decompress(cls, compressed_data, uncompressed_data_size=None):
+    """Decompresses data based on its signature.
+
+    Args:
+      compressed_data (bytes): compressed data.
+      uncompressed_data_size (Optional[int]): expected size of the
+          uncompressed data or None if not known.
+
+    Returns:
+      tuple[bytes, int]: uncompressed data and size of the compressed data
+          that was consumed.
+
+    Raises:
+      ParseError: if the data cannot be decompressed.
+    """
+    decompressor = cls.GetDecompressor(compressed_data)
+    if not decompressor:
+      signature = bytes(compressed_data[:4])
+      raise errors.ParseError(
+          f'Unsupported compressed data signature: {signature!r}')
+
+    return decompressor.Decompress(
+        compressed_data, uncompressed_data_size=uncompressed_data_size)
+
+  @classmethod
+  def GetDecompressor(cls, compressed_data):
+    """Retrieves the decompressor for specific compressed data.
+
+    Args:
+      compressed_data (bytes): compressed data.
+
+    Returns:
+      Decompressor: decompressor or None if the compressed data is not
+          supported.
+    """
+    signature = bytes(compressed_data[:4])
+    decompressor = cls._decompressors_by_signature.get(signature, None)
+    if not decompressor:
+      decompressor = cls._decompressors_by_signature.get(signature[:2], None)
+
+    return decompressor
+
+  @classmethod
+  def RegisterDecompressor(cls, decompressor_class):
+    """Registers a decompressor class.
+
+    Args:
+      decompressor_class (type): decompressor class.
+
+    Raises:
+      KeyError: if a decompressor is already registered for one of the
+          signatures of the decompressor class.
+    """
+    for signature in decompressor_class.SIGNATURES:
+      if signature in cls._decompressors_by_signature:
+        raise KeyError(
+            f'Decompressor already set for signature: {signature!r}')
+
+    decompressor = decompressor_class()
+    for signature in decompressor_class.SIGNATURES:
+      cls._decompressors_by_signature[signature] = decompressor
+
+
+DecompressorManager.RegisterDecompressor(LZ4BlockStreamDecompressor)
+DecompressorManager.RegisterDecompressor(LZFSEDecompressor)
+DecompressorManager.RegisterDecompressor(ZlibDecompressor)
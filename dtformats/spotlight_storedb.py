@@ -1,9 +1,16 @@
 # -*- coding: utf-8 -*-
 """Apple Spotlight store database files."""
 
-import zlib
+import array
+import bisect
+import collections
+import json
+import logging
+import os
+import struct
+import sys
 
-import lz4.block
+from concurrent import futures
 
 from dfdatetime import cocoa_time as dfdatetime_cocoa_time
 from dfdatetime import posix_time as dfdatetime_posix_time
@@ -11,6 +18,7 @@ from dtfabric import errors as dtfabric_errors
 from dtfabric.runtime import data_maps as dtfabric_data_maps
 
 from dtformats import data_format
+from dtformats import decompressors
 from dtformats import errors
 
 
@@ -54,6 +62,37 @@ class SpotlightStoreMetadataItem(object):
     self.parent_identifier = 0
 
 
+class SpotlightStorePropertyValue(object):
+  """Property value read from property pages or an index cache.
+
+  Attributes:
+    key_name (str): key name of a metadata type.
+    property_type (int): property type of a metadata type.
+    table_index (int): table index.
+    value_name (str): value name of a metadata value.
+    value_type (int): value type of a metadata type.
+    values_list (list[str]): values of a metadata list or localized strings.
+  """
+
+  __slots__ = (
+      'key_name', 'property_type', 'table_index', 'value_name', 'value_type',
+      'values_list')
+
+  def __init__(self, table_index):
+    """Initializes a property value.
+
+    Args:
+      table_index (int): table index.
+    """
+    super(SpotlightStorePropertyValue, self).__init__()
+    self.key_name = None
+    self.property_type = None
+    self.table_index = table_index
+    self.value_name = None
+    self.value_type = None
+    self.values_list = None
+
+
 class SpotlightStoreRecordDescriptor(object):
   """Record descriptor.
 
@@ -86,6 +125,183 @@ class SpotlightStoreRecordDescriptor(object):
     self.parent_identifier = 0
 
 
+class SpotlightStoreRecordDescriptorTable(object):
+  """Record descriptor table.
+
+  The record descriptor values are stored in columns of unsigned 64-bit
+  integers, which are sorted by identifier before they are looked up.
+  """
+
+  # Names of the record descriptor attributes per column.
+  COLUMN_NAMES = (
+      'identifier', 'item_identifier', 'last_update_time', 'page_offset',
+      'page_value_offset', 'parent_identifier')
+
+  def __init__(self, columns=None):
+    """Initializes a record descriptor table.
+
+    Args:
+      columns (Optional[list[array.array]]): values of the record descriptors
+          per column, in the order of COLUMN_NAMES, sorted by identifier and
+          without duplicate identifiers.
+    """
+    super(SpotlightStoreRecordDescriptorTable, self).__init__()
+    self._columns = columns or [
+        array.array('Q') for _ in self.COLUMN_NAMES]
+    self._is_sorted = True
+
+  @property
+  def number_of_records(self):
+    """int: number of record descriptors."""
+    self._SortColumns()
+    return len(self._columns[0])
+
+  def _GetIndex(self, identifier):
+    """Retrieves the index of a specific record descriptor.
+
+    Args:
+      identifier (int): record identifier.
+
+    Returns:
+      int: index of the record descriptor in the columns or None if not
+          available.
+    """
+    self._SortColumns()
+
+    identifiers = self._columns[0]
+
+    index = bisect.bisect_left(identifiers, identifier)
+    if index >= len(identifiers) or identifiers[index] != identifier:
+      return None
+
+    return index
+
+  def _SortColumns(self):
+    """Sorts the columns by identifier.
+
+    When a record identifier was added multiple times, only the record
+    descriptor that was added last is kept.
+    """
+    if self._is_sorted:
+      return
+
+    identifiers = self._columns[0]
+
+    # Sorting is stable hence the last index per identifier is the last added.
+    sorted_indexes = array.array('Q', sorted(
+        range(len(identifiers)), key=identifiers.__getitem__))
+
+    last_sorted_index = len(sorted_indexes) - 1
+    unique_indexes = array.array('Q', (
+        index for sorted_index, index in enumerate(sorted_indexes)
+        if sorted_index == last_sorted_index or
+        identifiers[sorted_indexes[sorted_index + 1]] != identifiers[index]))
+
+    del sorted_indexes
+
+    self._columns = [
+        array.array('Q', map(column.__getitem__, unique_indexes))
+        for column in self._columns]
+
+    self._is_sorted = True
+
+  def AddRecordDescriptor(
+      self, identifier, item_identifier, last_update_time, page_offset,
+      page_value_offset, parent_identifier):
+    """Adds a record descriptor.
+
+    Args:
+      identifier (int): record identifier.
+      item_identifier (int): item identifier.
+      last_update_time (int): record last update time.
+      page_offset (int): offset of the page containing the record, relative to
+          the start of the file.
+      page_value_offset (int): offset of the page value containing the record,
+          relative to the start of the page.
+      parent_identifier (int): parent identifier.
+    """
+    identifiers = self._columns[0]
+    if self._is_sorted and identifiers and identifiers[-1] >= identifier:
+      self._is_sorted = False
+
+    for column, value in zip(self._columns, (
+        identifier, item_identifier, last_update_time, page_offset,
+        page_value_offset, parent_identifier)):
+      column.append(value)
+
+  def GetColumns(self):
+    """Retrieves the columns.
+
+    Returns:
+      list[array.array]: values of the record descriptors per column, in the
+          order of COLUMN_NAMES, sorted by identifier.
+    """
+    self._SortColumns()
+    return list(self._columns)
+
+  def GetIdentifiers(self):
+    """Retrieves the record identifiers.
+
+    Returns:
+      array.array: record identifiers in ascending order.
+    """
+    self._SortColumns()
+    return self._columns[0]
+
+  def GetParentIdentifier(self, identifier):
+    """Retrieves the parent identifier of a specific record.
+
+    Args:
+      identifier (int): record identifier.
+
+    Returns:
+      int: parent identifier or None if no such record.
+    """
+    index = self._GetIndex(identifier)
+    if index is None:
+      return None
+
+    return self._columns[5][index]
+
+  def GetRecordDescriptor(self, identifier):
+    """Retrieves a specific record descriptor.
+
+    Args:
+      identifier (int): record identifier.
+
+    Returns:
+      SpotlightStoreRecordDescriptor: record descriptor or None if no such
+          record.
+    """
+    index = self._GetIndex(identifier)
+    if index is None:
+      return None
+
+    (identifier, item_identifier, last_update_time, page_offset,
+     page_value_offset, parent_identifier) = [
+         column[index] for column in self._columns]
+
+    record_descriptor = SpotlightStoreRecordDescriptor(
+        page_offset, page_value_offset)
+    record_descriptor.identifier = identifier
+    record_descriptor.item_identifier = item_identifier
+    record_descriptor.last_update_time = last_update_time
+    record_descriptor.parent_identifier = parent_identifier
+
+    return record_descriptor
+
+  def HasIdentifier(self, identifier):
+    """Determines if the table contains a specific record.
+
+    Args:
+      identifier (int): record identifier.
+
+    Returns:
+      bool: True if the table contains the record.
+    """
+    return self._GetIndex(identifier) is not None
+
+
 class SpotlightStoreRecordHeader(object):
   """Record header.
 
@@ -186,27 +402,75 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
       ('compressed_data_size', 'Compressed data size',
        '_FormatIntegerAsDecimal')]
 
-  def __init__(self, debug=False, output_writer=None):
+  _INDEX_CACHE_SIGNATURE = b'dtfsidx1'
+
+  # Format version of the index cache, which is part of the cache key.
+  _INDEX_CACHE_FORMAT_VERSION = 1
+
+  _INDEX_CACHE_HEADER = struct.Struct('<8sI')
+
+  # Number of additional bytes and bitmask of the value bits in the first
+  # byte per first byte of a variable size integer.
+  _VARIABLE_SIZE_INTEGER_SIZES = tuple(
+      (0, 0x7f) if byte_value < 0x80 else
+      (1, 0x3f) if byte_value < 0xc0 else
+      (2, 0x1f) if byte_value < 0xe0 else
+      (3, 0x0f) if byte_value < 0xf0 else
+      (4, 0x07) if byte_value < 0xf8 else
+      (5, 0x00) if byte_value < 0xfc else
+      (6, 0x00) if byte_value < 0xfe else
+      (7, 0x00) if byte_value < 0xff else
+      (8, 0x00) for byte_value in range(256))
+
+  # The maximum size of the uncompressed record pages in the cache.
+  _MAXIMUM_RECORD_PAGES_CACHE_SIZE = 64 * 1024 * 1024
+
+  _PROPERTY_PAGE_HEADER = struct.Struct('<4sIIII')
+
+  _PROPERTY_VALUES_HEADER = struct.Struct('<IQ')
+
+  _PROPERTY_VALUE11 = struct.Struct('<IBB')
+
+  _PROPERTY_VALUE_TABLE_INDEX = struct.Struct('<I')
+
+  # The size of the contiguous reads of property pages.
+  _PROPERTY_PAGES_READ_SIZE = 16 * 0x1000
+
+  def __init__(
+      self, debug=False, output_writer=None, number_of_threads=1,
+      index_cache_path=None):
     """Initializes a binary data file.
 
     Args:
       debug (Optional[bool]): True if debug information should be written.
       output_writer (Optional[OutputWriter]): output writer.
+      number_of_threads (Optional[int]): number of threads to decompress
+          record pages with, where 1 represents decompressing record pages
+          without additional threads.
+      index_cache_path (Optional[str]): path of the index cache file, which
+          contains the record descriptors and property tables of a previous
+          read of the same file, or None to not use an index cache.
     """
     super(AppleSpotlightStoreDatabaseFile, self).__init__(
         debug=debug, output_writer=output_writer)
+    self._file_names = None
+    self._index_cache_path = index_cache_path
     self._map_values = []
     self._metadata_lists = {}
     self._metadata_localized_strings = {}
+    self._metadata_type_indexes_by_key_names = {}
     self._metadata_types = {}
     self._metadata_values = {}
-    self._record_descriptors = {}
-    self._record_pages_cache = {}
+    self._number_of_threads = number_of_threads
+    self._paths = {}
+    self._record_descriptors = SpotlightStoreRecordDescriptorTable()
+    self._record_pages_cache = collections.OrderedDict()
+    self._record_pages_cache_size = 0
 
   @property
   def number_of_metadata_items(self):
     """int: number of metadata items in the database."""
-    return len(self._record_descriptors)
+    return self._record_descriptors.number_of_records
 
   def _DebugPrintCocoaTimeValue(self, description, value):
     """Prints a Cocoa timestamp value for debugging.
@@ -329,12 +593,51 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
 
     self._DebugPrintValue(description, date_time_string)
 
-  def _DecompressLZ4PageData(self, compressed_page_data, file_offset):
-    """Decompresses LZ4 compressed page data.
+  def _DebugPrintPropertyPageHeader(self, data, page_offset, file_offset):
+    """Prints property page header debug information.
 
     Args:
-      compressed_page_data (bytes): LZ4 compressed page data.
-      file_offset (int): file offset.
+      data (bytes): data containing the property page.
+      page_offset (int): offset of the property page relative to the start of
+          the data.
+      file_offset (int): offset of the property page relative to the start of
+          the file.
+    """
+    data_type_map = self._GetDataTypeMap(
+        'spotlight_store_db_property_page_header')
+
+    page_header = self._ReadStructureFromByteStream(
+        data[page_offset:page_offset + 20], file_offset, data_type_map,
+        'property page header')
+
+    block_number = int(file_offset / 0x1000)
+    self._DebugPrintDecimalValue('Block number', block_number)
+
+    page_number = int(file_offset / page_header.page_size)
+    self._DebugPrintDecimalValue('Page number', page_number)
+
+    self._DebugPrintText('\n')
+
+    self._DebugPrintStructureObject(
+        page_header, self._DEBUG_INFO_PROPERTY_PAGE_HEADER)
+
+    data_type_map = self._GetDataTypeMap(
+        'spotlight_store_db_property_values_header')
+
+    page_values_header = self._ReadStructureFromByteStream(
+        data[page_offset + 20:page_offset + 32], file_offset + 20,
+        data_type_map, 'property values header')
+
+    self._DebugPrintStructureObject(
+        page_values_header, self._DEBUG_INFO_PROPERTY_VALUES_HEADER)
+
+  def _DecompressRecordPageData(self, page_header, page_data, file_offset):
+    """Decompresses record page data.
+
+    Args:
+      page_header (spotlight_store_db_property_page_header): page header.
+      page_data (bytes): page data.
+      file_offset (int): file offset of the page data.
 
     Returns:
       bytes: uncompressed page data.
@@ -342,34 +645,38 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the page data cannot be decompressed.
     """
-    data_type_map = self._GetDataTypeMap('spotlight_store_db_lz4_block_header')
+    if page_header.uncompressed_page_size > 0:
+      compressed_page_data = page_data
 
-    try:
-      lz4_block_header = data_type_map.MapByteStream(compressed_page_data)
-    except dtfabric_errors.MappingError as exception:
-      raise errors.ParseError((
-          f'Unable to map LZ4 block header at offset: 0x{file_offset:08x} '
-          f'with error: {exception!s}'))
+      if self._debug and compressed_page_data[0:4] == b'bv41':
+        data_type_map = self._GetDataTypeMap(
+            'spotlight_store_db_lz4_block_header')
 
-    if self._debug:
-      self._DebugPrintStructureObject(
-          lz4_block_header, self._DEBUG_INFO_LZ4_BLOCK_HEADER)
+        try:
+          lz4_block_header = data_type_map.MapByteStream(compressed_page_data)
+        except dtfabric_errors.MappingError as exception:
+          raise errors.ParseError((
+              f'Unable to map LZ4 block header at offset: '
+              f'0x{file_offset:08x} with error: {exception!s}'))
 
-    end_of_compressed_data_offset = (
-        12 + lz4_block_header.compressed_data_size)
+        self._DebugPrintStructureObject(
+            lz4_block_header, self._DEBUG_INFO_LZ4_BLOCK_HEADER)
 
-    page_data = lz4.block.decompress(
-        compressed_page_data[12:end_of_compressed_data_offset],
-        uncompressed_size=lz4_block_header.uncompressed_data_size)
+      decompressor = decompressors.DecompressorManager.GetDecompressor(
+          compressed_page_data)
+      if not decompressor:
+        if self._debug:
+          self._DebugPrintData('Data', page_data)
 
-    end_of_compressed_data_identifier = compressed_page_data[
-        end_of_compressed_data_offset:end_of_compressed_data_offset + 4]
+        raise errors.ParseError((
+            f'Unsupported compression type at offset: 0x{file_offset:08x}'))
 
-    if end_of_compressed_data_identifier != b'bv4$':
-      file_offset += end_of_compressed_data_offset
-      raise errors.ParseError((
-          f'Unsupported LZ4 end of compressed data marker at offset: '
-          f'0x{file_offset:08x}'))
+      try:
+        page_data, _ = decompressor.Decompress(compressed_page_data)
+      except errors.ParseError as exception:
+        raise errors.ParseError((
+            f'Unable to decompress page data at offset: 0x{file_offset:08x} '
+            f'with error: {exception!s}'))
 
     return page_data
 
@@ -384,18 +691,46 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
     """
     return stream.decode('ascii').replace('\x00', '\\x00')
 
-  def _GetMetadataItemByIdentifier(self, file_object, identifier):
+  def _GetIndexCacheKey(self, file_header):
+    """Retrieves the key that identifies the index cache of the file.
+
+    Args:
+      file_header (spotlight_store_db_file_header): file header.
+
+    Returns:
+      list[object]: index cache key or None if the file cannot be identified.
+    """
+    if not self._path:
+      return None
+
+    stat_object = os.stat(self._path)
+
+    return [
+        self._INDEX_CACHE_FORMAT_VERSION, stat_object.st_size,
+        stat_object.st_mtime_ns, file_header.flags, file_header.map_offset,
+        file_header.map_size, file_header.page_size,
+        file_header.metadata_types_block_number,
+        file_header.metadata_values_block_number,
+        file_header.metadata_lists_block_number,
+        file_header.metadata_localized_strings_block_number]
+
+  def _GetMetadataItemByIdentifier(
+      self, file_object, identifier, metadata_type_indexes=None):
     """Retrieves a specific metadata item.
 
     Args:
       file_object (file): file-like object.
       identifier (int): file (system) entry identifier of the metadata item.
+      metadata_type_indexes (Optional[frozenset[int]]): indexes of the metadata
+          types of the metadata attributes to read, or None to read all
+          metadata attributes.
 
     Returns:
       SpotlightStoreMetadataItem: metadata item matching the identifier or None
           if no such item.
     """
-    record_descriptor = self._record_descriptors.get(identifier, None)
+    record_descriptor = self._record_descriptors.GetRecordDescriptor(
+        identifier)
     if not record_descriptor:
       return None
 
@@ -406,132 +741,374 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
           f'0x{record_descriptor.page_value_offset:04x}\n'))
       self._DebugPrintText('\n')
 
-    page_data = self._record_pages_cache.get(
-        record_descriptor.page_offset, None)
-    if not page_data:
-      _, page_data = self._ReadRecordPage(
-          file_object, record_descriptor.page_offset)
+    page_data = self._GetRecordPageData(
+        file_object, record_descriptor.page_offset)
 
-      # TODO: remove page from cache if full.
-      self._record_pages_cache[record_descriptor.page_offset] = page_data
+    return self._ReadRecord(
+        page_data, record_descriptor.page_value_offset,
+        metadata_type_indexes=metadata_type_indexes)
 
-    return self._ReadRecord(page_data, record_descriptor.page_value_offset)
+  def _GetMetadataTypeIndexes(self, key_names):
+    """Retrieves the indexes of the metadata types with specific key names.
 
-  def _ReadFileHeader(self, file_object):
-    """Reads the file header.
+    Args:
+      key_names (set[str]): key names of the metadata attributes.
+
+    Returns:
+      frozenset[int]: indexes of the metadata types.
+    """
+    key_names = frozenset(key_names)
+
+    metadata_type_indexes = self._metadata_type_indexes_by_key_names.get(
+        key_names, None)
+    if metadata_type_indexes is None:
+      metadata_type_indexes = frozenset(
+          table_index for table_index, metadata_type in (
+              self._metadata_types.items())
+          if getattr(metadata_type, 'key_name', None) in key_names)
+
+      self._metadata_type_indexes_by_key_names[key_names] = (
+          metadata_type_indexes)
+
+    return metadata_type_indexes
+
+  def _GetParentIdentifier(self, identifier):
+    """Retrieves the parent identifier of a file system entry metadata item.
+
+    Args:
+      identifier (int): file (system) entry identifier of the metadata item.
+
+    Returns:
+      int: file system entry identifier of the parent or None if the metadata
+          item has no parent file system entry.
+    """
+    parent_identifier = self._record_descriptors.GetParentIdentifier(
+        identifier)
+    if parent_identifier is None or parent_identifier <= 1:
+      return None
+
+    return parent_identifier
+
+  def _GetPathOfParent(self, identifier):
+    """Retrieves the path of the parent of a specific metadata item.
+
+    The paths of the parents are cached, hence the path of a parent is only
+    determined once.
+
+    Args:
+      identifier (int): file (system) entry identifier of the metadata item.
+
+    Returns:
+      str: path of the parent, which is an empty string for the root.
+    """
+    identifiers = []
+
+    parent_identifier = self._GetParentIdentifier(identifier)
+    parent_path = ''
+
+    while parent_identifier is not None:
+      parent_path = self._paths.get(parent_identifier, None)
+      if parent_path is not None:
+        break
+
+      # Prevent a loop of parent identifiers.
+      if parent_identifier in identifiers:
+        parent_path = ''
+        break
+
+      identifiers.append(parent_identifier)
+      parent_identifier = self._GetParentIdentifier(parent_identifier)
+
+    if parent_path is None:
+      parent_path = ''
+
+    for parent_identifier in reversed(identifiers):
+      file_name = self._file_names.get(parent_identifier, None) or '(null)'
+      parent_path = '/'.join([parent_path, file_name])
+
+      self._paths[parent_identifier] = parent_path
+
+    return parent_path
+
+  def _GetRecordPageData(self, file_object, page_offset):
+    """Retrieves the uncompressed data of a specific record page.
+
+    Record pages are cached in least recently used order, up to a total
+    uncompressed data size of _MAXIMUM_RECORD_PAGES_CACHE_SIZE.
 
     Args:
       file_object (file): file-like object.
+      page_offset (int): offset of the record page, relative to the start of
+          the file.
 
     Returns:
-      spotlight_store_db_file_header: file header.
+      bytes: uncompressed page data.
 
     Raises:
-      ParseError: if the file header cannot be read.
+      ParseError: if the record page cannot be read.
     """
-    data_type_map = self._GetDataTypeMap('spotlight_store_db_file_header')
+    page_data = self._record_pages_cache.get(page_offset, None)
+    if page_data is not None:
+      self._record_pages_cache.move_to_end(page_offset)
+      return page_data
 
-    file_header, file_header_size = self._ReadStructureFromFileObject(
-        file_object, 0, data_type_map, 'file header')
+    _, page_data = self._ReadRecordPage(file_object, page_offset)
 
-    if self._debug:
-      self._DebugPrintStructureObject(file_header, self._DEBUG_INFO_FILE_HEADER)
+    self._record_pages_cache[page_offset] = page_data
+    self._record_pages_cache_size += len(page_data)
 
-    if self._debug:
-      trailing_data = file_object.read(
-          file_header.map_offset - file_header_size)
-      self._DebugPrintData('Trailing data', trailing_data)
+    # The most recently read page is kept even if it exceeds the maximum size.
+    while (len(self._record_pages_cache) > 1 and
+           self._record_pages_cache_size > (
+               self._MAXIMUM_RECORD_PAGES_CACHE_SIZE)):
+      _, cached_page_data = self._record_pages_cache.popitem(last=False)
+      self._record_pages_cache_size -= len(cached_page_data)
 
-    return file_header
+    return page_data
 
-  def _ReadIndexPageValues(self, page_header, page_data, property_table):
-    """Reads the index page values.
+  def _ParsePropertyPageValues(
+      self, property_table_type, data, data_offset, data_end_offset,
+      property_table):
+    """Parses the values of a property page.
 
     Args:
-      page_header (spotlight_store_db_property_page_header): page header.
-      page_data (bytes): page data.
-      property_table (dict[int, object]): property table in which to store the
-          property page values.
+      property_table_type (int): property table type.
+      data (bytes): data containing the property page.
+      data_offset (int): offset of the first property value relative to the
+          start of the data.
+      data_end_offset (int): offset of the end of the property values relative
+          to the start of the data.
+      property_table (dict[int, SpotlightStorePropertyValue]): property table
+          in which to store the property page values.
 
     Raises:
-      ParseError: if the property page values cannot be read.
+      ParseError: if the property page values cannot be parsed.
     """
-    data_type_map = self._GetDataTypeMap('spotlight_store_db_property_value81')
-    index_values_data_type_map = self._GetDataTypeMap(
-        'spotlight_store_db_index_values')
+    if property_table_type not in (0x00000011, 0x00000021, 0x00000081):
+      return
 
-    page_data_offset = 12
-    page_data_size = page_header.used_page_size - 20
+    intern = sys.intern
+    metadata_values = self._metadata_values
     page_value_index = 0
 
-    while page_data_offset < page_data_size:
+    while data_offset < data_end_offset:
+      property_value_offset = data_offset
+
       try:
-        property_value = data_type_map.MapByteStream(
-            page_data[page_data_offset:])
-      except dtfabric_errors.MappingError as exception:
+        if property_table_type == 0x00000011:
+          table_index, value_type, property_type = (
+              self._PROPERTY_VALUE11.unpack_from(data, data_offset))
+          string_offset = data_offset + 6
+
+        else:
+          table_index = self._PROPERTY_VALUE_TABLE_INDEX.unpack_from(
+              data, data_offset)[0]
+          string_offset = data_offset + 4
+
+      except struct.error:
         raise errors.ParseError((
-            f'Unable to map property value data at offset: '
-            f'0x{page_data_offset:08x} with error: {exception!s}'))
+            f'Unable to parse property value at offset: '
+            f'0x{data_offset:08x}'))
 
-      page_value_size = 4
+      property_value = SpotlightStorePropertyValue(table_index)
 
-      index_size, bytes_read = self._ReadVariableSizeInteger(
-          page_data[page_data_offset + page_value_size:])
+      if property_table_type == 0x00000081:
+        index_size, index_data_offset = self._ReadVariableSizeIntegerAtOffset(
+            data, string_offset)
 
-      _, padding_size = divmod(index_size, 4)
+        _, padding_size = divmod(index_size, 4)
 
-      page_value_size += bytes_read + padding_size
-      index_size -= padding_size
+        index_data_offset += padding_size
+        data_offset = index_data_offset + index_size - padding_size
+        if data_offset > data_end_offset:
+          raise errors.ParseError((
+              f'Index data at offset: 0x{index_data_offset:08x} exceeds '
+              f'property page'))
 
-      context = dtfabric_data_maps.DataTypeMapContext(values={
-          'index_size': index_size})
+        index_values = array.array('I')
+        index_values.frombytes(data[index_data_offset:data_offset])
+        if sys.byteorder != 'little':
+          index_values.byteswap()
 
-      try:
-        index_values = index_values_data_type_map.MapByteStream(
-            page_data[page_data_offset + page_value_size:], context=context)
+        values_list = []
+        for metadata_value_index in index_values:
+          metadata_value = metadata_values.get(metadata_value_index, None)
+          values_list.append(getattr(metadata_value, 'value_name', ''))
 
-      except dtfabric_errors.MappingError as exception:
-        page_data_offset += page_value_size
-        raise errors.ParseError((
-            f'Unable to parse index data at offset: 0x{page_data_offset:08x} '
-            f'with error: {exception!s}'))
+        property_value.values_list = values_list
 
-      page_value_size += index_size
+        if self._debug:
+          self._DebugPrintData(
+              f'Page value: {page_value_index:d} data',
+              data[property_value_offset:data_offset])
 
-      if self._debug:
-        self._DebugPrintData(
-            f'Page value: {page_value_index:d} data',
-            page_data[page_data_offset:page_data_offset + page_value_size])
+          self._DebugPrintDecimalValue('Table index', table_index)
+          self._DebugPrintDecimalValue('Index size', index_size - padding_size)
 
-      values_list = []
-      for metadata_value_index in index_values:
-        metadata_value = self._metadata_values.get(metadata_value_index, None)
-        value_string = getattr(metadata_value, 'value_name', '')
-        values_list.append(value_string)
+          value_string = self._FormatArrayOfIntegersAsDecimals(index_values)
+          self._DebugPrintValue('Index values', value_string)
+          self._DebugPrintText('\n')
 
-      setattr(property_value, 'values_list', values_list)
+          for metadata_value_index, value_string in zip(
+              index_values, values_list):
+            self._DebugPrintValue(
+                f'Value: {metadata_value_index:d}', value_string)
 
-      if self._debug:
-        self._DebugPrintDecimalValue('Table index', property_value.table_index)
-        self._DebugPrintDecimalValue('Index size', index_size)
+          self._DebugPrintText('\n')
 
-        value_string = self._FormatArrayOfIntegersAsDecimals(index_values)
-        self._DebugPrintValue('Index values', value_string)
-        self._DebugPrintText('\n')
+      else:
+        string_end_offset = data.find(b'\x00', string_offset, data_end_offset)
+        if string_end_offset == -1:
+          raise errors.ParseError((
+              f'Unable to parse property value string at offset: '
+              f'0x{string_offset:08x}'))
+
+        try:
+          string = intern(
+              data[string_offset:string_end_offset].decode('utf-8'))
+        except UnicodeDecodeError:
+          raise errors.ParseError((
+              f'Unable to decode property value string at offset: '
+              f'0x{string_offset:08x}'))
+
+        if property_table_type == 0x00000011:
+          property_value.key_name = string
+          property_value.property_type = property_type
+          property_value.value_type = value_type
+        else:
+          property_value.value_name = string
 
-        for metadata_value_index in index_values:
-          metadata_value = self._metadata_values.get(metadata_value_index, None)
-          value_string = getattr(metadata_value, 'value_name', '')
-          self._DebugPrintValue(
-              f'Value: {metadata_value_index:d}', value_string)
+        data_offset = string_end_offset + 1
 
-        self._DebugPrintText('\n')
+        if self._debug:
+          self._DebugPrintData(
+              f'Page value: {page_value_index:d} data',
+              data[property_value_offset:data_offset])
+
+          if property_table_type == 0x00000011:
+            debug_info = self._DEBUG_INFO_PROPERTY_VALUE11
+          else:
+            debug_info = self._DEBUG_INFO_PROPERTY_VALUE21
 
-      property_table[property_value.table_index] = property_value
+          self._DebugPrintStructureObject(property_value, debug_info)
 
-      page_data_offset += page_value_size
+      property_table[table_index] = property_value
       page_value_index += 1
 
+  def _ReadFileHeader(self, file_object):
+    """Reads the file header.
+
+    Args:
+      file_object (file): file-like object.
+
+    Returns:
+      spotlight_store_db_file_header: file header.
+
+    Raises:
+      ParseError: if the file header cannot be read.
+    """
+    data_type_map = self._GetDataTypeMap('spotlight_store_db_file_header')
+
+    file_header, file_header_size = self._ReadStructureFromFileObject(
+        file_object, 0, data_type_map, 'file header')
+
+    if self._debug:
+      self._DebugPrintStructureObject(file_header, self._DEBUG_INFO_FILE_HEADER)
+
+    if self._debug:
+      trailing_data = file_object.read(
+          file_header.map_offset - file_header_size)
+      self._DebugPrintData('Trailing data', trailing_data)
+
+    return file_header
+
+  def _ReadIndexCache(self, path, index_cache_key):
+    """Reads the record descriptors and property tables from an index cache.
+
+    Args:
+      path (str): path of the index cache file.
+      index_cache_key (list[object]): index cache key of the file.
+
+    Returns:
+      bool: True if the index cache was read, False if the index cache is not
+          available or does not match the file.
+    """
+    try:
+      with open(path, 'rb') as file_object:
+        cache_data = file_object.read()
+    except IOError:
+      return False
+
+    header_size = self._INDEX_CACHE_HEADER.size
+    if len(cache_data) < header_size:
+      return False
+
+    signature, tables_data_size = self._INDEX_CACHE_HEADER.unpack_from(
+        cache_data, 0)
+    if signature != self._INDEX_CACHE_SIGNATURE:
+      return False
+
+    try:
+      tables = json.loads(
+          cache_data[header_size:header_size + tables_data_size].decode(
+              'utf-8'))
+    except (UnicodeDecodeError, ValueError):
+      return False
+
+    if tables.get('key', None) != index_cache_key:
+      return False
+
+    number_of_records = tables.get('number_of_records', 0)
+
+    columns = []
+    column_offset = header_size + tables_data_size
+    for _ in SpotlightStoreRecordDescriptorTable.COLUMN_NAMES:
+      column_end_offset = column_offset + (number_of_records * 8)
+      if column_end_offset > len(cache_data):
+        return False
+
+      column = array.array('Q')
+      column.frombytes(cache_data[column_offset:column_end_offset])
+      if sys.byteorder != 'little':
+        column.byteswap()
+
+      columns.append(column)
+      column_offset = column_end_offset
+
+    metadata_types = {}
+    for table_index, value_type, property_type, key_name in tables.get(
+        'metadata_types', []):
+      property_value = SpotlightStorePropertyValue(table_index)
+      property_value.key_name = sys.intern(key_name)
+      property_value.property_type = property_type
+      property_value.value_type = value_type
+      metadata_types[table_index] = property_value
+
+    metadata_values = {}
+    for table_index, value_name in tables.get('metadata_values', []):
+      property_value = SpotlightStorePropertyValue(table_index)
+      property_value.value_name = sys.intern(value_name)
+      metadata_values[table_index] = property_value
+
+    property_tables = []
+    for name in ('metadata_lists', 'metadata_localized_strings'):
+      property_table = {}
+      for table_index, values_list in tables.get(name, []):
+        property_value = SpotlightStorePropertyValue(table_index)
+        property_value.values_list = [
+            sys.intern(value_string) for value_string in values_list]
+        property_table[table_index] = property_value
+
+      property_tables.append(property_table)
+
+    self._metadata_lists, self._metadata_localized_strings = property_tables
+    self._metadata_types = metadata_types
+    self._metadata_values = metadata_values
+    self._record_descriptors = SpotlightStoreRecordDescriptorTable(
+        columns=columns)
+
+    return True
+
   def _ReadMapPage(self, file_object, file_offset):
     """Reads a map page.
 
@@ -606,21 +1183,23 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
 
       file_offset += map_value_size
 
-  def _ReadMetadataAttribute(self, metadata_type, data):
+  def _ReadMetadataAttribute(self, metadata_type, data, data_offset):
     """Reads a metadata attribute.
 
     Args:
-      metadata_type (spotlight_store_db_property_value11): metadata type
+      metadata_type (SpotlightStorePropertyValue): metadata type
           property value.
       data (bytes): data.
+      data_offset (int): offset of the metadata attribute value relative to
+          the start of the data.
 
     Returns:
       tuple[SpotlightStoreMetadataAttribute, int]: metadata attribute and
-          number of bytes read.
+          offset of the data after the metadata attribute value.
     """
     value_type = getattr(metadata_type, 'value_type', None)
     if value_type is None:
-      return None, 0
+      return None, data_offset
 
     key_name = getattr(metadata_type, 'key_name', None)
     property_type = getattr(metadata_type, 'property_type', None)
@@ -635,50 +1214,52 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
       self._DebugPrintValue('Value type', value_string)
 
     if key_name == 'kMDStoreAccumulatedSizes':
-      bytes_read = 4 * 16
-      value = data[:bytes_read]
+      value = data[data_offset:data_offset + 64]
+      data_offset += 64
 
     elif value_type in (0x00, 0x02, 0x06):
-      value, bytes_read = self._ReadVariableSizeInteger(data)
+      value, data_offset = self._ReadVariableSizeIntegerAtOffset(
+          data, data_offset)
 
     elif value_type == 0x07:
-      value, bytes_read = self._ReadMetadataAttributeVariableSizeIntegerValue(
-          property_type, data)
+      value, data_offset = self._ReadMetadataAttributeVariableSizeIntegerValue(
+          property_type, data, data_offset)
 
     elif value_type == 0x08:
-      value, bytes_read = self._ReadMetadataAttributeByteValue(
-          property_type, data)
+      value, data_offset = self._ReadMetadataAttributeByteValue(
+          property_type, data, data_offset)
 
     elif value_type == 0x09:
-      value, bytes_read = self._ReadMetadataAttributeFloat32Value(
-          property_type, data)
+      value, data_offset = self._ReadMetadataAttributeFloat32Value(
+          property_type, data, data_offset)
 
     elif value_type in (0x0a, 0x0c):
-      value, bytes_read = self._ReadMetadataAttributeFloat64Value(
-          property_type, data)
+      value, data_offset = self._ReadMetadataAttributeFloat64Value(
+          property_type, data, data_offset)
 
     elif value_type == 0x0b:
-      value, bytes_read = self._ReadMetadataAttributeStringValue(
-          property_type, data)
+      value, data_offset = self._ReadMetadataAttributeStringValue(
+          property_type, data, data_offset)
 
     elif value_type == 0x0e:
-      data_size, bytes_read = self._ReadVariableSizeInteger(data)
+      data_size, data_offset = self._ReadVariableSizeIntegerAtOffset(
+          data, data_offset)
 
       if self._debug:
         self._DebugPrintDecimalValue('Data size', data_size)
 
-      value = data[bytes_read:bytes_read + data_size]
-      bytes_read += data_size
+      value = data[data_offset:data_offset + data_size]
+      data_offset += data_size
 
       # TODO: decode binary data e.g. UUID
 
     elif value_type == 0x0f:
-      value, bytes_read = self._ReadMetadataAttributeReferenceValue(
-          property_type, data)
+      value, data_offset = self._ReadMetadataAttributeReferenceValue(
+          property_type, data, data_offset)
 
     else:
       # TODO: value type 0x01, 0x03, 0x04, 0x05, 0x0d
-      value, bytes_read = None, 0
+      value = None
 
     metadata_attribute = SpotlightStoreMetadataAttribute()
     metadata_attribute.key = getattr(metadata_type, 'key_name', None)
@@ -689,28 +1270,33 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
     if self._debug:
       self._DebugPrintMetadataAttribute(metadata_attribute)
 
-    return metadata_attribute, bytes_read
+    return metadata_attribute, data_offset
 
-  def _ReadMetadataAttributeByteValue(self, property_type, data):
+  def _ReadMetadataAttributeByteValue(
+      self, property_type, data, data_offset):
     """Reads a metadata attribute byte value.
 
     Args:
       property_type (int): metadata attribute property type.
       data (bytes): data.
+      data_offset (int): offset of the value relative to the start of the
+          data.
 
     Returns:
-      tuple[object, int]: value and number of bytes read.
+      tuple[object, int]: value and offset of the data after the value.
 
     Raises:
       ParseError: if the metadata attribute byte value cannot be read.
     """
-    if property_type & 0x02 == 0x00:
-      data_size, bytes_read = 1, 0
+    is_array = property_type & 0x02 != 0x00
+    if not is_array:
+      data_size = 1
     else:
-      data_size, bytes_read = self._ReadVariableSizeInteger(data)
+      data_size, data_offset = self._ReadVariableSizeIntegerAtOffset(
+          data, data_offset)
 
-    if self._debug and bytes_read != 0:
-      self._DebugPrintDecimalValue('Data size', data_size)
+      if self._debug:
+        self._DebugPrintDecimalValue('Data size', data_size)
 
     data_type_map = self._GetDataTypeMap('array_of_byte')
 
@@ -719,42 +1305,47 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
 
     try:
       array_of_values = data_type_map.MapByteStream(
-          data[bytes_read:bytes_read + data_size], context=context)
+          data[data_offset:data_offset + data_size], context=context)
 
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError(
           f'Unable to parse array of byte values with error: {exception!s}')
 
-    if bytes_read == 0:
+    if not is_array:
       value = array_of_values[0]
     else:
       value = array_of_values
 
-    bytes_read += data_size
+    data_offset += data_size
 
-    return value, bytes_read
+    return value, data_offset
 
-  def _ReadMetadataAttributeFloat32Value(self, property_type, data):
+  def _ReadMetadataAttributeFloat32Value(
+      self, property_type, data, data_offset):
     """Reads a metadata attribute 32-bit floating-point value.
 
     Args:
       property_type (int): metadata attribute property type.
       data (bytes): data.
+      data_offset (int): offset of the value relative to the start of the
+          data.
 
     Returns:
-      tuple[object, int]: value and number of bytes read.
+      tuple[object, int]: value and offset of the data after the value.
 
     Raises:
       ParseError: if the metadata attribute 32-bit floating-point value cannot
           be read.
     """
-    if property_type & 0x02 == 0x00:
-      data_size, bytes_read = 4, 0
+    is_array = property_type & 0x02 != 0x00
+    if not is_array:
+      data_size = 4
     else:
-      data_size, bytes_read = self._ReadVariableSizeInteger(data)
+      data_size, data_offset = self._ReadVariableSizeIntegerAtOffset(
+          data, data_offset)
 
-    if self._debug and bytes_read != 0:
-      self._DebugPrintDecimalValue('Data size', data_size)
+      if self._debug:
+        self._DebugPrintDecimalValue('Data size', data_size)
 
     data_type_map = self._GetDataTypeMap('array_of_float32')
 
@@ -763,43 +1354,48 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
 
     try:
       array_of_values = data_type_map.MapByteStream(
-          data[bytes_read:bytes_read + data_size], context=context)
+          data[data_offset:data_offset + data_size], context=context)
 
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError((
           f'Unable to parse array of 32-bit floating-point values with error: '
           f'{exception!s}'))
 
-    if bytes_read == 0:
+    if not is_array:
       value = array_of_values[0]
     else:
       value = array_of_values
 
-    bytes_read += data_size
+    data_offset += data_size
 
-    return value, bytes_read
+    return value, data_offset
 
-  def _ReadMetadataAttributeFloat64Value(self, property_type, data):
+  def _ReadMetadataAttributeFloat64Value(
+      self, property_type, data, data_offset):
     """Reads a metadata attribute 64-bit floating-point value.
 
     Args:
       property_type (int): metadata attribute property type.
       data (bytes): data.
+      data_offset (int): offset of the value relative to the start of the
+          data.
 
     Returns:
-      tuple[object, int]: value and number of bytes read.
+      tuple[object, int]: value and offset of the data after the value.
 
     Raises:
       ParseError: if the metadata attribute 64-bit floating-point value cannot
           be read.
     """
-    if property_type & 0x02 == 0x00:
-      data_size, bytes_read = 8, 0
+    is_array = property_type & 0x02 != 0x00
+    if not is_array:
+      data_size = 8
     else:
-      data_size, bytes_read = self._ReadVariableSizeInteger(data)
+      data_size, data_offset = self._ReadVariableSizeIntegerAtOffset(
+          data, data_offset)
 
-    if self._debug and bytes_read != 0:
-      self._DebugPrintDecimalValue('Data size', data_size)
+      if self._debug:
+        self._DebugPrintDecimalValue('Data size', data_size)
 
     data_type_map = self._GetDataTypeMap('array_of_float64')
 
@@ -808,36 +1404,40 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
 
     try:
       array_of_values = data_type_map.MapByteStream(
-          data[bytes_read:bytes_read + data_size], context=context)
+          data[data_offset:data_offset + data_size], context=context)
 
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError((
           f'Unable to parse array of 64-bit floating-point values with error: '
           f'{exception!s}'))
 
-    if bytes_read == 0:
+    if not is_array:
       value = array_of_values[0]
     else:
       value = array_of_values
 
-    bytes_read += data_size
+    data_offset += data_size
 
-    return value, bytes_read
+    return value, data_offset
 
-  def _ReadMetadataAttributeReferenceValue(self, property_type, data):
+  def _ReadMetadataAttributeReferenceValue(
+      self, property_type, data, data_offset):
     """Reads a metadata attribute reference value.
 
     Args:
       property_type (int): metadata attribute property type.
       data (bytes): data.
+      data_offset (int): offset of the value relative to the start of the
+          data.
 
     Returns:
-      tuple[object, int]: value and number of bytes read.
+      tuple[object, int]: value and offset of the data after the value.
 
     Raises:
       ParseError: if the metadata attribute reference value cannot be read.
     """
-    table_index, bytes_read = self._ReadVariableSizeInteger(data)
+    table_index, data_offset = self._ReadVariableSizeIntegerAtOffset(
+        data, data_offset)
 
     if property_type & 0x03 == 0x03:
       if self._debug:
@@ -868,26 +1468,30 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
       metadata_value = self._metadata_values.get(table_index, None)
       value = getattr(metadata_value, 'value_name', '(null)')
 
-    return value, bytes_read
+    return value, data_offset
 
-  def _ReadMetadataAttributeStringValue(self, property_type, data):
+  def _ReadMetadataAttributeStringValue(
+      self, property_type, data, data_offset):
     """Reads a metadata attribute string value.
 
     Args:
       property_type (int): metadata attribute property type.
       data (bytes): data.
+      data_offset (int): offset of the value relative to the start of the
+          data.
 
     Returns:
-      tuple[object, int]: value and number of bytes read.
+      tuple[object, int]: value and offset of the data after the value.
 
     Raises:
       ParseError: if the metadata attribute string value cannot be read.
     """
-    data_size, bytes_read = self._ReadVariableSizeInteger(data)
+    data_size, data_offset = self._ReadVariableSizeIntegerAtOffset(
+        data, data_offset)
 
     if self._debug:
       self._DebugPrintDecimalValue('Data size', data_size)
-      self._DebugPrintData('Data', data[bytes_read:bytes_read + data_size])
+      self._DebugPrintData('Data', data[data_offset:data_offset + data_size])
 
     data_type_map = self._GetDataTypeMap('array_of_cstring')
 
@@ -896,7 +1500,7 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
 
     try:
       array_of_values = data_type_map.MapByteStream(
-          data[bytes_read:bytes_read + data_size], context=context)
+          data[data_offset:data_offset + data_size], context=context)
 
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError(
@@ -911,91 +1515,41 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
     else:
       value = array_of_values[0]
 
-    bytes_read += data_size
+    data_offset += data_size
 
-    return value, bytes_read
+    return value, data_offset
 
-  def _ReadMetadataAttributeVariableSizeIntegerValue(self, property_type, data):
+  def _ReadMetadataAttributeVariableSizeIntegerValue(
+      self, property_type, data, data_offset):
     """Reads a metadata attribute variable size integer value.
 
     Args:
       property_type (int): metadata attribute property type.
       data (bytes): data.
+      data_offset (int): offset of the value relative to the start of the
+          data.
 
     Returns:
-      tuple[object, int]: value and number of bytes read.
+      tuple[object, int]: value and offset of the data after the value.
     """
     if property_type & 0x02 == 0x00:
-      return self._ReadVariableSizeInteger(data)
+      return self._ReadVariableSizeIntegerAtOffset(data, data_offset)
 
-    data_size, bytes_read = self._ReadVariableSizeInteger(data)
+    data_size, data_offset = self._ReadVariableSizeIntegerAtOffset(
+        data, data_offset)
     if self._debug:
       self._DebugPrintDecimalValue('Data size', data_size)
 
-    array_of_values = []
+    data_end_offset = data_offset + data_size
 
-    data_offset = 0
-    while data_offset < data_size:
-      integer_value, integer_value_size = self._ReadVariableSizeInteger(
-          data[data_offset:data_size])
-
-      data_offset += integer_value_size
+    array_of_values = []
+    while data_offset < data_end_offset:
+      integer_value, data_offset = self._ReadVariableSizeIntegerAtOffset(
+          data, data_offset)
 
       array_of_values.append(integer_value)
 
-    bytes_read += data_size
-
-    return array_of_values, bytes_read
-
-  def _ReadPropertyPage(self, file_object, file_offset, property_table):
-    """Reads a property page.
-
-    Args:
-      file_object (file): file-like object.
-      file_offset (int): file offset.
-      property_table (dict[int, object]): property table in which to store the
-          property page values.
-
-    Returns:
-      tuple[spotlight_store_db_property_page_header, int]: page header and next
-          property page block number.
-
-    Raises:
-      ParseError: if the property page cannot be read.
-    """
-    page_header, bytes_read = self._ReadPropertyPageHeader(
-        file_object, file_offset)
-
-    if page_header.property_table_type not in (
-        0x00000011, 0x00000021, 0x00000041, 0x00000081):
-      raise errors.ParseError((
-          f'Unsupported property table type: '
-          f'0x{page_header.property_table_type:08x}'))
-
-    page_data = file_object.read(page_header.page_size - bytes_read)
-
-    data_type_map = self._GetDataTypeMap(
-        'spotlight_store_db_property_values_header')
-
-    file_offset += bytes_read
-
-    page_values_header = self._ReadStructureFromByteStream(
-        page_data, file_offset, data_type_map, 'property values header')
-
-    if self._debug:
-      self._DebugPrintStructureObject(
-          page_values_header, self._DEBUG_INFO_PROPERTY_VALUES_HEADER)
-
-    if page_header.property_table_type in (0x00000011, 0x00000021):
-      self._ReadPropertyPageValues(page_header, page_data, property_table)
-
-    elif page_header.property_table_type == 0x00000081:
-      self._ReadIndexPageValues(page_header, page_data, property_table)
-
-    elif self._debug:
-      self._DebugPrintData('Page data', page_data)
-
-    return page_header, page_values_header.next_block_number
+    return array_of_values, data_end_offset
 
   def _ReadPropertyPageHeader(self, file_object, file_offset):
     """Reads a property page header.
@@ -1037,78 +1591,114 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
     Args:
       file_object (file): file-like object.
       block_number (int): block number.
-      property_table (dict[int, object]): property table in which to store the
-          property page values.
+      property_table (dict[int, SpotlightStorePropertyValue]): property table
+          in which to store the property page values.
 
     Raises:
       ParseError: if the property pages cannot be read.
     """
-    file_offset = block_number * 0x1000
-    while file_offset != 0:
-      _, next_block_number = self._ReadPropertyPage(
-          file_object, file_offset, property_table)
+    for property_table_type, data, data_offset, data_end_offset in (
+        self._ReadPropertyPagesData(file_object, block_number)):
+      self._ParsePropertyPageValues(
+          property_table_type, data, data_offset, data_end_offset,
+          property_table)
 
-      file_offset = next_block_number * 0x1000
+  def _ReadPropertyPagesData(self, file_object, block_number):
+    """Reads the data of the property pages.
 
-  def _ReadPropertyPageValues(self, page_header, page_data, property_table):
-    """Reads the property page values.
+    Consecutive property pages are read with a single contiguous read of up
+    to _PROPERTY_PAGES_READ_SIZE bytes.
 
     Args:
-      page_header (spotlight_store_db_property_page_header): page header.
-      page_data (bytes): page data.
-      property_table (dict[int, object]): property table in which to store the
-          property page values.
+      file_object (file): file-like object.
+      block_number (int): block number of the first property page.
+
+    Yields:
+      tuple[int, bytes, int, int]: property table type, data containing the
+          property page, and offsets of the start and end of the property
+          values relative to the start of the data.
 
     Raises:
-      ParseError: if the property page values cannot be read.
+      ParseError: if the property pages cannot be read.
     """
-    if page_header.property_table_type == 0x00000011:
-      data_type_map = self._GetDataTypeMap(
-          'spotlight_store_db_property_value11')
+    data = b''
+    data_file_offset = 0
+    file_offsets = set()
+
+    file_offset = block_number * 0x1000
+    while file_offset != 0:
+      if file_offset in file_offsets:
+        raise errors.ParseError((
+            f'Property page at offset: 0x{file_offset:08x} already read'))
 
-    elif page_header.property_table_type == 0x00000021:
-      data_type_map = self._GetDataTypeMap(
-          'spotlight_store_db_property_value21')
+      file_offsets.add(file_offset)
 
-    page_data_offset = 12
-    page_data_size = page_header.used_page_size - 20
-    page_value_index = 0
+      page_offset = file_offset - data_file_offset
+      if page_offset < 0 or page_offset + 32 > len(data):
+        data_file_offset = file_offset
+        page_offset = 0
 
-    while page_data_offset < page_data_size:
-      context = dtfabric_data_maps.DataTypeMapContext()
+        file_object.seek(file_offset, os.SEEK_SET)
+        data = file_object.read(self._PROPERTY_PAGES_READ_SIZE)
 
-      try:
-        property_value = data_type_map.MapByteStream(
-            page_data[page_data_offset:], context=context)
-      except dtfabric_errors.MappingError as exception:
+      if page_offset + 32 > len(data):
         raise errors.ParseError((
-            f'Unable to map property value data at offset: '
-            f'0x{page_data_offset:08x} with error: {exception!s}'))
+            f'Unable to read property page at offset: 0x{file_offset:08x}'))
 
-      if self._debug:
-        self._DebugPrintData(
-            f'Page value: {page_value_index:d} data',
-            page_data[page_data_offset:page_data_offset + context.byte_size])
+      (signature, page_size, used_page_size, property_table_type, _) = (
+          self._PROPERTY_PAGE_HEADER.unpack_from(data, page_offset))
 
-        if page_header.property_table_type == 0x00000011:
-          debug_info = self._DEBUG_INFO_PROPERTY_VALUE11
-        elif page_header.property_table_type == 0x00000021:
-          debug_info = self._DEBUG_INFO_PROPERTY_VALUE21
+      if signature != b'2pbd':
+        raise errors.ParseError((
+            f'Unsupported property page signature at offset: '
+            f'0x{file_offset:08x}'))
 
-        self._DebugPrintStructureObject(property_value, debug_info)
+      if property_table_type not in (
+          0x00000011, 0x00000021, 0x00000041, 0x00000081):
+        raise errors.ParseError((
+            f'Unsupported property table type: '
+            f'0x{property_table_type:08x}'))
 
-      property_table[property_value.table_index] = property_value
+      if page_offset + page_size > len(data):
+        data_file_offset = file_offset
+        page_offset = 0
 
-      page_data_offset += context.byte_size
-      page_value_index += 1
+        file_object.seek(file_offset, os.SEEK_SET)
+        data = file_object.read(max(page_size, self._PROPERTY_PAGES_READ_SIZE))
+
+        if page_size > len(data):
+          raise errors.ParseError((
+              f'Unable to read property page at offset: '
+              f'0x{file_offset:08x}'))
+
+      next_block_number, _ = self._PROPERTY_VALUES_HEADER.unpack_from(
+          data, page_offset + 20)
+
+      if self._debug:
+        self._DebugPrintPropertyPageHeader(data, page_offset, file_offset)
+
+        if property_table_type == 0x00000041:
+          self._DebugPrintData('Page data', data[
+              page_offset + 32:page_offset + min(used_page_size, page_size)])
 
-  def _ReadRecord(self, page_data, page_value_offset):
+      yield (
+          property_table_type, data, page_offset + 32,
+          page_offset + min(used_page_size, page_size))
+
+      file_offset = next_block_number * 0x1000
+
+  def _ReadRecord(
+      self, page_data, page_value_offset, metadata_type_indexes=None):
     """Reads a record.
 
     Args:
       page_data (bytes): page data.
       page_value_offset (int): offset of the page value relative to the start
           of the page data.
+      metadata_type_indexes (Optional[frozenset[int]]): indexes of the metadata
+          types of the metadata attributes to read, or None to read all
+          metadata attributes. The values of other metadata attributes are
+          skipped.
 
     Returns:
       SpotlightStoreMetadataItem: metadata item.
@@ -1121,12 +1711,9 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
           page_value_offset)
       self._DebugPrintValue('Record data offset', value_string)
 
-    page_data_offset = page_value_offset - 20
-    record_header, bytes_read = self._ReadRecordHeader(
-        page_data[page_data_offset:], page_data_offset)
-
-    page_data_offset += bytes_read
-    record_data_offset = bytes_read
+    record_offset = page_value_offset - 20
+    record_header, page_data_offset = self._ReadRecordHeader(
+        page_data, record_offset)
 
     metadata_item = SpotlightStoreMetadataItem()
     metadata_item.identifier = record_header.identifier
@@ -1134,15 +1721,43 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
     metadata_item.last_update_time = record_header.last_update_time
     metadata_item.parent_identifier = record_header.parent_identifier
 
+    metadata_item.attributes = self._ReadRecordMetadataAttributes(
+        page_data, page_data_offset,
+        record_offset + 4 + record_header.data_size,
+        metadata_type_indexes=metadata_type_indexes)
+
+    return metadata_item
+
+  def _ReadRecordMetadataAttributes(
+      self, page_data, page_data_offset, record_end_offset,
+      metadata_type_indexes=None):
+    """Reads the metadata attributes of a record.
+
+    Args:
+      page_data (bytes): page data.
+      page_data_offset (int): offset of the metadata attributes relative to
+          the start of the page data.
+      record_end_offset (int): offset of the end of the record relative to the
+          start of the page data.
+      metadata_type_indexes (Optional[frozenset[int]]): indexes of the metadata
+          types of the metadata attributes to read, or None to read all
+          metadata attributes. The values of other metadata attributes are
+          skipped.
+
+    Returns:
+      dict[str, SpotlightStoreMetadataAttribute]: metadata attributes.
+
+    Raises:
+      ParseError: if the metadata attributes cannot be read.
+    """
+    metadata_attributes = {}
+
     metadata_attribute_index = 0
     metadata_type_index = 0
 
-    while record_data_offset < record_header.data_size:
-      relative_metadata_type_index, bytes_read = (
-          self._ReadVariableSizeInteger(page_data[page_data_offset:]))
-
-      page_data_offset += bytes_read
-      record_data_offset += bytes_read
+    while page_data_offset < record_end_offset:
+      relative_metadata_type_index, page_data_offset = (
+          self._ReadVariableSizeIntegerAtOffset(page_data, page_data_offset))
 
       metadata_type_index += relative_metadata_type_index
 
@@ -1158,58 +1773,58 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
         self._DebugPrintDecimalValue(description, metadata_type_index)
 
       metadata_type = self._metadata_types.get(metadata_type_index, None)
-      metadata_attribute, bytes_read = self._ReadMetadataAttribute(
-          metadata_type, page_data[page_data_offset:])
 
-      page_data_offset += bytes_read
-      record_data_offset += bytes_read
+      if (metadata_type_indexes is not None and
+          metadata_type_index not in metadata_type_indexes):
+        page_data_offset = self._SkipMetadataAttribute(
+            metadata_type, page_data, page_data_offset)
+
+      else:
+        metadata_attribute, page_data_offset = self._ReadMetadataAttribute(
+            metadata_type, page_data, page_data_offset)
+
+        metadata_attributes[metadata_attribute.key] = metadata_attribute
 
-      metadata_item.attributes[metadata_attribute.key] = metadata_attribute
       metadata_attribute_index += 1
 
-    return metadata_item
+    return metadata_attributes
 
-  def _ReadRecordHeader(self, data, page_data_offset):
+  def _ReadRecordHeader(self, page_data, page_data_offset):
     """Reads a record header.
 
     Args:
-      data (bytes): data.
-      page_data_offset (int): offset of the page value relative to the start
-          of the page data.
+      page_data (bytes): page data.
+      page_data_offset (int): offset of the record relative to the start of
+          the page data.
 
     Returns:
-      tuple[SpotlightStoreRecordHeader, int]: record header and number of bytes
-          read.
+      tuple[SpotlightStoreRecordHeader, int]: record header and offset of the
+          data after the record header relative to the start of the page data.
 
     Raises:
       ParseError: if the record page cannot be read.
     """
     data_type_map = self._GetDataTypeMap('spotlight_store_db_record')
 
-    context = dtfabric_data_maps.DataTypeMapContext()
-
     try:
-      record = data_type_map.MapByteStream(data, context=context)
+      record = data_type_map.MapByteStream(
+          page_data[page_data_offset:page_data_offset + 4])
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError((
           f'Unable to map record at offset: 0x{page_data_offset:08x} with '
           f'error: {exception!s}'))
 
-    data_offset = context.byte_size
-
-    identifier, bytes_read = self._ReadVariableSizeInteger(data[data_offset:])
-
-    data_offset += bytes_read
+    identifier, data_offset = self._ReadVariableSizeIntegerAtOffset(
+        page_data, page_data_offset + 4)
 
-    flags = data[data_offset]
-
-    data_offset += 1
-
-    value_names = ['item_identifier', 'parent_identifier', 'last_update_time']
-    values, bytes_read = self._ReadVariableSizeIntegers(
-        data[data_offset:], value_names)
+    try:
+      flags = page_data[data_offset]
+    except IndexError:
+      raise errors.ParseError((
+          f'Unable to read record flags at offset: 0x{data_offset:08x}'))
 
-    data_offset += bytes_read
+    (item_identifier, parent_identifier, last_update_time), data_offset = (
+        self._ReadVariableSizeIntegersAtOffset(page_data, data_offset + 1, 3))
 
     if self._debug:
       self._DebugPrintDecimalValue('Record data size', record.data_size)
@@ -1218,9 +1833,9 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
     record_header.data_size = record.data_size
     record_header.identifier = identifier
     record_header.flags = flags
-    record_header.item_identifier = values.get('item_identifier')
-    record_header.parent_identifier = values.get('parent_identifier')
-    record_header.last_update_time = values.get('last_update_time')
+    record_header.item_identifier = item_identifier
+    record_header.parent_identifier = parent_identifier
+    record_header.last_update_time = last_update_time
 
     return record_header, data_offset
 
@@ -1235,6 +1850,27 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
       tuple[spotlight_store_db_property_page_header, bytes]: page header and
           page data.
 
+    Raises:
+      ParseError: if the property page cannot be read.
+    """
+    page_header, page_data = self._ReadRecordPageData(file_object, file_offset)
+
+    page_data = self._DecompressRecordPageData(
+        page_header, page_data, file_offset + 20)
+
+    return page_header, page_data
+
+  def _ReadRecordPageData(self, file_object, file_offset):
+    """Reads the compressed data of a record page.
+
+    Args:
+      file_object (file): file-like object.
+      file_offset (int): file offset.
+
+    Returns:
+      tuple[spotlight_store_db_property_page_header, bytes]: page header and
+          compressed page data.
+
     Raises:
       ParseError: if the property page cannot be read.
     """
@@ -1248,28 +1884,56 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
 
     page_data = file_object.read(page_header.page_size - bytes_read)
 
-    file_offset += bytes_read
+    return page_header, page_data
 
-    if page_header.uncompressed_page_size > 0:
-      compressed_page_data = page_data
+  def _ReadRecordPages(self, file_object, page_offsets):
+    """Reads record pages.
 
-      if (page_header.property_table_type == 0x00000009 and
-          compressed_page_data[0] == 0x78):
-        page_data = zlib.decompress(compressed_page_data)
+    Record pages are read sequentially. When multiple threads are configured
+    the record pages are decompressed on a thread pool, where the number of
+    record pages being decompressed is bounded.
 
-      elif (page_header.property_table_type == 0x00001009 and
-            compressed_page_data[0:4] == b'bv41'):
-        page_data = self._DecompressLZ4PageData(
-            compressed_page_data, file_offset)
+    Args:
+      file_object (file): file-like object.
+      page_offsets (list[int]): offsets of the record pages to read, relative
+          to the start of the file, in the order the pages should be returned.
 
-      # TODO: add support for other compression types.
-      else:
-        if self._debug:
-          self._DebugPrintData('Data', page_data)
+    Yields:
+      tuple[int, bytes]: file offset and uncompressed data of a record page.
 
-        raise errors.ParseError('Unsupported compression type')
+    Raises:
+      ParseError: if a record page cannot be read.
+    """
+    if self._number_of_threads <= 1 or self._debug:
+      for file_offset in page_offsets:
+        _, page_data = self._ReadRecordPage(file_object, file_offset)
 
-    return page_header, page_data
+        yield file_offset, page_data
+
+      return
+
+    maximum_number_of_pending_pages = self._number_of_threads * 2
+
+    with futures.ThreadPoolExecutor(
+        max_workers=self._number_of_threads) as executor:
+      pending_pages = collections.deque()
+
+      for file_offset in page_offsets:
+        page_header, page_data = self._ReadRecordPageData(
+            file_object, file_offset)
+
+        future = executor.submit(
+            self._DecompressRecordPageData, page_header, page_data,
+            file_offset + 20)
+        pending_pages.append((file_offset, future))
+
+        if len(pending_pages) >= maximum_number_of_pending_pages:
+          file_offset, future = pending_pages.popleft()
+          yield file_offset, future.result()
+
+      while pending_pages:
+        file_offset, future = pending_pages.popleft()
+        yield file_offset, future.result()
 
   def _ReadRecordPageValues(self, page_data, page_offset):
     """Reads the record page values.
@@ -1290,12 +1954,11 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
             page_data_offset + 20)
         self._DebugPrintValue('Record data offset', value_string)
 
-      record_header, _ = self._ReadRecordHeader(
-          page_data[page_data_offset:], page_data_offset)
+      record_header, _ = self._ReadRecordHeader(page_data, page_data_offset)
 
       if self._debug:
         record_data = page_data[
-            page_data_offset + 4:page_data_offset + record_header.data_size]
+            page_data_offset + 4:page_data_offset + 4 + record_header.data_size]
         self._DebugPrintData('Record data', record_data)
 
       if self._debug:
@@ -1323,14 +1986,10 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
             'Last update time', record_header.last_update_time)
         self._DebugPrintText('\n')
 
-      record_descriptor = SpotlightStoreRecordDescriptor(
-          page_offset, page_data_offset + 20)
-      record_descriptor.last_update_time = record_header.last_update_time
-      record_descriptor.identifier = record_header.identifier
-      record_descriptor.item_identifier = record_header.item_identifier
-      record_descriptor.parent_identifier = record_header.parent_identifier
-
-      self._record_descriptors[record_header.identifier] = record_descriptor
+      self._record_descriptors.AddRecordDescriptor(
+          record_header.identifier, record_header.item_identifier,
+          record_header.last_update_time, page_offset, page_data_offset + 20,
+          record_header.parent_identifier)
 
       page_data_offset += 4 + record_header.data_size
 
@@ -1343,66 +2002,318 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
     Returns:
       tuple[int, int]: integer value and number of bytes read.
     """
-    byte_value = data[0]
-    bytes_read = 1
+    return self._ReadVariableSizeIntegerAtOffset(data, 0)
 
-    number_of_additional_bytes = 0
-    for bitmask in (0x80, 0xc0, 0xe0, 0xf0, 0xf8, 0xfc, 0xfe, 0xff):
-      if byte_value & bitmask != bitmask:
-        break
-      number_of_additional_bytes += 1
+  def _ReadVariableSizeIntegerAtOffset(self, data, data_offset):
+    """Reads a variable size integer at a specific offset.
+
+    The data is not copied, hence data can be a page of which only the
+    variable size integer is read.
+
+    Args:
+      data (bytes): data.
+      data_offset (int): offset of the variable size integer relative to the
+          start of the data.
+
+    Returns:
+      tuple[int, int]: integer value and offset of the data after the variable
+          size integer.
+
+    Raises:
+      ParseError: if the variable size integer cannot be read.
+    """
+    try:
+      byte_value = data[data_offset]
+      data_offset += 1
 
-    if number_of_additional_bytes > 4:
-      byte_value = 0
-    elif number_of_additional_bytes > 0:
-      byte_value &= bitmask ^ 0xff
+      if byte_value < 0x80:
+        return byte_value, data_offset
 
-    integer_value = int(byte_value)
-    while number_of_additional_bytes > 0:
-      integer_value <<= 8
+      number_of_additional_bytes, bitmask = (
+          self._VARIABLE_SIZE_INTEGER_SIZES[byte_value])
 
-      integer_value += int(data[bytes_read])
-      bytes_read += 1
+      integer_value = byte_value & bitmask
+      for _ in range(number_of_additional_bytes):
+        integer_value = (integer_value << 8) | data[data_offset]
+        data_offset += 1
 
-      number_of_additional_bytes -= 1
+    except IndexError:
+      raise errors.ParseError((
+          f'Unable to read variable size integer at offset: '
+          f'0x{data_offset:08x}'))
 
-    return integer_value, bytes_read
+    return integer_value, data_offset
 
-  def _ReadVariableSizeIntegers(self, data, names):
-    """Reads variable size integers.
+  def _ReadVariableSizeIntegersAtOffset(
+      self, data, data_offset, number_of_integers):
+    """Reads consecutive variable size integers at a specific offset.
 
     Args:
       data (bytes): data.
-      names (list[str]): names to identify the integer values.
+      data_offset (int): offset of the first variable size integer relative to
+          the start of the data.
+      number_of_integers (int): number of variable size integers to read.
 
     Returns:
-      tuple[dict[str, int], int]: integer values per name and number of bytes
-          read.
+      tuple[list[int], int]: integer values and offset of the data after the
+          last variable size integer.
+
+    Raises:
+      ParseError: if the variable size integers cannot be read.
     """
-    values = {}
+    integer_values = []
+    for _ in range(number_of_integers):
+      integer_value, data_offset = self._ReadVariableSizeIntegerAtOffset(
+          data, data_offset)
 
-    data_offset = 0
-    for name in names:
-      integer_value, bytes_read = self._ReadVariableSizeInteger(
-          data[data_offset:])
+      integer_values.append(integer_value)
 
-      data_offset += bytes_read
+    return integer_values, data_offset
 
-      values[name] = integer_value
+  def _SkipMetadataAttribute(self, metadata_type, data, data_offset):
+    """Skips a metadata attribute without reading its value.
+
+    Args:
+      metadata_type (SpotlightStorePropertyValue): metadata type
+          property value.
+      data (bytes): data.
+      data_offset (int): offset of the metadata attribute value relative to
+          the start of the data.
+
+    Returns:
+      int: offset of the data after the metadata attribute value.
+
+    Raises:
+      ParseError: if the size of the metadata attribute value cannot be read.
+    """
+    value_type = getattr(metadata_type, 'value_type', None)
+    if value_type is None:
+      return data_offset
 
-    return values, data_offset
+    if getattr(metadata_type, 'key_name', None) == 'kMDStoreAccumulatedSizes':
+      return data_offset + 64
 
-  def GetMetadataItemByIdentifier(self, identifier):
+    property_type = getattr(metadata_type, 'property_type', None) or 0
+    is_array = property_type & 0x02 != 0x00
+
+    if value_type in (0x00, 0x02, 0x06, 0x0f) or (
+        value_type == 0x07 and not is_array):
+      try:
+        number_of_additional_bytes, _ = self._VARIABLE_SIZE_INTEGER_SIZES[
+            data[data_offset]]
+      except IndexError:
+        raise errors.ParseError((
+            f'Unable to read variable size integer at offset: '
+            f'0x{data_offset:08x}'))
+
+      return data_offset + 1 + number_of_additional_bytes
+
+    if value_type in (0x07, 0x0b, 0x0e) or (
+        value_type in (0x08, 0x09, 0x0a, 0x0c) and is_array):
+      data_size, data_offset = self._ReadVariableSizeIntegerAtOffset(
+          data, data_offset)
+      return data_offset + data_size
+
+    if value_type == 0x08:
+      return data_offset + 1
+
+    if value_type == 0x09:
+      return data_offset + 4
+
+    if value_type in (0x0a, 0x0c):
+      return data_offset + 8
+
+    # TODO: value type 0x01, 0x03, 0x04, 0x05, 0x0d
+    return data_offset
+
+  def _WriteIndexCache(self, path, index_cache_key):
+    """Writes the record descriptors and property tables to an index cache.
+
+    Args:
+      path (str): path of the index cache file.
+      index_cache_key (list[object]): index cache key of the file.
+
+    Raises:
+      IOError: if the index cache cannot be written.
+      OSError: if the index cache cannot be written.
+    """
+    tables = {
+        'key': index_cache_key,
+        'metadata_lists': [
+            [table_index, getattr(property_value, 'values_list', [])]
+            for table_index, property_value in sorted(
+                self._metadata_lists.items())],
+        'metadata_localized_strings': [
+            [table_index, getattr(property_value, 'values_list', [])]
+            for table_index, property_value in sorted(
+                self._metadata_localized_strings.items())],
+        'metadata_types': [
+            [table_index, property_value.value_type,
+             property_value.property_type, property_value.key_name]
+            for table_index, property_value in sorted(
+                self._metadata_types.items())],
+        'metadata_values': [
+            [table_index, property_value.value_name]
+            for table_index, property_value in sorted(
+                self._metadata_values.items())],
+        'number_of_records': self._record_descriptors.number_of_records}
+
+    tables_data = json.dumps(tables).encode('utf-8')
+
+    columns = self._record_descriptors.GetColumns()
+    if sys.byteorder != 'little':
+      columns = [array.array('Q', column) for column in columns]
+      for column in columns:
+        column.byteswap()
+
+    # Write to a temporary file first so that a partially written index cache
+    # is never read.
+    temporary_path = f'{path:s}.tmp'
+    with open(temporary_path, 'wb') as file_object:
+      file_object.write(self._INDEX_CACHE_HEADER.pack(
+          self._INDEX_CACHE_SIGNATURE, len(tables_data)))
+      file_object.write(tables_data)
+      for column in columns:
+        column.tofile(file_object)
+
+    os.replace(temporary_path, path)
+
+  def Close(self):
+    """Closes an Apple Spotlight database file.
+
+    Raises:
+      IOError: if the file is not opened.
+      OSError: if the file is not opened.
+    """
+    super(AppleSpotlightStoreDatabaseFile, self).Close()
+
+    self._file_names = None
+    self._paths = {}
+
+    self._record_pages_cache = collections.OrderedDict()
+    self._record_pages_cache_size = 0
+
+  def GetMetadataItemByIdentifier(self, identifier, attribute_names=None):
     """Retrieves a specific metadata item.
 
     Args:
       identifier (int): file (system) entry identifier of the metadata item.
+      attribute_names (Optional[set[str]]): key names of the metadata
+          attributes to read, such as "_kMDItemFileName", or None to read all
+          metadata attributes.
 
     Returns:
       SpotlightStoreMetadataItem: metadata item matching the identifier or None
           if no such item.
     """
-    return self._GetMetadataItemByIdentifier(self._file_object, identifier)
+    metadata_type_indexes = None
+    if attribute_names is not None:
+      metadata_type_indexes = self._GetMetadataTypeIndexes(attribute_names)
+
+    return self._GetMetadataItemByIdentifier(
+        self._file_object, identifier,
+        metadata_type_indexes=metadata_type_indexes)
+
+  def GetPathByIdentifier(self, identifier):
+    """Retrieves the path of a specific metadata item.
+
+    The path is determined from the file names of the metadata item and its
+    parents. The file names are read with a single pass over all metadata
+    items the first time a path is retrieved.
+
+    Args:
+      identifier (int): file (system) entry identifier of the metadata item.
+
+    Returns:
+      str: path of the metadata item, such as "/Users/test", or None if no
+          such file system entry metadata item.
+    """
+    if identifier <= 1 or not self._record_descriptors.HasIdentifier(
+        identifier):
+      return None
+
+    if self._file_names is None:
+      self._file_names = {
+          metadata_item.identifier: getattr(
+              metadata_item.attributes.get('_kMDItemFileName', None),
+              'value', None)
+          for metadata_item in self.IterateMetadataItems(
+              attribute_names=set(['_kMDItemFileName']))}
+
+    path = self._paths.get(identifier, None)
+    if path is None:
+      file_name = self._file_names.get(identifier, None) or '(null)'
+      path = '/'.join([self._GetPathOfParent(identifier), file_name])
+
+    return path
+
+  def IterateMetadataItems(self, attribute_names=None):
+    """Iterates over all metadata items.
+
+    The record pages are read in the order they are stored in the file and
+    every record page is read only once. Only the most recent version of a
+    metadata item, which is also returned by GetMetadataItemByIdentifier, is
+    returned.
+
+    Args:
+      attribute_names (Optional[set[str]]): key names of the metadata
+          attributes to read, such as "_kMDItemFileName", or None to read all
+          metadata attributes.
+
+    Yields:
+      SpotlightStoreMetadataItem: metadata item.
+
+    Raises:
+      ParseError: if a record page cannot be read.
+    """
+    metadata_type_indexes = None
+    if attribute_names is not None:
+      metadata_type_indexes = self._GetMetadataTypeIndexes(attribute_names)
+
+    page_offsets = sorted(set(
+        map_value.block_number * 0x1000 for map_value in self._map_values))
+
+    for page_offset, page_data in self._ReadRecordPages(
+        self._file_object, page_offsets):
+      page_data_offset = 0
+      page_data_size = len(page_data)
+
+      while page_data_offset < page_data_size:
+        record_header, data_offset = self._ReadRecordHeader(
+            page_data, page_data_offset)
+
+        record_end_offset = page_data_offset + 4 + record_header.data_size
+
+        record_descriptor = self._record_descriptors.GetRecordDescriptor(
+            record_header.identifier)
+        if (record_descriptor and
+            record_descriptor.page_offset == page_offset and
+            record_descriptor.page_value_offset == page_data_offset + 20):
+          metadata_item = SpotlightStoreMetadataItem()
+          metadata_item.identifier = record_header.identifier
+          metadata_item.item_identifier = record_header.item_identifier
+          metadata_item.last_update_time = record_header.last_update_time
+          metadata_item.parent_identifier = record_header.parent_identifier
+
+          metadata_item.attributes = self._ReadRecordMetadataAttributes(
+              page_data, data_offset, record_end_offset,
+              metadata_type_indexes=metadata_type_indexes)
+
+          yield metadata_item
+
+        page_data_offset = record_end_offset
+
+  def IteratePaths(self):
+    """Iterates over the paths of all file system entry metadata items.
+
+    Yields:
+      tuple[int, str]: file system entry identifier and path of the metadata
+          item.
+    """
+    for identifier in self._record_descriptors.GetIdentifiers():
+      path = self.GetPathByIdentifier(identifier)
+      if path is not None:
+        yield identifier, path
 
   def ReadFileObject(self, file_object):
     """Reads an Apple Spotlight database file-like object.
@@ -1418,6 +2329,14 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
     self._ReadMapPages(
         file_object, file_header.map_offset, file_header.map_size)
 
+    index_cache_key = None
+    if self._index_cache_path and not self._debug:
+      index_cache_key = self._GetIndexCacheKey(file_header)
+
+    if index_cache_key and self._ReadIndexCache(
+        self._index_cache_path, index_cache_key):
+      return
+
     self._ReadPropertyPages(
         file_object, file_header.metadata_types_block_number,
         self._metadata_types)
@@ -1437,17 +2356,25 @@ class AppleSpotlightStoreDatabaseFile(data_format.BinaryDataFile):
         file_object, file_header.metadata_localized_strings_block_number,
         self._metadata_localized_strings)
 
-    for map_value in self._map_values:
-      file_offset = map_value.block_number * 0x1000
-      _, page_data = self._ReadRecordPage(file_object, file_offset)
-
-      # TODO: remove page from cache if full.
-      self._record_pages_cache[file_offset] = page_data
+    # The record pages are only read to build the record descriptors and are
+    # read again when a metadata item is retrieved.
+    page_offsets = [
+        map_value.block_number * 0x1000 for map_value in self._map_values]
 
+    for file_offset, page_data in self._ReadRecordPages(
+        file_object, page_offsets):
       self._ReadRecordPageValues(page_data, file_offset)
 
+    if index_cache_key:
+      try:
+        self._WriteIndexCache(self._index_cache_path, index_cache_key)
+      except (IOError, OSError) as exception:
+        logging.warning((
+            f'Unable to write index cache: {self._index_cache_path:s} with '
+            f'error: {exception!s}'))
+
     if self._debug:
-      for record_identifier in sorted(self._record_descriptors.keys()):
+      for record_identifier in self._record_descriptors.GetIdentifiers():
         metadata_item = self._GetMetadataItemByIdentifier(
             file_object, record_identifier)
       # TODO: do something with metadata_item or remove.
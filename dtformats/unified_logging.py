@@ -1,9 +1,23 @@
 # -*- coding: utf-8 -*-
 """Apple Unified Logging and Activity Tracing files."""
 
-import lz4.block
+import array
+import bisect
+import collections
+import glob
+import heapq
+import itertools
+import json
+import logging
+import mmap
+import multiprocessing
+import os
+import struct
+
+from dtfabric.runtime import data_maps as dtfabric_data_maps
 
 from dtformats import data_format
+from dtformats import decompressors
 from dtformats import errors
 
 
@@ -11,6 +25,8 @@ class DSCRange(object):
   """Shared-Cache Strings (dsc) range.
 
   Attributes:
+    data_offset (int): the offset of the range data relative to the start of
+        the file.
     path (str): path.
     range_offset (int): the offset of the range.
     range_sizes (int): the size of the range.
@@ -21,6 +37,7 @@ class DSCRange(object):
   def __init__(self):
     """Initializes a Shared-Cache Strings (dsc) range."""
     super(DSCRange, self).__init__()
+    self.data_offset = None
     self.path = None
     self.range_offset = None
     self.range_size = None
@@ -73,7 +90,6 @@ class DSCFile(data_format.BinaryDataFile):
       ('data_offset', 'Data offset', '_FormatIntegerAsHexadecimal8'),
       ('range_offset', 'Range offset', '_FormatIntegerAsHexadecimal8'),
       ('range_size', 'Range size', '_FormatIntegerAsDecimal'),
-      ('unknown_offset', 'Unknown offset', '_FormatIntegerAsHexadecimal8'),
       ('uuid_descriptor_index', 'UUID descriptor index',
        '_FormatIntegerAsDecimal')]
 
@@ -180,6 +196,7 @@ class DSCFile(data_format.BinaryDataFile):
             range_descriptor, self._DEBUG_INFO_RANGE_DESCRIPTOR)
 
       dsc_range = DSCRange()
+      dsc_range.data_offset = range_descriptor.data_offset
       dsc_range.range_offset = range_descriptor.range_offset
       dsc_range.range_size = range_descriptor.range_size
       dsc_range.uuid_index = range_descriptor.uuid_descriptor_index
@@ -288,8 +305,67 @@ class DSCFile(data_format.BinaryDataFile):
       dsc_range.uuid = dsc_uuid.sender_identifier
 
 
+class TraceV3ChunkSetDescriptor(object):
+  """TraceV3 chunk set descriptor.
+
+  Attributes:
+    chunk_data_size (int): size of the compressed chunk set data.
+    chunk_offset (int): offset of the chunk set relative to the start of
+        the file.
+    end_time (int): continuous time of the last tracepoint in the chunk set
+        or None if not known.
+    start_time (int): continuous time of the first tracepoint in the chunk
+        set or None if not known.
+  """
+
+  def __init__(self):
+    """Initializes a TraceV3 chunk set descriptor."""
+    super(TraceV3ChunkSetDescriptor, self).__init__()
+    self.chunk_data_size = None
+    self.chunk_offset = None
+    self.end_time = None
+    self.start_time = None
+
+
+class TraceV3FirehoseTracepoint(object):
+  """TraceV3 firehose tracepoint.
+
+  Attributes:
+    chunk_offset (int): offset of the chunk set that contains the tracepoint,
+        relative to the start of the file.
+    continuous_time (int): continuous time of the tracepoint.
+    data (memoryview): tracepoint data, which refers to the uncompressed chunk
+        set data.
+    flags (int): flags of the tracepoint.
+    format_string_location (int): location of the format string.
+    process_identifier1 (int): first process identifier.
+    process_identifier2 (int): second process identifier.
+    thread_identifier (int): thread identifier.
+  """
+
+  def __init__(self):
+    """Initializes a TraceV3 firehose tracepoint."""
+    super(TraceV3FirehoseTracepoint, self).__init__()
+    self.chunk_offset = None
+    self.continuous_time = None
+    self.data = None
+    self.flags = None
+    self.format_string_location = None
+    self.process_identifier1 = None
+    self.process_identifier2 = None
+    self.thread_identifier = None
+
+
 class TraceV3File(data_format.BinaryDataFile):
-  """Apple Unified Logging and Activity Tracing (tracev3) file."""
+  """Apple Unified Logging and Activity Tracing (tracev3) file.
+
+  Attributes:
+    catalogs (list[tracev3_catalog]): catalogs, with their process information
+        entries and sub chunks.
+    chunk_sets (list[TraceV3ChunkSetDescriptor]): chunk sets, with the time
+        range of their tracepoints, as determined from the catalogs.
+    header (tracev3_header): header or None if not available.
+  """
 
   # Using a class constant significantly speeds up the time required to load
   # the dtFabric definition file.
@@ -315,6 +391,41 @@ class TraceV3File(data_format.BinaryDataFile):
       ('uuids', 'UUIDs', '_FormatArrayOfUUIDS'),
       ('sub_system_strings', 'Sub system strings', '_FormatArrayOfStrings')]
 
+  _DEBUG_INFO_CATALOG_PROCESS_INFORMATION_ENTRY = [
+      ('entry_index', 'Entry index', '_FormatIntegerAsDecimal'),
+      ('unknown1', 'Unknown1', '_FormatIntegerAsHexadecimal4'),
+      ('main_uuid_index', 'Main UUID index', '_FormatIntegerAsDecimal'),
+      ('dsc_uuid_index', 'DSC UUID index', '_FormatIntegerAsDecimal'),
+      ('process_identifier1', 'Process identifier 1',
+       '_FormatIntegerAsDecimal'),
+      ('process_identifier2', 'Process identifier 2',
+       '_FormatIntegerAsDecimal'),
+      ('process_identifier', 'Process identifier (PID)',
+       '_FormatIntegerAsDecimal'),
+      ('effective_user_identifier', 'Effective user identifier (EUID)',
+       '_FormatIntegerAsDecimal'),
+      ('unknown2', 'Unknown2', '_FormatIntegerAsHexadecimal8'),
+      ('number_of_uuid_entries', 'Number of UUID entries',
+       '_FormatIntegerAsDecimal'),
+      ('unknown3', 'Unknown3', '_FormatIntegerAsHexadecimal8'),
+      ('number_of_sub_system_entries', 'Number of sub system entries',
+       '_FormatIntegerAsDecimal'),
+      ('unknown4', 'Unknown4', '_FormatIntegerAsHexadecimal8')]
+
+  _DEBUG_INFO_CATALOG_SUB_CHUNK = [
+      ('start_time', 'Start time', '_FormatIntegerAsDecimal'),
+      ('end_time', 'End time', '_FormatIntegerAsDecimal'),
+      ('uncompressed_data_size', 'Uncompressed data size',
+       '_FormatIntegerAsDecimal'),
+      ('compression_algorithm', 'Compression algorithm',
+       '_FormatIntegerAsHexadecimal8'),
+      ('number_of_indexes', 'Number of indexes', '_FormatIntegerAsDecimal'),
+      ('indexes', 'Indexes', '_FormatArrayOfIntegersAsDecimals'),
+      ('number_of_string_offsets', 'Number of string offsets',
+       '_FormatIntegerAsDecimal'),
+      ('string_offsets', 'String offsets',
+       '_FormatArrayOfIntegersAsOffsets')]
+
   _DEBUG_INFO_CHUNK_HEADER = [
       ('chunk_tag', 'Chunk tag', '_FormatIntegerAsHexadecimal8'),
       ('chunk_sub_tag', 'Chunk sub tag', '_FormatIntegerAsHexadecimal8'),
@@ -346,6 +457,19 @@ class TraceV3File(data_format.BinaryDataFile):
        '_FormatIntegerAsDecimal'),
       ('data_size', 'Data size', '_FormatIntegerAsDecimal')]
 
+  _DEBUG_INFO_HEADER = [
+      ('timebase_numerator', 'Timebase numerator', '_FormatIntegerAsDecimal'),
+      ('timebase_denominator', 'Timebase denominator',
+       '_FormatIntegerAsDecimal'),
+      ('continuous_time', 'Continuous time', '_FormatIntegerAsDecimal'),
+      ('wall_clock_time', 'Wall clock time', '_FormatIntegerAsPosixTime'),
+      ('wall_clock_time_microseconds', 'Wall clock time microseconds',
+       '_FormatIntegerAsDecimal'),
+      ('time_zone_offset', 'Time zone offset', '_FormatIntegerAsDecimal'),
+      ('daylight_saving_time_flag', 'Daylight saving time flag',
+       '_FormatIntegerAsDecimal'),
+      ('flags', 'Flags', '_FormatIntegerAsHexadecimal8')]
+
   _DEBUG_INFO_LZ4_BLOCK_HEADER = [
       ('signature', 'Signature', '_FormatStreamAsSignature'),
       ('uncompressed_data_size', 'Uncompressed data size',
@@ -353,15 +477,70 @@ class TraceV3File(data_format.BinaryDataFile):
       ('compressed_data_size', 'Compressed data size',
        '_FormatIntegerAsDecimal')]
 
-  def __init__(self, debug=False, output_writer=None):
+  _CHUNK_HEADER = struct.Struct('<IIII')
+
+  _FIREHOSE_HEADER = struct.Struct('<QIIHHHHQ')
+
+  _FIREHOSE_TRACEPOINT = struct.Struct('<BBHIQIHH')
+
+  _INDEX_CACHE_SIGNATURE = b'dtftidx1'
+
+  # Format version of the index cache, which is part of the cache key.
+  _INDEX_CACHE_FORMAT_VERSION = 1
+
+  _INDEX_CACHE_HEADER = struct.Struct('<8sI')
+
+  def __init__(self, debug=False, output_writer=None, index_cache_path=None):
     """Initializes a timezone information file.
 
     Args:
       debug (Optional[bool]): True if debug information should be written.
       output_writer (Optional[OutputWriter]): output writer.
+      index_cache_path (Optional[str]): path of the index cache file, which
+          contains the catalog offsets and chunk set descriptors of a previous
+          read of the same file, or None to not use an index cache.
     """
     super(TraceV3File, self).__init__(
         debug=debug, output_writer=output_writer)
+    self._catalog_offsets = []
+    self._index_cache_path = index_cache_path
+    self._process_uuids = {}
+    self.catalogs = []
+    self.chunk_sets = []
+    self.header = None
+
+  def _DecompressChunkSetData(self, chunk_data, file_offset):
+    """Decompresses the data of a chunk set.
+
+    Args:
+      chunk_data (bytes): compressed chunk set data.
+      file_offset (int): offset of the chunk set data relative to the start
+          of the file.
+
+    Returns:
+      bytes: uncompressed chunk set data.
+
+    Raises:
+      ParseError: if the chunk set data cannot be decompressed.
+    """
+    if self._debug:
+      data_type_map = self._GetDataTypeMap('tracev3_lz4_block_header')
+
+      lz4_block_header = self._ReadStructureFromByteStream(
+          chunk_data, file_offset, data_type_map, 'LZ4 block header')
+
+      self._DebugPrintStructureObject(
+          lz4_block_header, self._DEBUG_INFO_LZ4_BLOCK_HEADER)
+
+    try:
+      uncompressed_data, _ = (
+          decompressors.DecompressorManager.Decompress(chunk_data))
+    except errors.ParseError as exception:
+      raise errors.ParseError((
+          f'Unable to decompress chunk set at offset: 0x{file_offset:08x} '
+          f'with error: {exception!s}'))
+
+    return uncompressed_data
 
   def _FormatArrayOfStrings(self, array_of_strings):
     """Formats an array of strings.
@@ -402,6 +581,237 @@ class TraceV3File(data_format.BinaryDataFile):
     """
     return stream.decode('ascii')
 
+  def _GetIndexCacheKey(self):
+    """Retrieves the key that identifies the index cache of the file.
+
+    Returns:
+      list[object]: index cache key or None if the file cannot be identified.
+    """
+    if not self._path:
+      return None
+
+    stat_object = os.stat(self._path)
+
+    return [
+        self._INDEX_CACHE_FORMAT_VERSION, stat_object.st_size,
+        stat_object.st_mtime_ns]
+
+  def _GetTracepointsFromValues(self, chunk_offset, tracepoints_values):
+    """Retrieves firehose tracepoints from values read by a worker process.
+
+    Args:
+      chunk_offset (int): offset of the chunk set relative to the start of
+          the file.
+      tracepoints_values (list[tuple[int, bytes, int, int, int, int, int]]):
+          continuous time, data, flags, format string location, first and
+          second process identifier and thread identifier per tracepoint.
+
+    Yields:
+      TraceV3FirehoseTracepoint: firehose tracepoint.
+    """
+    for tracepoint_values in tracepoints_values:
+      firehose_tracepoint = TraceV3FirehoseTracepoint()
+      firehose_tracepoint.chunk_offset = chunk_offset
+
+      (firehose_tracepoint.continuous_time, data, firehose_tracepoint.flags,
+       firehose_tracepoint.format_string_location,
+       firehose_tracepoint.process_identifier1,
+       firehose_tracepoint.process_identifier2,
+       firehose_tracepoint.thread_identifier) = tracepoint_values
+
+      firehose_tracepoint.data = memoryview(data)
+
+      yield firehose_tracepoint
+
+  def _IterateChunkSets(self, file_object, start_time=None, end_time=None):
+    """Iterates over the chunk sets.
+
+    Chunk sets of which the time range is known and does not overlap with
+    the requested time range are skipped without being read.
+
+    Args:
+      file_object (file): file-like object.
+      start_time (Optional[int]): continuous time of the start of the time
+          range or None if the time range has no start.
+      end_time (Optional[int]): continuous time of the end of the time range
+          or None if the time range has no end.
+
+    Yields:
+      tuple[int, bytes]: offset of the chunk set relative to the start of the
+          file and compressed chunk set data.
+
+    Raises:
+      ParseError: if a chunk set cannot be read.
+    """
+    for chunk_set in self.chunk_sets:
+      if start_time is not None and chunk_set.end_time is not None and (
+          chunk_set.end_time < start_time):
+        continue
+
+      if end_time is not None and chunk_set.start_time is not None and (
+          chunk_set.start_time > end_time):
+        continue
+
+      chunk_data = self._ReadData(
+          file_object, chunk_set.chunk_offset + 16, chunk_set.chunk_data_size,
+          'chunk set')
+
+      yield chunk_set.chunk_offset, chunk_data
+
+  def _IterateFirehoseTracepoints(self, chunk_offset, chunk_set_data):
+    """Iterates over the firehose tracepoints in uncompressed chunk set data.
+
+    Args:
+      chunk_offset (int): offset of the chunk set relative to the start of
+          the file.
+      chunk_set_data (bytes): uncompressed chunk set data.
+
+    Yields:
+      TraceV3FirehoseTracepoint: firehose tracepoint.
+
+    Raises:
+      ParseError: if a firehose tracepoint cannot be read.
+    """
+    chunk_set_data = memoryview(chunk_set_data)
+    chunk_set_data_size = len(chunk_set_data)
+
+    data_offset = 0
+    while data_offset + 16 <= chunk_set_data_size:
+      chunk_tag, _, chunk_data_size, _ = self._CHUNK_HEADER.unpack_from(
+          chunk_set_data, data_offset)
+      data_offset += 16
+
+      data_end_offset = data_offset + chunk_data_size
+      if data_end_offset > chunk_set_data_size:
+        raise errors.ParseError((
+            f'Chunk at offset: 0x{data_offset:08x} in chunk set at offset: '
+            f'0x{chunk_offset:08x} exceeds chunk set data'))
+
+      if chunk_tag == self._CHUNK_TAG_FIREHOSE and chunk_data_size >= 32:
+        (process_identifier1, process_identifier2, _, public_data_size, _, _,
+         _, base_continuous_time) = self._FIREHOSE_HEADER.unpack_from(
+             chunk_set_data, data_offset)
+
+        public_data_end_offset = min(
+            data_offset + 16 + public_data_size, data_end_offset)
+
+        tracepoint_offset = data_offset + 32
+        while tracepoint_offset + 24 <= public_data_end_offset:
+          (_, _, flags, format_string_location, thread_identifier,
+           continuous_time_lower, continuous_time_upper,
+           tracepoint_data_size) = self._FIREHOSE_TRACEPOINT.unpack_from(
+               chunk_set_data, tracepoint_offset)
+
+          tracepoint_data_offset = tracepoint_offset + 24
+          tracepoint_offset = tracepoint_data_offset + tracepoint_data_size
+          if tracepoint_offset > public_data_end_offset:
+            raise errors.ParseError((
+                f'Firehose tracepoint data at offset: '
+                f'0x{tracepoint_data_offset:08x} in chunk set at offset: '
+                f'0x{chunk_offset:08x} exceeds firehose public data'))
+
+          firehose_tracepoint = TraceV3FirehoseTracepoint()
+          firehose_tracepoint.chunk_offset = chunk_offset
+          firehose_tracepoint.continuous_time = base_continuous_time + (
+              continuous_time_upper << 32 | continuous_time_lower)
+          firehose_tracepoint.data = chunk_set_data[
+              tracepoint_data_offset:tracepoint_offset]
+          firehose_tracepoint.flags = flags
+          firehose_tracepoint.format_string_location = format_string_location
+          firehose_tracepoint.process_identifier1 = process_identifier1
+          firehose_tracepoint.process_identifier2 = process_identifier2
+          firehose_tracepoint.thread_identifier = thread_identifier
+
+          yield firehose_tracepoint
+
+          _, alignment = divmod(tracepoint_offset - data_offset, 8)
+          if alignment > 0:
+            tracepoint_offset += 8 - alignment
+
+      data_offset = data_end_offset
+
+      _, alignment = divmod(data_offset, 8)
+      if alignment > 0:
+        data_offset += 8 - alignment
+
+  def _IterateTracepointsWithScheduler(
+      self, scheduler, start_time=None, end_time=None):
+    """Iterates over the firehose tracepoints using a chunk set scheduler.
+
+    The chunk sets are read sequentially and are decompressed and parsed by
+    the worker processes of the scheduler. The next chunk set of the file is
+    always submitted, additional chunk sets are only submitted ahead while
+    the scheduler has capacity. The results are returned in file order.
+
+    Args:
+      scheduler (TraceV3ChunkSetScheduler): chunk set scheduler.
+      start_time (Optional[int]): continuous time of the start of the time
+          range or None if the time range has no start.
+      end_time (Optional[int]): continuous time of the end of the time range
+          or None if the time range has no end.
+
+    Yields:
+      TraceV3FirehoseTracepoint: firehose tracepoint.
+
+    Raises:
+      ParseError: if a chunk set or firehose tracepoint cannot be read.
+    """
+    chunk_sets = self._IterateChunkSets(
+        self._file_object, start_time=start_time, end_time=end_time)
+
+    pending_results = collections.deque()
+
+    try:
+      while True:
+        while not pending_results or scheduler.has_capacity:
+          chunk_set = next(chunk_sets, None)
+          if not chunk_set:
+            break
+
+          chunk_offset, chunk_data = chunk_set
+          result = scheduler.Submit(chunk_offset, chunk_data)
+          pending_results.append((chunk_offset, result))
+
+        if not pending_results:
+          break
+
+        chunk_offset, result = pending_results.popleft()
+        tracepoints_values = scheduler.GetResult(result)
+
+        yield from self._GetTracepointsFromValues(
+            chunk_offset, tracepoints_values)
+
+    finally:
+      # Results that are not retrieved, for example when the iteration is
+      # stopped early, no longer count towards the capacity of the scheduler.
+      for _, result in pending_results:
+        scheduler.Release(result)
+
+  def _IterateTracepointsWithWorkers(
+      self, number_of_workers, start_time=None, end_time=None):
+    """Iterates over the firehose tracepoints using worker processes.
+
+    Args:
+      number_of_workers (int): number of worker processes.
+      start_time (Optional[int]): continuous time of the start of the time
+          range or None if the time range has no start.
+      end_time (Optional[int]): continuous time of the end of the time range
+          or None if the time range has no end.
+
+    Yields:
+      TraceV3FirehoseTracepoint: firehose tracepoint.
+
+    Raises:
+      ParseError: if a chunk set or firehose tracepoint cannot be read.
+    """
+    with multiprocessing.Pool(
+        processes=number_of_workers,
+        initializer=TraceV3ChunkSetWorker.Initialize) as pool:
+      scheduler = TraceV3ChunkSetScheduler(pool, number_of_workers * 2)
+
+      yield from self._IterateTracepointsWithScheduler(
+          scheduler, start_time=start_time, end_time=end_time)
+
   def _ReadCatalog(self, file_object, file_offset, chunk_header):
     """Reads a catalog.
 
@@ -411,22 +821,97 @@ class TraceV3File(data_format.BinaryDataFile):
           of the file.
       chunk_header (tracev3_chunk_header): the chunk header of the catalog.
 
+    Returns:
+      tracev3_catalog: catalog, with its process information entries and sub
+          chunks.
+
     Raises:
-      ParseError: if the chunk header cannot be read.
+      ParseError: if the catalog cannot be read.
     """
-    chunk_data = file_object.read(chunk_header.chunk_data_size)
-
-    # TODO: use chunk_data or remove
-    _ = chunk_data
+    chunk_data = self._ReadData(
+        file_object, file_offset, chunk_header.chunk_data_size, 'catalog')
 
     data_type_map = self._GetDataTypeMap('tracev3_catalog')
 
-    catalog, _ = self._ReadStructureFromFileObject(
-        file_object, file_offset, data_type_map, 'Catalog')
+    catalog = self._ReadStructureFromByteStream(
+        chunk_data, file_offset, data_type_map, 'catalog')
 
     if self._debug:
       self._DebugPrintStructureObject(catalog, self._DEBUG_INFO_CATALOG)
 
+    data_type_map = self._GetDataTypeMap(
+        'tracev3_catalog_process_information_entry')
+
+    data_offset = 24 + catalog.process_information_entries_offset
+
+    process_information_entries = self._ReadCatalogEntries(
+        chunk_data, file_offset, data_offset,
+        catalog.number_of_process_information_entries, data_type_map,
+        'process information entry',
+        self._DEBUG_INFO_CATALOG_PROCESS_INFORMATION_ENTRY)
+
+    data_type_map = self._GetDataTypeMap('tracev3_catalog_sub_chunk')
+
+    data_offset = 24 + catalog.sub_chunks_offset
+
+    sub_chunks = self._ReadCatalogEntries(
+        chunk_data, file_offset, data_offset, catalog.number_of_sub_chunks,
+        data_type_map, 'sub chunk', self._DEBUG_INFO_CATALOG_SUB_CHUNK)
+
+    setattr(catalog, 'process_information_entries',
+            process_information_entries)
+    setattr(catalog, 'sub_chunks', sub_chunks)
+
+    return catalog
+
+  def _ReadCatalogEntries(
+      self, chunk_data, file_offset, data_offset, number_of_entries,
+      data_type_map, description, debug_info):
+    """Reads 8-byte aligned catalog entries.
+
+    Args:
+      chunk_data (bytes): catalog data.
+      file_offset (int): offset of the catalog data relative to the start
+          of the file.
+      data_offset (int): offset of the first entry relative to the start of
+          the catalog data.
+      number_of_entries (int): number of entries.
+      data_type_map (dtfabric.DataTypeMap): data type map of the entry.
+      description (str): description of the entry.
+      debug_info (list[tuple[str, str, int]]): debug information.
+
+    Returns:
+      list[object]: catalog entries.
+
+    Raises:
+      ParseError: if the catalog entries cannot be read.
+    """
+    entries = []
+    for _ in range(number_of_entries):
+      if data_offset >= len(chunk_data):
+        raise errors.ParseError((
+            f'Catalog {description:s} at offset: '
+            f'0x{file_offset + data_offset:08x} exceeds catalog data'))
+
+      context = dtfabric_data_maps.DataTypeMapContext()
+
+      entry = self._ReadStructureFromByteStream(
+          chunk_data[data_offset:], file_offset + data_offset, data_type_map,
+          description, context=context)
+
+      if self._debug:
+        self._DebugPrintStructureObject(entry, debug_info)
+
+      entries.append(entry)
+
+      data_offset += context.byte_size
+
+      _, alignment = divmod(data_offset, 8)
+      if alignment > 0:
+        data_offset += 8 - alignment
+
+    return entries
+
   def _ReadChunkHeader(self, file_object, file_offset):
     """Reads a chunk header.
 
@@ -464,40 +949,15 @@ class TraceV3File(data_format.BinaryDataFile):
     Raises:
       ParseError: if the chunk header cannot be read.
     """
-    chunk_data = file_object.read(chunk_header.chunk_data_size)
-
-    data_type_map = self._GetDataTypeMap('tracev3_lz4_block_header')
-
-    lz4_block_header, _ = self._ReadStructureFromFileObject(
-        file_object, file_offset, data_type_map, 'LZ4 block header')
-
-    if self._debug:
-      self._DebugPrintStructureObject(
-          lz4_block_header, self._DEBUG_INFO_LZ4_BLOCK_HEADER)
-
-    end_of_compressed_data_offset = 12 + lz4_block_header.compressed_data_size
-
-    if lz4_block_header.signature == b'bv41':
-      uncompressed_data = lz4.block.decompress(
-          chunk_data[12:end_of_compressed_data_offset],
-          uncompressed_size=lz4_block_header.uncompressed_data_size)
-
-    elif lz4_block_header.signature == b'bv4-':
-      uncompressed_data = chunk_data[12:end_of_compressed_data_offset]
+    uncompressed_data = self._ReadChunkSetData(
+        file_object, file_offset, chunk_header)
 
-    else:
-      raise errors.ParseError('Unsupported start of compressed data marker')
-
-    end_of_compressed_data_identifier = chunk_data[
-        end_of_compressed_data_offset:end_of_compressed_data_offset + 4]
-
-    if end_of_compressed_data_identifier != b'bv4$':
-      raise errors.ParseError('Unsupported end of compressed data marker')
+    uncompressed_data_size = len(uncompressed_data)
 
     data_type_map = self._GetDataTypeMap('tracev3_chunk_header')
 
     data_offset = 0
-    while data_offset < lz4_block_header.uncompressed_data_size:
+    while data_offset < uncompressed_data_size:
       if self._debug:
         self._DebugPrintData('Chunk header data', uncompressed_data[
             data_offset:data_offset + 16])
@@ -528,6 +988,26 @@ class TraceV3File(data_format.BinaryDataFile):
 
       data_offset += alignment
 
+  def _ReadChunkSetData(self, file_object, file_offset, chunk_header):
+    """Reads and decompresses the data of a chunk set.
+
+    Args:
+      file_object (file): file-like object.
+      file_offset (int): offset of the chunk set data relative to the start
+          of the file.
+      chunk_header (tracev3_chunk_header): the chunk header of the chunk set.
+
+    Returns:
+      bytes: uncompressed chunk set data.
+
+    Raises:
+      ParseError: if the chunk set data cannot be read or decompressed.
+    """
+    chunk_data = self._ReadData(
+        file_object, file_offset, chunk_header.chunk_data_size, 'chunk set')
+
+    return self._DecompressChunkSetData(chunk_data, file_offset)
+
   def _ReadFirehoseChunkData(self, chunk_data, chunk_data_size, data_offset):
     """Reads firehose chunk data.
 
@@ -549,17 +1029,24 @@ class TraceV3File(data_format.BinaryDataFile):
       self._DebugPrintStructureObject(
           firehose_header, self._DEBUG_INFO_FIREHOSE_HEADER)
 
+    public_data_end_offset = min(
+        16 + firehose_header.public_data_size, chunk_data_size)
+
     chunk_data_offset = 32
-    while chunk_data_offset < chunk_data_size:
+    while chunk_data_offset + 24 <= public_data_end_offset:
       firehose_tracepoint = self._ReadFirehoseTracepointData(
           chunk_data[chunk_data_offset:], data_offset + chunk_data_offset)
 
-      test_data_offset = chunk_data_offset + 22
-      test_data_end_offset = test_data_offset + firehose_tracepoint.data_size
-      self._DebugPrintData(
-          'Data', chunk_data[test_data_offset:test_data_end_offset])
+      tracepoint_data_offset = chunk_data_offset + 24
+      chunk_data_offset = tracepoint_data_offset + firehose_tracepoint.data_size
+
+      if self._debug:
+        self._DebugPrintData(
+            'Data', chunk_data[tracepoint_data_offset:chunk_data_offset])
 
-      chunk_data_offset += 22 + firehose_tracepoint.data_size
+      _, alignment = divmod(chunk_data_offset, 8)
+      if alignment > 0:
+        chunk_data_offset += 8 - alignment
 
   def _ReadFirehoseTracepointData(self, tracepoint_data, data_offset):
     """Reads firehose tracepoint data.
@@ -586,86 +1073,550 @@ class TraceV3File(data_format.BinaryDataFile):
 
     return firehose_tracepoint
 
-  def ReadFileObject(self, file_object):
-    """Reads a timezone information file-like object.
+  def _ReadHeader(self, file_object, file_offset):
+    """Reads a header.
 
     Args:
       file_object (file): file-like object.
+      file_offset (int): offset of the header data relative to the start of
+          the file.
+
+    Returns:
+      tracev3_header: a header.
 
     Raises:
-      ParseError: if the file cannot be read.
+      ParseError: if the header cannot be read.
     """
-    file_offset = 0
+    data_type_map = self._GetDataTypeMap('tracev3_header')
 
-    while file_offset < self._file_size:
-      chunk_header = self._ReadChunkHeader(file_object, file_offset)
-      file_offset += 16
+    header, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'header')
 
-      if chunk_header.chunk_tag == 0x600b:
-        self._ReadCatalog(file_object, file_offset, chunk_header)
+    if self._debug:
+      self._DebugPrintStructureObject(header, self._DEBUG_INFO_HEADER)
 
-      elif chunk_header.chunk_tag == 0x600d:
-        self._ReadChunkSet(file_object, file_offset, chunk_header)
+    return header
 
-      file_offset += chunk_header.chunk_data_size
+  def _ReadIndexCache(self, file_object, path, index_cache_key):
+    """Reads the catalogs and chunk set descriptors using an index cache.
 
-      _, alignment = divmod(file_offset, 8)
-      if alignment > 0:
-        alignment = 8 - alignment
+    Args:
+      file_object (file): file-like object.
+      path (str): path of the index cache file.
+      index_cache_key (list[object]): index cache key of the file.
 
-      file_offset += alignment
+    Returns:
+      bool: True if the index cache was read, False if the index cache is not
+          available or does not match the file.
 
+    Raises:
+      ParseError: if a catalog cannot be read.
+    """
+    try:
+      with open(path, 'rb') as cache_file_object:
+        cache_data = cache_file_object.read()
+    except IOError:
+      return False
+
+    header_size = self._INDEX_CACHE_HEADER.size
+    if len(cache_data) < header_size:
+      return False
+
+    signature, index_data_size = self._INDEX_CACHE_HEADER.unpack_from(
+        cache_data, 0)
+    if signature != self._INDEX_CACHE_SIGNATURE:
+      return False
+
+    try:
+      index = json.loads(
+          cache_data[header_size:header_size + index_data_size].decode(
+              'utf-8'))
+    except (UnicodeDecodeError, ValueError):
+      return False
+
+    if index.get('key', None) != index_cache_key:
+      return False
+
+    chunk_sets = []
+    for chunk_offset, chunk_data_size, start_time, end_time in index.get(
+        'chunk_sets', []):
+      chunk_set = TraceV3ChunkSetDescriptor()
+      chunk_set.chunk_data_size = chunk_data_size
+      chunk_set.chunk_offset = chunk_offset
+      chunk_set.end_time = end_time
+      chunk_set.start_time = start_time
+      chunk_sets.append(chunk_set)
+
+    catalog_offsets = index.get('catalog_offsets', [])
+
+    catalogs = []
+    for chunk_offset in catalog_offsets:
+      chunk_header = self._ReadChunkHeader(file_object, chunk_offset)
+      if chunk_header.chunk_tag != 0x600b:
+        return False
+
+      catalog = self._ReadCatalog(
+          file_object, chunk_offset + 16, chunk_header)
+      catalogs.append(catalog)
+
+    self._catalog_offsets = catalog_offsets
+    self.catalogs = catalogs
+    self.chunk_sets = chunk_sets
+
+    return True
+
+  def _WriteIndexCache(self, path, index_cache_key):
+    """Writes the catalog offsets and chunk set descriptors to an index cache.
 
-class UUIDTextFile(data_format.BinaryDataFile):
-  """Apple Unified Logging and Activity Tracing (uuidtext) file."""
+    Args:
+      path (str): path of the index cache file.
+      index_cache_key (list[object]): index cache key of the file.
 
-  # Using a class constant significantly speeds up the time required to load
-  # the dtFabric definition file.
-  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile(
-      'unified_logging.yaml')
+    Raises:
+      IOError: if the index cache cannot be written.
+      OSError: if the index cache cannot be written.
+    """
+    index = {
+        'catalog_offsets': self._catalog_offsets,
+        'chunk_sets': [
+            [chunk_set.chunk_offset, chunk_set.chunk_data_size,
+             chunk_set.start_time, chunk_set.end_time]
+            for chunk_set in self.chunk_sets],
+        'key': index_cache_key}
 
-  _DEBUG_INFO_FILE_FOOTER = [
-      ('library_path', 'Library path', '_FormatString')]
+    index_data = json.dumps(index).encode('utf-8')
 
-  _DEBUG_INFO_FILE_HEADER = [
-      ('signature', 'Signature', '_FormatIntegerAsHexadecimal8'),
-      ('major_format_version', 'Major format version',
-       '_FormatIntegerAsDecimal'),
-      ('minor_format_version', 'Minor format version',
-       '_FormatIntegerAsDecimal'),
-      ('number_of_entries', 'Number of entries', '_FormatIntegerAsDecimal'),
-      ('entry_descriptors', 'Entry descriptors',
-       '_FormatArrayOfEntryDescriptors')]
+    # Write to a temporary file first so that a partially written index cache
+    # is never read.
+    temporary_path = f'{path:s}.tmp'
+    with open(temporary_path, 'wb') as file_object:
+      file_object.write(self._INDEX_CACHE_HEADER.pack(
+          self._INDEX_CACHE_SIGNATURE, len(index_data)))
+      file_object.write(index_data)
 
-  def __init__(self, debug=False, output_writer=None):
-    """Initializes a timezone information file.
+    os.replace(temporary_path, path)
 
-    Args:
-      debug (Optional[bool]): True if debug information should be written.
-      output_writer (Optional[OutputWriter]): output writer.
-    """
-    super(UUIDTextFile, self).__init__(
-        debug=debug, output_writer=output_writer)
+  def GetContinuousTime(self, wall_clock_time):
+    """Retrieves the continuous time of a wall clock time.
 
-  def _FormatArrayOfEntryDescriptors(self, array_of_entry_descriptors):
-    """Formats an array of entry descriptors.
+    This is the inverse of GetWallClockTime, the continuous time is estimated
+    from the continuous and wall clock time in the header.
 
     Args:
-      array_of_entry_descriptors (list[uuidtext_entry_descriptor]): array of
-          entry descriptors.
+      wall_clock_time (int): number of nanoseconds since January 1, 1970
+          00:00:00 UTC.
 
     Returns:
-      str: formatted array of entry descriptors.
+      int: smallest continuous time of which the wall clock time is equal to
+          or later than the wall clock time or None if not available.
     """
-    value = '\n'.join([
-        (f'\t[{entry_index:03d}] offset: 0x{entry_descriptor.offset:08x}, '
-         f'data size: {entry_descriptor.data_size:d}')
-        for entry_index, entry_descriptor in enumerate(
-            array_of_entry_descriptors)])
-    return f'{value:s}\n'
+    if (not self.header or not self.header.timebase_numerator or
+        not self.header.timebase_denominator):
+      return None
 
-  def _ReadFileFooter(self, file_object, file_offset):
-    """Reads a file footer.
+    elapsed_time = wall_clock_time - (
+        (self.header.wall_clock_time * 1000000000) +
+        (self.header.wall_clock_time_microseconds * 1000))
+
+    # Round up since GetWallClockTime rounds down.
+    return self.header.continuous_time - (
+        (-elapsed_time * self.header.timebase_denominator) //
+        self.header.timebase_numerator)
+
+  def GetProcessUUIDs(self, firehose_tracepoint):
+    """Retrieves the UUIDs of the process that logged a tracepoint.
+
+    The process is looked up in the catalog that precedes the chunk set of
+    the tracepoint.
+
+    Args:
+      firehose_tracepoint (TraceV3FirehoseTracepoint): firehose tracepoint.
+
+    Returns:
+      tuple[uuid.UUID, uuid.UUID]: UUIDs of the main executable and the
+          shared-cache strings (dsc) of the process, where a UUID is None if
+          not available.
+    """
+    catalog_index = bisect.bisect_right(
+        self._catalog_offsets, firehose_tracepoint.chunk_offset) - 1
+    if catalog_index < 0 or catalog_index >= len(self.catalogs):
+      return None, None
+
+    process_uuids = self._process_uuids.get(catalog_index, None)
+    if process_uuids is None:
+      catalog = self.catalogs[catalog_index]
+      number_of_uuids = len(catalog.uuids)
+
+      process_uuids = {}
+      for process_information_entry in catalog.process_information_entries:
+        main_uuid = None
+        if process_information_entry.main_uuid_index < number_of_uuids:
+          main_uuid = catalog.uuids[process_information_entry.main_uuid_index]
+
+        dsc_uuid = None
+        if process_information_entry.dsc_uuid_index < number_of_uuids:
+          dsc_uuid = catalog.uuids[process_information_entry.dsc_uuid_index]
+
+        lookup_key = (
+            process_information_entry.process_identifier1,
+            process_information_entry.process_identifier2)
+        process_uuids[lookup_key] = (main_uuid, dsc_uuid)
+
+      self._process_uuids[catalog_index] = process_uuids
+
+    lookup_key = (
+        firehose_tracepoint.process_identifier1,
+        firehose_tracepoint.process_identifier2)
+    return process_uuids.get(lookup_key, (None, None))
+
+  def GetWallClockTime(self, continuous_time):
+    """Retrieves the wall clock time of a continuous time.
+
+    The wall clock time is estimated from the continuous and wall clock time
+    in the header, which were recorded when the file was created.
+
+    Args:
+      continuous_time (int): continuous time.
+
+    Returns:
+      int: number of nanoseconds since January 1, 1970 00:00:00 UTC or None
+          if not available.
+    """
+    if not self.header or not self.header.timebase_denominator:
+      return None
+
+    elapsed_time = (
+        (continuous_time - self.header.continuous_time) *
+        self.header.timebase_numerator) // self.header.timebase_denominator
+
+    return (
+        (self.header.wall_clock_time * 1000000000) +
+        (self.header.wall_clock_time_microseconds * 1000) + elapsed_time)
+
+  def IterateTracepoints(
+      self, number_of_workers=1, start_time=None, end_time=None,
+      scheduler=None):
+    """Iterates over the firehose tracepoints.
+
+    The chunk sets are decompressed one at a time, the data of the
+    tracepoints refers to the uncompressed data of their chunk set. If a time
+    range is specified only the chunk sets that overlap with the time range,
+    as determined from the catalogs, are read.
+
+    Args:
+      number_of_workers (Optional[int]): number of worker processes to
+          decompress and parse the chunk sets with, where 1 represents
+          reading the chunk sets in the current process.
+      start_time (Optional[int]): continuous time of the start of the time
+          range, inclusive, or None if the time range has no start.
+      end_time (Optional[int]): continuous time of the end of the time range,
+          inclusive, or None if the time range has no end.
+      scheduler (Optional[TraceV3ChunkSetScheduler]): chunk set scheduler
+          to decompress and parse the chunk sets with, so that its worker
+          processes and its bound on the number of pending chunk sets can be
+          shared between files, where number_of_workers is ignored.
+
+    Yields:
+      TraceV3FirehoseTracepoint: firehose tracepoint.
+
+    Raises:
+      ParseError: if a chunk set or firehose tracepoint cannot be read.
+    """
+    if scheduler and not self._debug:
+      firehose_tracepoints = self._IterateTracepointsWithScheduler(
+          scheduler, start_time=start_time, end_time=end_time)
+
+    elif number_of_workers > 1 and not self._debug:
+      firehose_tracepoints = self._IterateTracepointsWithWorkers(
+          number_of_workers, start_time=start_time, end_time=end_time)
+
+    else:
+      firehose_tracepoints = (
+          firehose_tracepoint
+          for chunk_offset, chunk_data in self._IterateChunkSets(
+              self._file_object, start_time=start_time, end_time=end_time)
+          for firehose_tracepoint in self._IterateFirehoseTracepoints(
+              chunk_offset, self._DecompressChunkSetData(
+                  chunk_data, chunk_offset + 16)))
+
+    if start_time is None and end_time is None:
+      yield from firehose_tracepoints
+      return
+
+    for firehose_tracepoint in firehose_tracepoints:
+      continuous_time = firehose_tracepoint.continuous_time
+      if start_time is not None and continuous_time < start_time:
+        continue
+
+      if end_time is not None and continuous_time > end_time:
+        continue
+
+      yield firehose_tracepoint
+
+  def ReadFileObject(self, file_object):
+    """Reads a timezone information file-like object.
+
+    Only the chunk headers and catalogs are read, where the chunk sets are
+    only read in debug mode. Use IterateTracepoints to read the firehose
+    tracepoints.
+
+    Args:
+      file_object (file): file-like object.
+
+    Raises:
+      ParseError: if the file cannot be read.
+    """
+    self._catalog_offsets = []
+    self._process_uuids = {}
+    self.catalogs = []
+    self.chunk_sets = []
+    self.header = None
+
+    file_offset = 0
+
+    chunk_header = self._ReadChunkHeader(file_object, file_offset)
+    if chunk_header.chunk_tag == 0x1000:
+      self.header = self._ReadHeader(file_object, file_offset + 16)
+
+      file_offset += 16 + chunk_header.chunk_data_size
+
+      _, alignment = divmod(file_offset, 8)
+      if alignment > 0:
+        file_offset += 8 - alignment
+
+    index_cache_key = None
+    if self._index_cache_path and not self._debug:
+      index_cache_key = self._GetIndexCacheKey()
+
+    if index_cache_key and self._ReadIndexCache(
+        file_object, self._index_cache_path, index_cache_key):
+      return
+
+    # The sub chunks of a catalog describe the chunk sets that follow the
+    # catalog, in order.
+    sub_chunks = []
+    sub_chunk_index = 0
+
+    while file_offset < self._file_size:
+      chunk_offset = file_offset
+
+      chunk_header = self._ReadChunkHeader(file_object, file_offset)
+      file_offset += 16
+
+      if chunk_header.chunk_tag == 0x600b:
+        catalog = self._ReadCatalog(file_object, file_offset, chunk_header)
+        self._catalog_offsets.append(chunk_offset)
+        self.catalogs.append(catalog)
+
+        sub_chunks = catalog.sub_chunks
+        sub_chunk_index = 0
+
+      elif chunk_header.chunk_tag == 0x600d:
+        chunk_set = TraceV3ChunkSetDescriptor()
+        chunk_set.chunk_data_size = chunk_header.chunk_data_size
+        chunk_set.chunk_offset = chunk_offset
+
+        if sub_chunk_index < len(sub_chunks):
+          sub_chunk = sub_chunks[sub_chunk_index]
+          chunk_set.end_time = sub_chunk.end_time
+          chunk_set.start_time = sub_chunk.start_time
+          sub_chunk_index += 1
+
+        self.chunk_sets.append(chunk_set)
+
+        if self._debug:
+          self._ReadChunkSet(file_object, file_offset, chunk_header)
+
+      file_offset += chunk_header.chunk_data_size
+
+      _, alignment = divmod(file_offset, 8)
+      if alignment > 0:
+        alignment = 8 - alignment
+
+      file_offset += alignment
+
+    if index_cache_key:
+      try:
+        self._WriteIndexCache(self._index_cache_path, index_cache_key)
+      except (IOError, OSError) as exception:
+        logging.warning((
+            f'Unable to write index cache: {self._index_cache_path:s} with '
+            f'error: {exception!s}'))
+
+
+class TraceV3ChunkSetScheduler(object):
+  """Schedules TraceV3 chunk sets to be read by worker processes.
+
+  The number of pending chunk sets, which are submitted to the worker
+  processes but of which the result has not been retrieved, is bounded
+  across all the tracev3 files that share the scheduler. Note that a tracev3
+  file can always submit the chunk set it needs next, hence the bound can be
+  exceeded by one chunk set.
+  """
+
+  def __init__(self, pool, maximum_number_of_pending_chunk_sets):
+    """Initializes a chunk set scheduler.
+
+    Args:
+      pool (multiprocessing.Pool): pool of worker processes, initialized with
+          TraceV3ChunkSetWorker.Initialize.
+      maximum_number_of_pending_chunk_sets (int): maximum number of pending
+          chunk sets.
+    """
+    super(TraceV3ChunkSetScheduler, self).__init__()
+    self._maximum_number_of_pending_chunk_sets = (
+        maximum_number_of_pending_chunk_sets)
+    self._pending_results = set()
+    self._pool = pool
+
+  @property
+  def has_capacity(self):
+    """bool: True if additional chunk sets can be submitted."""
+    return len(self._pending_results) < (
+        self._maximum_number_of_pending_chunk_sets)
+
+  @property
+  def number_of_pending_chunk_sets(self):
+    """int: number of pending chunk sets."""
+    return len(self._pending_results)
+
+  def GetResult(self, result):
+    """Retrieves the result of a chunk set.
+
+    Args:
+      result (multiprocessing.pool.AsyncResult): result of the chunk set.
+
+    Returns:
+      list[tuple[int, bytes, int, int, int, int, int]]: continuous time,
+          data, flags, format string location, first and second process
+          identifier and thread identifier per tracepoint.
+
+    Raises:
+      ParseError: if the chunk set or a firehose tracepoint cannot be read.
+    """
+    try:
+      return result.get()
+    finally:
+      self.Release(result)
+
+  def Release(self, result):
+    """Releases a chunk set without retrieving its result.
+
+    Args:
+      result (multiprocessing.pool.AsyncResult): result of the chunk set.
+    """
+    self._pending_results.discard(result)
+
+  def Submit(self, chunk_offset, chunk_data):
+    """Submits a chunk set to be read by a worker process.
+
+    Args:
+      chunk_offset (int): offset of the chunk set relative to the start of
+          the file.
+      chunk_data (bytes): compressed chunk set data.
+
+    Returns:
+      multiprocessing.pool.AsyncResult: result of the chunk set.
+    """
+    result = self._pool.apply_async(
+        TraceV3ChunkSetWorker.ReadTracepoints, (chunk_offset, chunk_data))
+    self._pending_results.add(result)
+
+    return result
+
+
+class TraceV3ChunkSetWorker(object):
+  """Worker process to read firehose tracepoints from TraceV3 chunk sets."""
+
+  _tracev3_file = None
+
+  @classmethod
+  def Initialize(cls):
+    """Initializes the worker process."""
+    cls._tracev3_file = TraceV3File()
+
+  @classmethod
+  def ReadTracepoints(cls, chunk_offset, chunk_data):
+    """Reads the firehose tracepoints of a chunk set.
+
+    Args:
+      chunk_offset (int): offset of the chunk set relative to the start of
+          the file.
+      chunk_data (bytes): compressed chunk set data.
+
+    Returns:
+      list[tuple[int, bytes, int, int, int, int, int]]: continuous time,
+          data, flags, format string location, first and second process
+          identifier and thread identifier per tracepoint.
+
+    Raises:
+      ParseError: if the chunk set or a firehose tracepoint cannot be read.
+    """
+    # pylint: disable=protected-access
+    chunk_set_data = cls._tracev3_file._DecompressChunkSetData(
+        chunk_data, chunk_offset + 16)
+
+    return [
+        (firehose_tracepoint.continuous_time, bytes(firehose_tracepoint.data),
+         firehose_tracepoint.flags, firehose_tracepoint.format_string_location,
+         firehose_tracepoint.process_identifier1,
+         firehose_tracepoint.process_identifier2,
+         firehose_tracepoint.thread_identifier)
+        for firehose_tracepoint in (
+            cls._tracev3_file._IterateFirehoseTracepoints(
+                chunk_offset, chunk_set_data))]
+
+
+class UUIDTextFile(data_format.BinaryDataFile):
+  """Apple Unified Logging and Activity Tracing (uuidtext) file."""
+
+  # Using a class constant significantly speeds up the time required to load
+  # the dtFabric definition file.
+  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile(
+      'unified_logging.yaml')
+
+  _DEBUG_INFO_FILE_FOOTER = [
+      ('library_path', 'Library path', '_FormatString')]
+
+  _DEBUG_INFO_FILE_HEADER = [
+      ('signature', 'Signature', '_FormatIntegerAsHexadecimal8'),
+      ('major_format_version', 'Major format version',
+       '_FormatIntegerAsDecimal'),
+      ('minor_format_version', 'Minor format version',
+       '_FormatIntegerAsDecimal'),
+      ('number_of_entries', 'Number of entries', '_FormatIntegerAsDecimal'),
+      ('entry_descriptors', 'Entry descriptors',
+       '_FormatArrayOfEntryDescriptors')]
+
+  def __init__(self, debug=False, output_writer=None):
+    """Initializes a timezone information file.
+
+    Args:
+      debug (Optional[bool]): True if debug information should be written.
+      output_writer (Optional[OutputWriter]): output writer.
+    """
+    super(UUIDTextFile, self).__init__(
+        debug=debug, output_writer=output_writer)
+
+  def _FormatArrayOfEntryDescriptors(self, array_of_entry_descriptors):
+    """Formats an array of entry descriptors.
+
+    Args:
+      array_of_entry_descriptors (list[uuidtext_entry_descriptor]): array of
+          entry descriptors.
+
+    Returns:
+      str: formatted array of entry descriptors.
+    """
+    value = '\n'.join([
+        (f'\t[{entry_index:03d}] offset: 0x{entry_descriptor.offset:08x}, '
+         f'data size: {entry_descriptor.data_size:d}')
+        for entry_index, entry_descriptor in enumerate(
+            array_of_entry_descriptors)])
+    return f'{value:s}\n'
+
+  def _ReadFileFooter(self, file_object, file_offset):
+    """Reads a file footer.
 
     Args:
       file_object (file): file-like object.
@@ -736,3 +1687,614 @@ class UUIDTextFile(data_format.BinaryDataFile):
       file_offset += entry_descriptor.data_size
 
     self._ReadFileFooter(file_object, file_offset)
+
+
+class FormatStringResolver(data_format.BinaryDataFormat):
+  """Format string resolver.
+
+  Resolves format strings using the uuidtext and shared-cache strings (dsc)
+  files in an uuidtext directory. The files are opened on demand by UUID and
+  indexed once, where the most recently used files are kept memory mapped.
+  """
+
+  # Using a class constant significantly speeds up the time required to load
+  # the dtFabric definition file.
+  _FABRIC = data_format.BinaryDataFile.ReadDefinitionFile(
+      'unified_logging.yaml')
+
+  _DSC_SIGNATURE = b'hcsd'
+
+  _UUIDTEXT_SIGNATURE = 0x66778899
+
+  def __init__(self, path, maximum_number_of_mapped_files=32):
+    """Initializes a format string resolver.
+
+    Args:
+      path (str): path of the uuidtext directory.
+      maximum_number_of_mapped_files (Optional[int]): maximum number of files
+          that are kept memory mapped.
+    """
+    super(FormatStringResolver, self).__init__()
+    self._indexes = {}
+    self._mapped_files = collections.OrderedDict()
+    self._maximum_number_of_mapped_files = maximum_number_of_mapped_files
+    self._path = path
+
+  def _GetIndex(self, path, index_function):
+    """Retrieves the index of a file.
+
+    Args:
+      path (str): path of the file.
+      index_function (function): function to index the file data.
+
+    Returns:
+      tuple[array.array, array.array, array.array]: range offsets, data offsets
+          and range sizes, sorted by range offset, or None if the file does
+          not exist or cannot be indexed.
+    """
+    if path in self._indexes:
+      return self._indexes[path]
+
+    index = None
+    ranges = None
+
+    file_data = self._GetMappedFileData(path)
+    if file_data is not None:
+      try:
+        ranges = sorted(index_function(file_data, path))
+      except errors.ParseError as exception:
+        # The failure is cached, so that a corrupt file is indexed only once.
+        logging.warning(
+            f'Unable to index file: {path:s} with error: {exception!s}')
+
+    if ranges is not None:
+      index = (
+          array.array('Q', [range_offset for range_offset, _, _ in ranges]),
+          array.array('Q', [data_offset for _, data_offset, _ in ranges]),
+          array.array('Q', [range_size for _, _, range_size in ranges]))
+
+    self._indexes[path] = index
+
+    return index
+
+  def _GetMappedFileData(self, path):
+    """Retrieves the memory mapped data of a file.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      mmap.mmap: memory mapped file data or None if the file does not exist
+          or is empty.
+    """
+    file_data = self._mapped_files.get(path, None)
+    if file_data is not None:
+      self._mapped_files.move_to_end(path)
+      return file_data
+
+    try:
+      with open(path, 'rb') as file_object:
+        file_data = mmap.mmap(
+            file_object.fileno(), 0, access=mmap.ACCESS_READ)
+
+    except (IOError, OSError, ValueError):
+      return None
+
+    self._mapped_files[path] = file_data
+
+    while len(self._mapped_files) > self._maximum_number_of_mapped_files:
+      _, evicted_file_data = self._mapped_files.popitem(last=False)
+      evicted_file_data.close()
+
+    return file_data
+
+  def _GetString(self, path, index_function, offset):
+    """Retrieves a string.
+
+    Args:
+      path (str): path of the file.
+      index_function (function): function to index the file data.
+      offset (int): offset of the string within the ranges of the file.
+
+    Returns:
+      str: string or None if not available.
+    """
+    index = self._GetIndex(path, index_function)
+    if not index:
+      return None
+
+    range_offsets, data_offsets, range_sizes = index
+
+    range_index = bisect.bisect_right(range_offsets, offset) - 1
+    if range_index < 0:
+      return None
+
+    relative_offset = offset - range_offsets[range_index]
+    if relative_offset >= range_sizes[range_index]:
+      return None
+
+    file_data = self._GetMappedFileData(path)
+    if file_data is None:
+      return None
+
+    data_offset = data_offsets[range_index] + relative_offset
+    data_end_offset = min(
+        data_offsets[range_index] + range_sizes[range_index], len(file_data))
+
+    string_end_offset = file_data.find(b'\x00', data_offset, data_end_offset)
+    if string_end_offset == -1:
+      string_end_offset = data_end_offset
+
+    return file_data[data_offset:string_end_offset].decode(
+        'utf-8', errors='replace')
+
+  def _IndexDSCFile(self, file_data, path):
+    """Indexes a shared-cache strings (dsc) file.
+
+    Args:
+      file_data (mmap.mmap): file data.
+      path (str): path of the file.
+
+    Returns:
+      list[tuple[int, int, int]]: range offset, data offset and range size
+          per range.
+
+    Raises:
+      ParseError: if the file cannot be indexed.
+    """
+    data_type_map = self._GetDataTypeMap('dsc_file_header')
+    data_size = data_type_map.GetSizeHint()
+
+    file_header = self._ReadStructureFromByteStream(
+        file_data[:data_size], 0, data_type_map, 'dsc file header')
+
+    if (file_header.signature != self._DSC_SIGNATURE or
+        file_header.major_format_version not in (1, 2)):
+      raise errors.ParseError(f'Unsupported dsc file: {path:s}')
+
+    if file_header.major_format_version == 1:
+      data_type_map_name = 'dsc_range_descriptor_v1'
+    else:
+      data_type_map_name = 'dsc_range_descriptor_v2'
+
+    data_type_map = self._GetDataTypeMap(data_type_map_name)
+    range_descriptor_size = data_type_map.GetSizeHint()
+
+    file_offset = data_size
+
+    range_descriptors_end_offset = file_offset + (
+        file_header.number_of_ranges * range_descriptor_size)
+    if range_descriptors_end_offset > len(file_data):
+      raise errors.ParseError(
+          f'Range descriptors exceed dsc file: {path:s}')
+
+    ranges = []
+    for _ in range(file_header.number_of_ranges):
+      range_descriptor = self._ReadStructureFromByteStream(
+          file_data[file_offset:file_offset + range_descriptor_size],
+          file_offset, data_type_map, 'dsc range descriptor')
+
+      file_offset += range_descriptor_size
+
+      ranges.append((
+          range_descriptor.range_offset, range_descriptor.data_offset,
+          range_descriptor.range_size))
+
+    return ranges
+
+  def _IndexUUIDTextFile(self, file_data, path):
+    """Indexes an uuidtext file.
+
+    Args:
+      file_data (mmap.mmap): file data.
+      path (str): path of the file.
+
+    Returns:
+      list[tuple[int, int, int]]: range offset, data offset and range size
+          per entry.
+
+    Raises:
+      ParseError: if the file cannot be indexed.
+    """
+    data_type_map = self._GetDataTypeMap('uuidtext_file_header')
+
+    # The file header contains the entry descriptors and has a variable size,
+    # hence it is read from the memory mapped file data as a file-like object.
+    file_header, data_offset = self._ReadStructureFromFileObject(
+        file_data, 0, data_type_map, 'uuidtext file header')
+
+    if file_header.signature != self._UUIDTEXT_SIGNATURE:
+      raise errors.ParseError(f'Unsupported uuidtext file: {path:s}')
+
+    ranges = []
+    for entry_descriptor in file_header.entry_descriptors:
+      ranges.append((
+          entry_descriptor.offset, data_offset, entry_descriptor.data_size))
+
+      data_offset += entry_descriptor.data_size
+
+    return ranges
+
+  def Close(self):
+    """Closes the memory mapped files."""
+    for file_data in self._mapped_files.values():
+      file_data.close()
+
+    self._mapped_files = collections.OrderedDict()
+
+  def GetDSCFormatString(self, uuid, offset):
+    """Retrieves a format string from a shared-cache strings (dsc) file.
+
+    Args:
+      uuid (uuid.UUID): UUID of the shared-cache strings (dsc) file.
+      offset (int): offset of the format string in the shared cache.
+
+    Returns:
+      str: format string or None if not available.
+    """
+    path = os.path.join(self._path, 'dsc', uuid.hex.upper())
+    return self._GetString(path, self._IndexDSCFile, offset)
+
+  def GetUUIDTextFormatString(self, uuid, offset):
+    """Retrieves a format string from an uuidtext file.
+
+    Args:
+      uuid (uuid.UUID): UUID of the uuidtext file.
+      offset (int): offset of the format string.
+
+    Returns:
+      str: format string or None if not available.
+    """
+    uuid_string = uuid.hex.upper()
+    path = os.path.join(self._path, uuid_string[:2], uuid_string[2:])
+    return self._GetString(path, self._IndexUUIDTextFile, offset)
+
+
+class LogArchiveEntry(object):
+  """Apple Unified Logging and Activity Tracing log archive entry.
+
+  Attributes:
+    firehose_tracepoint (TraceV3FirehoseTracepoint): firehose tracepoint.
+    format_string (str): format string or None if not available.
+    path (str): path of the tracev3 file that contains the tracepoint,
+        relative to the log archive.
+    wall_clock_time (int): wall clock time of the tracepoint, as the number
+        of nanoseconds since January 1, 1970 00:00:00 UTC, or None if not
+        available.
+  """
+
+  def __init__(self):
+    """Initializes a log archive entry."""
+    super(LogArchiveEntry, self).__init__()
+    self.firehose_tracepoint = None
+    self.format_string = None
+    self.path = None
+    self.wall_clock_time = None
+
+
+class LogArchive(object):
+  """Apple Unified Logging and Activity Tracing log archive.
+
+  A log archive, such as a .logarchive directory or /var/db/diagnostics
+  combined with /var/db/uuidtext, contains tracev3 files in the HighVolume,
+  Persist, Signpost and Special sub directories and the uuidtext and
+  shared-cache strings (dsc) files used to resolve format strings.
+  """
+
+  _FLAG_HAS_LARGE_OFFSET = 0x0020
+
+  _FORMAT_STRING_TYPE_MAIN_EXECUTABLE = 0x0002
+
+  _FORMAT_STRING_TYPE_MASK = 0x000e
+
+  _FORMAT_STRING_TYPE_SHARED_CACHE = 0x0004
+
+  _TRACEV3_DIRECTORIES = ('HighVolume', 'Persist', 'Signpost', 'Special')
+
+  def __init__(
+      self, number_of_workers=1, maximum_number_of_mapped_files=32,
+      uuidtext_path=None, index_cache_path=None):
+    """Initializes a log archive.
+
+    Args:
+      number_of_workers (Optional[int]): number of worker processes to
+          decompress and parse the chunk sets of all tracev3 files with, where
+          1 represents reading the chunk sets in the current process.
+      maximum_number_of_mapped_files (Optional[int]): maximum number of
+          uuidtext and shared-cache strings (dsc) files that are kept memory
+          mapped.
+      uuidtext_path (Optional[str]): path of the uuidtext directory or None
+          if the uuidtext directory is part of the log archive.
+      index_cache_path (Optional[str]): path of the directory that contains
+          the index cache files of the tracev3 files or None if index cache
+          files should not be used.
+    """
+    super(LogArchive, self).__init__()
+    self._format_string_resolver = None
+    self._index_cache_path = index_cache_path
+    self._maximum_number_of_mapped_files = maximum_number_of_mapped_files
+    self._number_of_workers = number_of_workers
+    self._path = None
+    self._tracev3_files = []
+    self._uuidtext_path = uuidtext_path
+
+  @property
+  def number_of_tracev3_files(self):
+    """int: number of tracev3 files in the log archive."""
+    return len(self._tracev3_files)
+
+  def _GetFormatString(self, tracev3_file, firehose_tracepoint):
+    """Retrieves the format string of a tracepoint.
+
+    Only format strings stored in the uuidtext file of the main executable or
+    in the shared-cache strings (dsc) file, without a large offset, are
+    supported.
+
+    Args:
+      tracev3_file (TraceV3File): tracev3 file that contains the tracepoint.
+      firehose_tracepoint (TraceV3FirehoseTracepoint): firehose tracepoint.
+
+    Returns:
+      str: format string or None if not available.
+    """
+    flags = firehose_tracepoint.flags
+    if flags & self._FLAG_HAS_LARGE_OFFSET:
+      return None
+
+    format_string_type = flags & self._FORMAT_STRING_TYPE_MASK
+    if format_string_type not in (
+        self._FORMAT_STRING_TYPE_MAIN_EXECUTABLE,
+        self._FORMAT_STRING_TYPE_SHARED_CACHE):
+      return None
+
+    main_uuid, dsc_uuid = tracev3_file.GetProcessUUIDs(firehose_tracepoint)
+
+    if format_string_type == self._FORMAT_STRING_TYPE_MAIN_EXECUTABLE:
+      if not main_uuid:
+        return None
+
+      return self._format_string_resolver.GetUUIDTextFormatString(
+          main_uuid, firehose_tracepoint.format_string_location)
+
+    if not dsc_uuid:
+      return None
+
+    return self._format_string_resolver.GetDSCFormatString(
+        dsc_uuid, firehose_tracepoint.format_string_location)
+
+  def _GetIndexCacheFilePath(self, relative_path):
+    """Retrieves the path of the index cache file of a tracev3 file.
+
+    Args:
+      relative_path (str): path of the tracev3 file, relative to the log
+          archive.
+
+    Returns:
+      str: path of the index cache file or None if index cache files should
+          not be used.
+    """
+    if not self._index_cache_path:
+      return None
+
+    index_cache_filename = relative_path.replace(os.sep, '_')
+
+    return os.path.join(self._index_cache_path, f'{index_cache_filename:s}.idx')
+
+  def _GetTraceV3FilePaths(self, path):
+    """Retrieves the paths of the tracev3 files in the log archive.
+
+    Args:
+      path (str): path of the log archive.
+
+    Returns:
+      list[str]: paths of the tracev3 files.
+    """
+    tracev3_file_paths = []
+    for directory_name in self._TRACEV3_DIRECTORIES:
+      glob_pattern = os.path.join(
+          glob.escape(path), directory_name, '*.tracev3')
+      tracev3_file_paths.extend(sorted(glob.glob(glob_pattern)))
+
+    return tracev3_file_paths
+
+  def _IterateFileEntries(
+      self, file_index, scheduler, start_time=None, end_time=None):
+    """Iterates over the entries of a tracev3 file.
+
+    Args:
+      file_index (int): index of the tracev3 file.
+      scheduler (TraceV3ChunkSetScheduler): chunk set scheduler or None to
+          read the chunk sets in the current process.
+      start_time (Optional[int]): wall clock time of the start of the time
+          range, inclusive, or None if the time range has no start.
+      end_time (Optional[int]): wall clock time of the end of the time range,
+          inclusive, or None if the time range has no end.
+
+    Yields:
+      tuple[int, int, LogArchiveEntry]: merge key, index of the tracev3 file
+          and log archive entry.
+
+    Raises:
+      ParseError: if a chunk set or firehose tracepoint cannot be read.
+    """
+    relative_path, tracev3_file = self._tracev3_files[file_index]
+
+    # The time range is converted to the continuous time of the tracev3 file,
+    # since the continuous time of the header differs per tracev3 file. If
+    # the wall clock time is not available none of the entries of the tracev3
+    # file are in the time range.
+    continuous_start_time = None
+    if start_time is not None:
+      continuous_start_time = tracev3_file.GetContinuousTime(start_time)
+      if continuous_start_time is None:
+        return
+
+    continuous_end_time = None
+    if end_time is not None:
+      continuous_end_time = tracev3_file.GetContinuousTime(end_time + 1)
+      if continuous_end_time is None:
+        return
+
+      continuous_end_time -= 1
+
+    firehose_tracepoints = tracev3_file.IterateTracepoints(
+        start_time=continuous_start_time, end_time=continuous_end_time,
+        scheduler=scheduler)
+
+    # The firehose chunks of a chunk set are stored per process and hence the
+    # tracepoints of a chunk set are not necessarily in time order. The merge
+    # requires ordered input, therefore the tracepoints of every chunk set are
+    # sorted by time, where tracepoints with the same time stay in file order.
+    chunk_sets = itertools.groupby(
+        firehose_tracepoints, key=lambda tracepoint: tracepoint.chunk_offset)
+
+    for _, chunk_set_tracepoints in chunk_sets:
+      for firehose_tracepoint in sorted(
+          chunk_set_tracepoints,
+          key=lambda tracepoint: tracepoint.continuous_time):
+        log_archive_entry = LogArchiveEntry()
+        log_archive_entry.firehose_tracepoint = firehose_tracepoint
+        log_archive_entry.format_string = self._GetFormatString(
+            tracev3_file, firehose_tracepoint)
+        log_archive_entry.path = relative_path
+        log_archive_entry.wall_clock_time = tracev3_file.GetWallClockTime(
+            firehose_tracepoint.continuous_time)
+
+        merge_key = log_archive_entry.wall_clock_time
+        if merge_key is None:
+          merge_key = firehose_tracepoint.continuous_time
+
+        yield merge_key, file_index, log_archive_entry
+
+  def _MergeFileEntries(self, scheduler, start_time=None, end_time=None):
+    """Merges the entries of the tracev3 files.
+
+    Args:
+      scheduler (TraceV3ChunkSetScheduler): chunk set scheduler or None to
+          read the chunk sets in the current process.
+      start_time (Optional[int]): wall clock time of the start of the time
+          range, inclusive, or None if the time range has no start.
+      end_time (Optional[int]): wall clock time of the end of the time range,
+          inclusive, or None if the time range has no end.
+
+    Yields:
+      LogArchiveEntry: log archive entry.
+
+    Raises:
+      ParseError: if a chunk set or firehose tracepoint cannot be read.
+    """
+    # The index of the tracev3 file is part of the merge key so that log
+    # archive entries with the same time are never compared.
+    for _, _, log_archive_entry in heapq.merge(*[
+        self._IterateFileEntries(
+            file_index, scheduler, start_time=start_time, end_time=end_time)
+        for file_index in range(len(self._tracev3_files))]):
+      yield log_archive_entry
+
+  def Close(self):
+    """Closes the log archive."""
+    for _, tracev3_file in self._tracev3_files:
+      tracev3_file.Close()
+
+    if self._format_string_resolver:
+      self._format_string_resolver.Close()
+
+    self._format_string_resolver = None
+    self._path = None
+    self._tracev3_files = []
+
+  def IterateEntries(self, start_time=None, end_time=None):
+    """Iterates over the entries of the tracev3 files in time order.
+
+    The tracepoints of the individual tracev3 files are merged using a k-way
+    merge on their wall clock time, which is estimated per file from its
+    header, or continuous time if the wall clock time is not available.
+
+    The tracepoints of a single tracev3 file are sorted by time per chunk set.
+    Chunk sets are merged in file order, hence if the time ranges of
+    successive chunk sets of a tracev3 file overlap, which can happen when
+    the firehose buffers of processes are flushed at different times, the
+    entries within the overlap are not guaranteed to be in time order.
+
+    If a time range is specified it applies to the wall clock time of the
+    tracepoints. The time range is converted to the continuous time of every
+    tracev3 file and only the chunk sets that overlap with the time range are
+    read.
+
+    The worker processes are shared between the tracev3 files and the number
+    of chunk sets pending in the worker processes is bounded to twice the
+    number of worker processes for all tracev3 files together. Note that the
+    merge keeps the chunk set currently being read of every tracev3 file in
+    memory.
+
+    Args:
+      start_time (Optional[int]): wall clock time of the start of the time
+          range, as the number of nanoseconds since January 1, 1970 00:00:00
+          UTC, inclusive, or None if the time range has no start.
+      end_time (Optional[int]): wall clock time of the end of the time range,
+          as the number of nanoseconds since January 1, 1970 00:00:00 UTC,
+          inclusive, or None if the time range has no end.
+
+    Yields:
+      LogArchiveEntry: log archive entry.
+
+    Raises:
+      ParseError: if a chunk set or firehose tracepoint cannot be read.
+    """
+    if self._number_of_workers <= 1:
+      yield from self._MergeFileEntries(
+          None, start_time=start_time, end_time=end_time)
+      return
+
+    with multiprocessing.Pool(
+        processes=self._number_of_workers,
+        initializer=TraceV3ChunkSetWorker.Initialize) as pool:
+      scheduler = TraceV3ChunkSetScheduler(pool, self._number_of_workers * 2)
+
+      yield from self._MergeFileEntries(
+          scheduler, start_time=start_time, end_time=end_time)
+
+  def Open(self, path):
+    """Opens a log archive.
+
+    Args:
+      path (str): path of the log archive.
+
+    Raises:
+      IOError: if the log archive is already opened or cannot be opened, or
+          if the index cache directory does not exist.
+      OSError: if the log archive is already opened or cannot be opened, or
+          if the index cache directory does not exist.
+      ParseError: if a tracev3 file cannot be read.
+    """
+    if self._path:
+      raise IOError('Already open.')
+
+    if not os.path.isdir(path):
+      raise IOError(f'Unsupported log archive: {path:s}')
+
+    if self._index_cache_path and not os.path.isdir(self._index_cache_path):
+      raise IOError(
+          f'Unsupported index cache directory: {self._index_cache_path:s}')
+
+    tracev3_files = []
+    try:
+      for tracev3_file_path in self._GetTraceV3FilePaths(path):
+        relative_path = os.path.relpath(tracev3_file_path, path)
+
+        tracev3_file = TraceV3File(
+            index_cache_path=self._GetIndexCacheFilePath(relative_path))
+        tracev3_file.Open(tracev3_file_path)
+
+        tracev3_files.append((relative_path, tracev3_file))
+
+    except (IOError, OSError, errors.ParseError):
+      for _, tracev3_file in tracev3_files:
+        tracev3_file.Close()
+      raise
+
+    self._format_string_resolver = FormatStringResolver(
+        self._uuidtext_path or path,
+        maximum_number_of_mapped_files=self._maximum_number_of_mapped_files)
+    self._path = path
+    self._tracev3_files = tracev3_files
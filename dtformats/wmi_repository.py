@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 """WMI Common Information Model (CIM) repository files."""
 
+import array
+import collections
 import glob
 import hashlib
 import logging
+import multiprocessing
 import os
+import struct
+
+from multiprocessing import util as multiprocessing_util
 
 from dtfabric import errors as dtfabric_errors
 from dtfabric.runtime import data_maps as dtfabric_data_maps
@@ -45,9 +51,27 @@ class ClassValueDataMap(object):
     properties (dict[str, PropertyValueDataMap]): value data maps of
         the properties.
     properties_size (int): size of the properties in value data.
+    property_state_bits_size (int): size of the property state bits.
+    property_values_maps (list[PropertyValueDataMap]): value data maps of
+        the properties in the order of property_values_struct.
+    property_values_struct (struct.Struct): structure to unpack the property
+        values data or None if not supported by the properties.
     super_class_name (str): name of the parent class or None if not available.
   """
 
+  # Struct format characters of fixed-size property values per type qualifier.
+  _PROPERTY_VALUE_STRUCT_FORMATS = {
+      'boolean': 'H',
+      'sint32': 'i',
+      'uint8': 'B',
+      'uint16': 'H',
+      'uint32': 'I',
+      'uint64': 'Q'}
+
+  _FIXED_SIZE_VALUE_DATA_TYPES = frozenset([
+      0x00000002, 0x00000003, 0x00000004, 0x00000005, 0x0000000b, 0x00000010,
+      0x00000011, 0x00000012, 0x00000013, 0x00000014, 0x00000015])
+
   _PROPERTY_TYPE_VALUE_DATA_SIZE = {
       0x00000002: 2,
       0x00000003: 4,
@@ -69,8 +93,53 @@ class ClassValueDataMap(object):
     self.dynasty = None
     self.properties = {}
     self.properties_size = 0
+    self.property_state_bits_size = 0
+    self.property_values_maps = []
+    self.property_values_struct = None
     self.super_class_name = None
 
+  def _CompilePropertyValuesStruct(self):
+    """Compiles the structure to unpack the property values data.
+
+    Fixed-size property values are unpacked as their type qualifier and other
+    property values as their 32-bit offset in the values data.
+
+    Returns:
+      struct.Struct: structure to unpack the property values data or None if
+          not supported by the properties, for example if a type qualifier has
+          no corresponding struct format character or properties overlap.
+    """
+    property_values_maps = sorted(
+        self.properties.values(), key=lambda property_map: property_map.offset)
+
+    format_strings = ['<']
+    struct_offset = 0
+
+    for property_map in property_values_maps:
+      if property_map.data_type in self._FIXED_SIZE_VALUE_DATA_TYPES:
+        format_string = self._PROPERTY_VALUE_STRUCT_FORMATS.get(
+            property_map.type_qualifier, None)
+      else:
+        format_string = 'I'
+
+      if not format_string or property_map.offset < struct_offset:
+        return None
+
+      if property_map.offset > struct_offset:
+        padding_size = property_map.offset - struct_offset
+        format_strings.append(f'{padding_size:d}x')
+
+      format_strings.append(format_string)
+      struct_offset = property_map.offset + struct.calcsize(
+          f'<{format_string:s}')
+
+    if struct_offset > self.properties_size:
+      return None
+
+    self.property_values_maps = property_values_maps
+
+    return struct.Struct(''.join(format_strings))
+
   def Build(self, class_definitions):
     """Builds the class map from the class definitions.
 
@@ -133,6 +202,39 @@ class ClassValueDataMap(object):
       self.properties_size = (
           largest_property_map.offset + largest_property_map.size)
 
+    # 2 state bits per property, stored byte aligned.
+    self.property_state_bits_size, remainder = divmod(len(self.properties), 4)
+    if remainder > 0:
+      self.property_state_bits_size += 1
+
+    self.property_values_struct = self._CompilePropertyValuesStruct()
+
+
+class EventConsumerBinding(object):
+  """WMI event consumer binding.
+
+  Attributes:
+    binding (Instance): event filter to consumer binding instance.
+    consumer (Instance): event consumer instance or None if not available.
+    filter (Instance): event filter instance or None if not available.
+    namespace (str): namespace of the binding or None if not available.
+    namespace_hash (str): hash of the namespace of the binding.
+  """
+
+  def __init__(self, namespace_hash, binding):
+    """Initializes a WMI event consumer binding.
+
+    Args:
+      namespace_hash (str): hash of the namespace of the binding.
+      binding (Instance): event filter to consumer binding instance.
+    """
+    super(EventConsumerBinding, self).__init__()
+    self.binding = binding
+    self.consumer = None
+    self.filter = None
+    self.namespace = None
+    self.namespace_hash = namespace_hash
+
 
 class IndexBinaryTreePage(object):
   """Index binary-tree page.
@@ -646,6 +748,10 @@ class MappingFile(data_format.BinaryDataFile):
       ('unknown4', '    Unknown4', '_FormatIntegerAsHexadecimal8'),
       ('unknown5', '    Unknown5', '_FormatIntegerAsHexadecimal8')]
 
+  _MAPPING_TABLE_ENTRY_SIZES = {
+      1: 4,
+      2: 24}
+
   def __init__(self, debug=False, output_writer=None):
     """Initializes a mappings file.
 
@@ -807,6 +913,34 @@ class MappingFile(data_format.BinaryDataFile):
 
     return mapping_table
 
+  def _ReadTableNumberOfEntries(self, file_object, description):
+    """Reads the number of entries of a table.
+
+    Args:
+      file_object (file): file-like object.
+      description (str): description of the table.
+
+    Returns:
+      int: number of entries.
+
+    Raises:
+      ParseError: if the number of entries cannot be read.
+    """
+    file_offset = file_object.tell()
+
+    data_type_map = self._GetDataTypeMap('uint32le')
+
+    number_of_entries, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map,
+        f'{description:s} number of entries')
+
+    if self._debug:
+      self._DebugPrintDecimalValue(
+          f'{description[0].upper():s}{description[1:]:s} number of entries',
+          number_of_entries)
+
+    return number_of_entries
+
   def _ReadUnknownTable(self, file_object):
     """Reads the unknown tables.
 
@@ -847,6 +981,41 @@ class MappingFile(data_format.BinaryDataFile):
     """
     return MappingTable(self._mapping_table1)
 
+  def ReadFileHeaderAndFooter(self, file_object):
+    """Reads the file header and footer of a mappings file-like object.
+
+    Only the sizes of the mapping and unknown tables are read, in order to
+    locate the file footer, the table entries are skipped. This is
+    sufficient to determine the format version and sequence number of
+    a mappings file, for example to determine the active mapping file.
+
+    Args:
+      file_object (file): file-like object.
+
+    Raises:
+      ParseError: if the file header or footer cannot be read.
+    """
+    self._ReadDetermineFormatVersion(file_object)
+
+    file_object.seek(0, os.SEEK_SET)
+
+    file_header = self._ReadFileHeader(
+        file_object, format_version=self.format_version)
+    self.sequence_number = file_header.sequence_number
+
+    number_of_entries = self._ReadTableNumberOfEntries(
+        file_object, 'mapping table')
+
+    entry_size = self._MAPPING_TABLE_ENTRY_SIZES[self.format_version]
+    file_object.seek(number_of_entries * entry_size, os.SEEK_CUR)
+
+    number_of_entries = self._ReadTableNumberOfEntries(
+        file_object, 'unknown table')
+
+    file_object.seek(number_of_entries * 4, os.SEEK_CUR)
+
+    self._ReadFileFooter(file_object)
+
   def ReadFileObject(self, file_object):
     """Reads a mappings file-like object.
 
@@ -1022,39 +1191,70 @@ class ObjectsDataFile(data_format.BinaryDataFile):
     """
     self._file_object = file_object
 
-  def ReadObjectRecordDataSegment(self, objects_page, data_offset, data_size):
-    """Reads a data segment of an object record.
+  def ReadObjectRecordData(
+      self, mapping_table, mapped_page_number, data_offset, data_size):
+    """Reads the data of an object record.
+
+    The data of an object record can span multiple pages. Data of consecutive
+    mapped pages that are stored in physically contiguous pages is read at
+    once.
 
     Args:
-      objects_page (ObjectsDataPage): objects data page.
+      mapping_table (MappingTable): objects mapping table.
+      mapped_page_number (int): mapped page number of the page that contains
+          the start of the object record data.
       data_offset (int): offset of the object record data relative to
           the start of the page.
       data_size (int): object record data size.
 
     Returns:
-      bytes: object record data segment.
+      bytes: object record data.
 
     Raises:
-      ParseError: if the object record data segment cannot be read.
+      ParseError: if the object record data cannot be read.
     """
-    # Make the offset relative to the start of the file.
-    file_offset = objects_page.page_offset + data_offset
+    page_number = mapping_table.ResolveMappedPageNumber(mapped_page_number)
 
-    self._file_object.seek(file_offset, os.SEEK_SET)
+    read_offset = (page_number * self._PAGE_SIZE) + data_offset
+    read_size = min(data_size, self._PAGE_SIZE - data_offset)
+    remaining_data_size = data_size - read_size
 
-    if self._debug:
-      self._DebugPrintText((
-          f'Reading object record data segment at offset: {file_offset:d} '
-          f'(0x{file_offset:08x})\n'))
+    data_ranges = []
+    while remaining_data_size > 0:
+      mapped_page_number += 1
+      next_page_number = mapping_table.ResolveMappedPageNumber(
+          mapped_page_number)
 
-    available_page_size = self._PAGE_SIZE - data_offset
+      if next_page_number != page_number + 1:
+        data_ranges.append((read_offset, read_size))
 
-    if data_size > available_page_size:
-      read_size = available_page_size
-    else:
-      read_size = data_size
+        read_offset = next_page_number * self._PAGE_SIZE
+        read_size = 0
+
+      segment_size = min(remaining_data_size, self._PAGE_SIZE)
+
+      page_number = next_page_number
+      read_size += segment_size
+      remaining_data_size -= segment_size
+
+    data_ranges.append((read_offset, read_size))
+
+    data_segments = []
+    for read_offset, read_size in data_ranges:
+      if self._debug:
+        self._DebugPrintText((
+            f'Reading object record data segment at offset: {read_offset:d} '
+            f'(0x{read_offset:08x}) of size: {read_size:d}\n'))
 
-    return self._file_object.read(read_size)
+      data_segment = self._ReadData(
+          self._file_object, read_offset, read_size,
+          'object record data segment')
+      data_segments.append(data_segment)
+
+    if len(data_segments) == 1:
+      return data_segments[0]
+
+    return b''.join(data_segments)
 
 
 class RepositoryFile(data_format.BinaryDataFile):
@@ -1223,6 +1423,12 @@ class RepositoryFile(data_format.BinaryDataFile):
       ('unknown_block_data', 'Unknown block data', '_FormatDataInHexadecimal'),
       ('footer', 'Footer', '_FormatDataInHexadecimal')]
 
+  _MAXIMUM_NUMBER_OF_CACHED_NODE_CELLS = 4096
+
+  _NODE_CELL_SCAN_BUFFER_SIZE = 1024 * 1024
+
+  _UINT32LE = struct.Struct('<I')
+
   def __init__(self, debug=False, output_writer=None):
     """Initializes a repository file.
 
@@ -1232,9 +1438,38 @@ class RepositoryFile(data_format.BinaryDataFile):
     """
     super(RepositoryFile, self).__init__(
         debug=debug, output_writer=output_writer)
+    self._next_node_bin_offset = None
+    self._node_cell_offsets = array.array('Q')
+    self._node_cell_scan_offset = None
+    self._node_cells = collections.OrderedDict()
     self._root_namespace_node_offset = None
     self._system_class_definition_root_node_offset = None
 
+  def _GetNodeCellOffset(self, file_object, cell_number):
+    """Retrieves the offset of a node cell.
+
+    The node cell offsets are indexed on demand, in a single pass over
+    the node cells.
+
+    Args:
+      file_object (file): file-like object.
+      cell_number (int): cell number.
+
+    Returns:
+      int: offset of the node cell relative to the start of the file or None
+          if not available.
+
+    Raises:
+      ParseError: if the node cell offsets cannot be read.
+    """
+    if cell_number >= len(self._node_cell_offsets):
+      self._ReadNodeCellOffsets(file_object, cell_number)
+
+    if cell_number >= len(self._node_cell_offsets):
+      return None
+
+    return self._node_cell_offsets[cell_number]
+
   def _ReadChildObjectsList(self, file_object, list_node_offset):
     """Reads a child objects list.
 
@@ -1246,8 +1481,8 @@ class RepositoryFile(data_format.BinaryDataFile):
     Yields:
       int: element value offset.
     """
-    node_cell = self._ReadNodeCell(file_object, list_node_offset - 4)
-    list_node = self._ReadChildObjectsListNode(node_cell.data, list_node_offset)
+    list_node = self._ReadNodeAtOffset(
+        file_object, list_node_offset, self._ReadChildObjectsListNode)
 
     list_element = 1
     next_list_element_node_offset = list_node.first_list_element_node_offset
@@ -1256,15 +1491,14 @@ class RepositoryFile(data_format.BinaryDataFile):
       if self._debug:
         self._DebugPrintText(f'Reading list element: {list_element:d}\n')
 
-      node_cell = self._ReadNodeCell(
-          file_object, next_list_element_node_offset - 4)
-      list_element_node = self._ReadChildObjectsListElementNode(
-          node_cell.data, next_list_element_node_offset)
+      list_element_node = self._ReadNodeAtOffset(
+          file_object, next_list_element_node_offset,
+          self._ReadChildObjectsListElementNode)
 
       if list_element_node.name_node_offset > 40:
-        node_cell = self._ReadNodeCell(
-            file_object, list_element_node.name_node_offset - 4)
-        self._ReadNameNode(node_cell.data, list_element_node.name_node_offset)
+        self._ReadNodeAtOffset(
+            file_object, list_element_node.name_node_offset,
+            self._ReadNameNode)
 
       yield list_element_node.value_node_offset
 
@@ -1345,25 +1579,22 @@ class RepositoryFile(data_format.BinaryDataFile):
     Yields:
       int: leaf value offset.
     """
-    node_cell = self._ReadNodeCell(file_object, root_node_offset - 4)
-    root_node = self._ReadChildObjectsTreeRootNode(
-        node_cell.data, root_node_offset)
+    root_node = self._ReadNodeAtOffset(
+        file_object, root_node_offset, self._ReadChildObjectsTreeRootNode)
 
     if root_node.depth == 1:
       yield root_node.branch_node_offset
 
     elif root_node.depth == 2:
       if root_node.branch_node_offset > 40:
-        node_cell = self._ReadNodeCell(
-            file_object, root_node.branch_node_offset - 4)
-        branch_node = self._ReadChildObjectsTreeBranchNode(
-            node_cell.data, root_node.branch_node_offset)
+        branch_node = self._ReadNodeAtOffset(
+            file_object, root_node.branch_node_offset,
+            self._ReadChildObjectsTreeBranchNode)
 
         if branch_node.leaf_node_offset > 40:
-          node_cell = self._ReadNodeCell(
-              file_object, branch_node.leaf_node_offset - 4)
-          leaf_node = self._ReadChildObjectsTreeLeafNode(
-              node_cell.data, branch_node.leaf_node_offset)
+          leaf_node = self._ReadNodeAtOffset(
+              file_object, branch_node.leaf_node_offset,
+              self._ReadChildObjectsTreeLeafNode)
 
           for node_offset in (
               leaf_node.value_node_offset1,
@@ -1735,6 +1966,30 @@ class RepositoryFile(data_format.BinaryDataFile):
 
     return name_node
 
+  def _ReadNodeAtOffset(self, file_object, node_offset, read_node_function):
+    """Reads a node that is referenced by offset.
+
+    Nodes refer to other nodes by the offset of the node data, which follows
+    the 4-byte size of the node cell, and not by cell number. Hence the node
+    cell is read, using the node cell cache, at that offset directly instead
+    of through the cell number to offset index.
+
+    Args:
+      file_object (file): file-like object.
+      node_offset (int): offset of the node data relative to the start of
+          the file.
+      read_node_function (function): function to read the node from the node
+          cell data.
+
+    Returns:
+      object: node.
+
+    Raises:
+      ParseError: if the node cannot be read.
+    """
+    node_cell = self._ReadNodeCell(file_object, node_offset - 4)
+    return read_node_function(node_cell.data, node_offset)
+
   def _ReadNodeBinHeader(self, file_object, file_offset):
     """Reads a node bin header.
 
@@ -1763,6 +2018,8 @@ class RepositoryFile(data_format.BinaryDataFile):
   def _ReadNodeCell(self, file_object, file_offset, cell_number=None):
     """Reads a node cell.
 
+    The most recently read node cells are cached.
+
     Args:
       file_object (file): file-like object.
       file_offset (int): offset of the node cell relative to the start of
@@ -1775,11 +2032,21 @@ class RepositoryFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the node cell cannot be read.
     """
+    node_cell = self._node_cells.get(file_offset, None)
+    if node_cell and not self._debug:
+      self._node_cells.move_to_end(file_offset)
+      return node_cell
+
     data_type_map = self._GetDataTypeMap('cim_rep_node_cell')
 
     node_cell, _ = self._ReadStructureFromFileObject(
         file_object, file_offset, data_type_map, 'node cell')
 
+    if len(self._node_cells) >= self._MAXIMUM_NUMBER_OF_CACHED_NODE_CELLS:
+      self._node_cells.popitem(last=False)
+
+    self._node_cells[file_offset] = node_cell
+
     if self._debug:
       value_string = self._FormatIntegerAsOffset(file_offset)
       self._DebugPrintValue('Node cell offset', value_string)
@@ -1795,6 +2062,70 @@ class RepositoryFile(data_format.BinaryDataFile):
 
     return node_cell
 
+  def _ReadNodeCellOffsets(self, file_object, maximum_cell_number):
+    """Reads node cell offsets.
+
+    Only the sizes of the node bins and cells are read, in buffered reads,
+    continuing from the last node cell offset read.
+
+    Args:
+      file_object (file): file-like object.
+      maximum_cell_number (int): cell number up to which to read the node cell
+          offsets.
+
+    Raises:
+      ParseError: if the node cell offsets cannot be read.
+    """
+    file_offset = self._node_cell_scan_offset
+    next_node_bin_offset = self._next_node_bin_offset
+
+    buffer_data = b''
+    buffer_offset = 0
+
+    while (file_offset + 4 <= self._file_size and
+           len(self._node_cell_offsets) <= maximum_cell_number):
+      if file_offset == next_node_bin_offset:
+        read_offsets = (file_offset, file_offset + 4)
+      else:
+        read_offsets = (file_offset, )
+
+      values = []
+      for read_offset in read_offsets:
+        buffer_data_offset = read_offset - buffer_offset
+        if buffer_data_offset < 0 or buffer_data_offset + 4 > len(buffer_data):
+          read_size = min(
+              self._NODE_CELL_SCAN_BUFFER_SIZE, self._file_size - read_offset)
+          buffer_data = self._ReadData(
+              file_object, read_offset, read_size, 'node cells')
+          buffer_offset = read_offset
+          buffer_data_offset = 0
+
+        if buffer_data_offset + 4 > len(buffer_data):
+          break
+
+        values.extend(self._UINT32LE.unpack_from(
+            buffer_data, buffer_data_offset))
+
+      if len(values) != len(read_offsets):
+        break
+
+      if len(values) == 2:
+        node_bin_size, node_cell_size = values
+        file_offset += 4
+        next_node_bin_offset += node_bin_size
+      else:
+        node_cell_size = values[0]
+
+      node_cell_size &= 0x7ffffff
+      if node_cell_size == 0:
+        break
+
+      self._node_cell_offsets.append(file_offset)
+      file_offset += node_cell_size
+
+    self._node_cell_scan_offset = file_offset
+    self._next_node_bin_offset = next_node_bin_offset
+
   def _ReadUnknownNode5(self, block_data, file_offset):
     """Reads an unknown node 5.
 
@@ -1836,17 +2167,15 @@ class RepositoryFile(data_format.BinaryDataFile):
     Returns:
       ClassDefinition: class definition.
     """
-    node_cell = self._ReadNodeCell(file_object, branch_node_offset - 4)
-    branch_node = self._ReadClassDefinitionBranchNode(
-        node_cell.data, branch_node_offset)
+    branch_node = self._ReadNodeAtOffset(
+        file_object, branch_node_offset, self._ReadClassDefinitionBranchNode)
 
     leaf_node_offset = branch_node.class_definition_leaf_node_offset
     if leaf_node_offset <= 40:
       return None
 
-    node_cell = self._ReadNodeCell(file_object, leaf_node_offset - 4)
-    leaf_node = self._ReadClassDefinitionLeafNode(
-        node_cell.data, leaf_node_offset)
+    leaf_node = self._ReadNodeAtOffset(
+        file_object, leaf_node_offset, self._ReadClassDefinitionLeafNode)
 
     class_definition = ClassDefinition(
         debug=self._debug, output_writer=self._output_writer)
@@ -1879,21 +2208,18 @@ class RepositoryFile(data_format.BinaryDataFile):
     Yields:
       Instance: instance.
     """
-    node_cell = self._ReadNodeCell(file_object, root_node_offset - 4)
-    root_node = self._ReadClassDefinitionRootNode(
-        node_cell.data, root_node_offset)
+    root_node = self._ReadNodeAtOffset(
+        file_object, root_node_offset, self._ReadClassDefinitionRootNode)
 
     branch_node_offset = root_node.class_definition_branch_node_offset
     if branch_node_offset > 40:
-      node_cell = self._ReadNodeCell(file_object, branch_node_offset - 4)
-      branch_node = self._ReadClassDefinitionBranchNode(
-          node_cell.data, branch_node_offset)
+      branch_node = self._ReadNodeAtOffset(
+          file_object, branch_node_offset, self._ReadClassDefinitionBranchNode)
 
       leaf_node_offset = branch_node.class_definition_leaf_node_offset
       if leaf_node_offset > 40:
-        node_cell = self._ReadNodeCell(file_object, leaf_node_offset - 4)
-        leaf_node = self._ReadClassDefinitionLeafNode(
-            node_cell.data, leaf_node_offset)
+        leaf_node = self._ReadNodeAtOffset(
+            file_object, leaf_node_offset, self._ReadClassDefinitionLeafNode)
 
         class_definition = ClassDefinition(
             debug=self._debug, output_writer=self._output_writer)
@@ -1924,8 +2250,8 @@ class RepositoryFile(data_format.BinaryDataFile):
         for value_node_offset in self._ReadChildObjectsTree(
             file_object, root_node.child_objects_root_node_offset):
           if value_node_offset > 40:
-            node_cell = self._ReadNodeCell(file_object, value_node_offset - 4)
-            self._ReadNameNode(node_cell.data, value_node_offset)
+            self._ReadNodeAtOffset(
+                file_object, value_node_offset, self._ReadNameNode)
 
   def _ReadInstance(self, file_object, branch_node_offset):
     """Reads an instance.
@@ -1938,9 +2264,8 @@ class RepositoryFile(data_format.BinaryDataFile):
     Returns:
       Instance: instance.
     """
-    node_cell = self._ReadNodeCell(file_object, branch_node_offset - 4)
-    instance_branch_node = self._ReadInstanceBranchNode(
-        node_cell.data, branch_node_offset)
+    instance_branch_node = self._ReadNodeAtOffset(
+        file_object, branch_node_offset, self._ReadInstanceBranchNode)
 
     if instance_branch_node.class_definition_root_node_offset <= 40:
       return None
@@ -1951,10 +2276,9 @@ class RepositoryFile(data_format.BinaryDataFile):
     if instance_branch_node.unknown1 != 2:
       return None
 
-    node_cell = self._ReadNodeCell(
-        file_object, instance_branch_node.class_definition_root_node_offset - 4)
-    root_node = self._ReadClassDefinitionRootNode(
-        node_cell.data, instance_branch_node.class_definition_root_node_offset)
+    root_node = self._ReadNodeAtOffset(
+        file_object, instance_branch_node.class_definition_root_node_offset,
+        self._ReadClassDefinitionRootNode)
 
     if root_node.class_definition_branch_node_offset <= 40:
       return None
@@ -1962,10 +2286,9 @@ class RepositoryFile(data_format.BinaryDataFile):
     class_definition = self._ReadClassDefinition(
         file_object, root_node.class_definition_branch_node_offset)
 
-    node_cell = self._ReadNodeCell(
-        file_object, instance_branch_node.instance_leaf_node_offset - 4)
-    leaf_node = self._ReadInstanceLeafNode(
-        node_cell.data, instance_branch_node.instance_leaf_node_offset)
+    leaf_node = self._ReadNodeAtOffset(
+        file_object, instance_branch_node.instance_leaf_node_offset,
+        self._ReadInstanceLeafNode)
 
     # TODO: read class definition hierarcy
     class_definitions = [class_definition]
@@ -2003,14 +2326,13 @@ class RepositoryFile(data_format.BinaryDataFile):
     Yields:
       Instance: instance.
     """
-    node_cell = self._ReadNodeCell(file_object, root_node_offset - 4)
-    root_node = self._ReadInstanceRootNode(node_cell.data, root_node_offset)
+    root_node = self._ReadNodeAtOffset(
+        file_object, root_node_offset, self._ReadInstanceRootNode)
 
     if self._debug:
       if root_node.name_node_offset > 40:
-        node_cell = self._ReadNodeCell(
-            file_object, root_node.name_node_offset - 4)
-        self._ReadNameNode(node_cell.data, root_node.name_node_offset)
+        self._ReadNodeAtOffset(
+            file_object, root_node.name_node_offset, self._ReadNameNode)
 
     if root_node.instance_branch_node_offset > 40:
       instance = self._ReadInstance(
@@ -2020,10 +2342,8 @@ class RepositoryFile(data_format.BinaryDataFile):
 
     if self._debug:
       if root_node.unknown_node5_offset > 40 and root_node.unknown2 == 0:
-        node_cell = self._ReadNodeCell(
-            file_object, root_node.unknown_node5_offset - 4)
-        unknown_node5 = self._ReadUnknownNode5(
-            node_cell.data, root_node.unknown_node5_offset)
+        unknown_node5 = self._ReadNodeAtOffset(
+            file_object, root_node.unknown_node5_offset, self._ReadUnknownNode5)
 
         # TODO: clean up after debugging
         _ = unknown_node5
@@ -2033,16 +2353,14 @@ class RepositoryFile(data_format.BinaryDataFile):
       for value_node_offset in self._ReadChildObjectsTree(
           file_object, root_node.child_objects_root_node_offset):
         if value_node_offset > 40:
-          node_cell = self._ReadNodeCell(file_object, value_node_offset - 4)
-          instance_leaf_value_node = self._ReadInstanceLeafValueNode(
-              node_cell.data, value_node_offset)
+          instance_leaf_value_node = self._ReadNodeAtOffset(
+              file_object, value_node_offset, self._ReadInstanceLeafValueNode)
 
           if self._debug:
             if instance_leaf_value_node.name_node_offset > 40:
-              node_cell = self._ReadNodeCell(
-                  file_object, instance_leaf_value_node.name_node_offset - 4)
-              self._ReadNameNode(
-                  node_cell.data, instance_leaf_value_node.name_node_offset)
+              self._ReadNodeAtOffset(
+                  file_object, instance_leaf_value_node.name_node_offset,
+                  self._ReadNameNode)
 
           if instance_leaf_value_node.instance_root_node_offset > 40:
             for instance in self._ReadInstanceHierarchy(
@@ -2055,9 +2373,9 @@ class RepositoryFile(data_format.BinaryDataFile):
         for value_node_offset in self._ReadChildObjectsList(
             file_object, root_node.child_objects_list_node_offset):
           if value_node_offset > 40:
-            node_cell = self._ReadNodeCell(file_object, root_node_offset - 4)
-            root_node = self._ReadClassDefinitionRootNode(
-                node_cell.data, root_node_offset)
+            root_node = self._ReadNodeAtOffset(
+                file_object, root_node_offset,
+                self._ReadClassDefinitionRootNode)
 
             if root_node.class_definition_branch_node_offset > 40:
               self._ReadClassDefinition(
@@ -2076,8 +2394,8 @@ class RepositoryFile(data_format.BinaryDataFile):
     Yields:
       Instance: instance.
     """
-    node_cell = self._ReadNodeCell(file_object, root_node_offset - 4)
-    root_node = self._ReadInstanceRootNode(node_cell.data, root_node_offset)
+    root_node = self._ReadNodeAtOffset(
+        file_object, root_node_offset, self._ReadInstanceRootNode)
 
     if root_node.instance_branch_node_offset > 40:
       instance = self._ReadInstance(
@@ -2096,9 +2414,8 @@ class RepositoryFile(data_format.BinaryDataFile):
         for value_node_offset in self._ReadChildObjectsTree(
             file_object, root_node.child_objects_root_node_offset):
           if value_node_offset > 40:
-            node_cell = self._ReadNodeCell(file_object, value_node_offset - 4)
-            instance_leaf_value_node = self._ReadInstanceLeafValueNode(
-                node_cell.data, value_node_offset)
+            instance_leaf_value_node = self._ReadNodeAtOffset(
+                file_object, value_node_offset, self._ReadInstanceLeafValueNode)
 
             if instance_leaf_value_node.instance_root_node_offset > 40:
               for instance in self._ReadNamespaceInstanceHierarchy(
@@ -2154,39 +2471,53 @@ class RepositoryFile(data_format.BinaryDataFile):
 
     file_object.seek(0, os.SEEK_SET)
 
-    file_header = self._ReadFileHeader(file_object)
+    self._file_size = file_size
 
-    file_offset = 40
-    cell_number = 0
+    file_header = self._ReadFileHeader(file_object)
 
-    next_node_bin_offset = file_header.node_bin_size
+    self._next_node_bin_offset = file_header.node_bin_size
+    self._node_cell_offsets = array.array('Q')
+    self._node_cell_scan_offset = 40
+    self._node_cells = collections.OrderedDict()
 
     self._root_namespace_node_offset = None
     self._system_class_definition_root_node_offset = None
 
-    while file_offset < file_size:
-      if file_offset == next_node_bin_offset:
-        node_bin_header = self._ReadNodeBinHeader(file_object, file_offset)
-        file_offset += 4
+    if self._debug:
+      file_offset = 40
+      cell_number = 0
 
-        next_node_bin_offset += node_bin_header.node_bin_size
+      next_node_bin_offset = file_header.node_bin_size
 
-      node_cell = self._ReadNodeCell(
-          file_object, file_offset, cell_number=cell_number)
-      if node_cell.size == 0:
-        break
+      while file_offset < file_size:
+        if file_offset == next_node_bin_offset:
+          node_bin_header = self._ReadNodeBinHeader(file_object, file_offset)
+          file_offset += 4
 
-      if file_header.root_namespace_cell_number == cell_number:
-        self._root_namespace_node_offset = file_offset + 4
-      elif file_header.system_class_cell_number == cell_number:
-        self._system_class_definition_root_node_offset = file_offset + 4
+          next_node_bin_offset += node_bin_header.node_bin_size
 
-      file_offset += node_cell.size & 0x7ffffff
-      cell_number += 1
+        node_cell = self._ReadNodeCell(
+            file_object, file_offset, cell_number=cell_number)
+        if node_cell.size & 0x7ffffff == 0:
+          break
 
-      if (not self._debug and self._root_namespace_node_offset is not None and
-          self._system_class_definition_root_node_offset is not None):
-        break
+        self._node_cell_offsets.append(file_offset)
+
+        file_offset += node_cell.size & 0x7ffffff
+        cell_number += 1
+
+      self._next_node_bin_offset = next_node_bin_offset
+      self._node_cell_scan_offset = file_offset
+
+    file_offset = self._GetNodeCellOffset(
+        file_object, file_header.root_namespace_cell_number)
+    if file_offset is not None:
+      self._root_namespace_node_offset = file_offset + 4
+
+    file_offset = self._GetNodeCellOffset(
+        file_object, file_header.system_class_cell_number)
+    if file_offset is not None:
+      self._system_class_definition_root_node_offset = file_offset + 4
 
 
 class CIMObject(data_format.BinaryDataFormat):
@@ -2922,9 +3253,11 @@ class Instance(CIMObject):
       ('data_size', 'Data size', '_FormatIntegerAsDecimal'),
       ('data', 'Data', '_FormatDataInHexadecimal')]
 
-  _FIXED_SIZE_VALUE_DATA_TYPES = frozenset([
-      0x00000002, 0x00000003, 0x00000004, 0x00000005, 0x0000000b, 0x00000010,
-      0x00000011, 0x00000012, 0x00000013, 0x00000014, 0x00000015])
+  # The fixed-size value data types are shared with the class value data map.
+  # pylint: disable=protected-access
+  _FIXED_SIZE_VALUE_DATA_TYPES = (
+      ClassValueDataMap._FIXED_SIZE_VALUE_DATA_TYPES)
+  # pylint: enable=protected-access
 
   _STRING_VALUE_DATA_TYPES = frozenset([0x00000008, 0x00000065, 0x00000066])
 
@@ -2959,6 +3292,101 @@ class Instance(CIMObject):
 
     self._DebugPrintText('\n')
 
+  def _ReadCIMStringArray(
+      self, property_name, string_array_offset, values_data, data_offset):
+    """Reads a CIM string array property value.
+
+    Args:
+      property_name (str): name of the property.
+      string_array_offset (int): string array offset.
+      values_data (bytes): values data.
+      data_offset (int): offset of the values data relative to the start of
+          the record data.
+
+    Returns:
+      list[str]: strings.
+
+    Raises:
+      ParseError: if the string array cannot be read.
+    """
+    description = f'Property: {property_name:s} value: string array'
+
+    data_type_map = self._GetDataTypeMap('cim_string_array')
+
+    string_array = self._ReadStructureFromByteStream(
+         values_data[string_array_offset:], data_offset + string_array_offset,
+         data_type_map, description)
+
+    strings = []
+    for string_index, string_offset in enumerate(string_array.string_offsets):
+      description = (
+          f'property: {property_name:s} value entry: {string_index:d}')
+      string_value = self._ReadCIMString(
+          string_offset, values_data, data_offset, description)
+
+      strings.append(string_value)
+
+    return strings
+
+  def _ReadPropertyValuesWithStruct(
+      self, class_value_data_map, property_values_data,
+      property_values_data_offset, values_data, data_offset):
+    """Reads the property values using the compiled property values structure.
+
+    Args:
+      class_value_data_map (ClassValueDataMap): the class value data map.
+      property_values_data (bytes): property values data.
+      property_values_data_offset (int): offset of the property values data
+          relative to the start of the record data.
+      values_data (bytes): values data.
+      data_offset (int): offset of the values data relative to the start of
+          the record data.
+
+    Raises:
+      ParseError: if the property values cannot be read.
+    """
+    try:
+      struct_values = class_value_data_map.property_values_struct.unpack_from(
+          property_values_data)
+    except struct.error as exception:
+      raise errors.ParseError((
+          f'Unable to map property values data at offset: '
+          f'{property_values_data_offset:d} '
+          f'(0x{property_values_data_offset:08x}) with error: '
+          f'{exception!s}'))
+
+    property_values = {}
+    for property_value_data_map, struct_value in zip(
+        class_value_data_map.property_values_maps, struct_values):
+      property_value = None
+      if property_value_data_map.data_type in self._FIXED_SIZE_VALUE_DATA_TYPES:
+        property_value = struct_value
+        if property_value_data_map.type_qualifier == 'boolean':
+          if struct_value not in (0, 0xffff):
+            raise errors.ParseError((
+                f'Unsupported property: {property_value_data_map.name:s} '
+                f'boolean value: 0x{struct_value:04x}'))
+
+          property_value = struct_value == 0xffff
+
+      # A string (array) offset of 0 appears to indicate not set.
+      elif struct_value > 0:
+        if property_value_data_map.data_type in self._STRING_VALUE_DATA_TYPES:
+          description = f'property: {property_value_data_map.name:s} value'
+          property_value = self._ReadCIMString(
+              struct_value, values_data, data_offset, description)
+
+        elif property_value_data_map.data_type == 0x00002008:
+          property_value = self._ReadCIMStringArray(
+              property_value_data_map.name, struct_value, values_data,
+              data_offset)
+
+      property_values[property_value_data_map.name] = property_value
+
+    for property_value_data_map in class_value_data_map.properties.values():
+      self.properties[property_value_data_map.name] = property_values[
+          property_value_data_map.name]
+
   def ReadInstanceBlockData(
       self, class_value_data_map, instance_data, record_data_offset=0):
     """Reads the instance block data.
@@ -2974,11 +3402,7 @@ class Instance(CIMObject):
     """
     data_type_map = self._GetDataTypeMap('instance_block')
 
-    # 2 state bits per property, stored byte aligned.
-    number_of_properties = len(class_value_data_map.properties)
-    property_state_bits_size, remainder = divmod(number_of_properties, 4)
-    if remainder > 0:
-      property_state_bits_size += 1
+    property_state_bits_size = class_value_data_map.property_state_bits_size
 
     if self._debug:
       value_string = self._FormatIntegerAsDecimal(property_state_bits_size)
@@ -3059,6 +3483,13 @@ class Instance(CIMObject):
     property_values_data = instance_block.property_values_data
     property_values_data_offset = 5 + len(instance_block.property_state_bits)
 
+    if class_value_data_map.property_values_struct and not self._debug:
+      self._ReadPropertyValuesWithStruct(
+          class_value_data_map, property_values_data,
+          record_data_offset + property_values_data_offset, values_data,
+          data_offset)
+      return
+
     for property_value_data_map in class_value_data_map.properties.values():
       property_map_offset = property_value_data_map.offset
 
@@ -3120,26 +3551,9 @@ class Instance(CIMObject):
 
         # A string array offset of 0 appears to indicate not set.
         if string_array_offset > 0:
-          description = (
-               f'Property: {property_value_data_map.name:s} value: string '
-               f'array')
-
-          data_type_map = self._GetDataTypeMap('cim_string_array')
-
-          string_array = self._ReadStructureFromByteStream(
-               values_data[string_array_offset:],
-               data_offset + string_array_offset, data_type_map, description)
-
-          property_value = []
-          for string_index, string_offset in enumerate(
-              string_array.string_offsets):
-            description = (
-                f'property: {property_value_data_map.name:s} value entry: '
-                f'{string_index:d}')
-            string_value = self._ReadCIMString(
-                string_offset, values_data, data_offset, description)
-
-            property_value.append(string_value)
+          property_value = self._ReadCIMStringArray(
+              property_value_data_map.name, string_array_offset, values_data,
+              data_offset)
 
       else:
         description = (
@@ -3234,6 +3648,18 @@ class CIMRepository(data_format.BinaryDataFormat):
   _KEY_VALUE_RECORD_IDENTIFIER_INDEX = 2
   _KEY_VALUE_DATA_SIZE_INDEX = 3
 
+  _INSTANCES_BATCH_SIZE = 256
+
+  _MAXIMUM_NUMBER_OF_CACHED_HASHES = 65536
+
+  _COMMON_CLASS_NAMES = [
+      '__EventConsumer',
+      '__EventFilter',
+      '__FilterToConsumerBinding',
+      '__NAMESPACE',
+      '__SystemClass',
+      '__Win32Provider']
+
   _COMMON_NAMESPACES = [
       '__SystemClass',
       'ROOT',
@@ -3327,10 +3753,14 @@ class CIMRepository(data_format.BinaryDataFormat):
     self._index_mapping_table = None
     self._index_root_page = None
     self._namespace_instances = []
+    self._namespaces_per_hash = None
+    self._namespaces_queue = None
     self._objects_data_file = None
     self._objects_mapping_table = None
     self._output_writer = output_writer
+    self._path = None
     self._repository_file = None
+    self._string_hashes = collections.OrderedDict()
 
     self.format_version = None
 
@@ -3392,8 +3822,9 @@ class CIMRepository(data_format.BinaryDataFormat):
         self._DebugPrintText(
             f'Mapping.ver file number: {mapping_ver_file_number:d}\n')
 
-    active_mapping_file = None
     active_mapping_file_number = None
+    active_mapping_file_path = None
+    active_sequence_number = None
 
     # Unsure how reliable this method is since multiple index[1-3].map files
     # can have the same sequence number but contain different mappings.
@@ -3405,20 +3836,23 @@ class CIMRepository(data_format.BinaryDataFormat):
         continue
 
       if self._debug:
-        self._DebugPrintText(f'Reading: {mapping_file_glob[0]:s}\n')
+        self._DebugPrintText(f'Probing: {mapping_file_glob[0]:s}\n')
 
+      # Only the file header and footer are read to determine the sequence
+      # number, the mapping tables are read from the active mapping file only.
       mapping_file = MappingFile(
           debug=self._debug, output_writer=self._output_writer)
-      # TODO: change to only read limited information.
-      mapping_file.Open(mapping_file_glob[0])
+      with open(mapping_file_glob[0], 'rb') as file_object:
+        mapping_file.ReadFileHeaderAndFooter(file_object)
 
-      if not active_mapping_file:
-        active_mapping_file = mapping_file
-        active_mapping_file_number = mapping_file_number
-      elif mapping_file.sequence_number > active_mapping_file.sequence_number:
-        active_mapping_file.Close()
-        active_mapping_file = mapping_file
+      if (active_sequence_number is None or
+          mapping_file.sequence_number > active_sequence_number):
         active_mapping_file_number = mapping_file_number
+        active_mapping_file_path = mapping_file_glob[0]
+        active_sequence_number = mapping_file.sequence_number
+
+    if not active_mapping_file_path:
+      return None
 
     if (mapping_ver_file_number is not None and
         mapping_ver_file_number != active_mapping_file_number):
@@ -3427,6 +3861,11 @@ class CIMRepository(data_format.BinaryDataFormat):
     if self._debug:
       self._DebugPrintText(
           f'Active mapping file: mapping{active_mapping_file_number:d}.map\n')
+      self._DebugPrintText(f'Reading: {active_mapping_file_path:s}\n')
+
+    active_mapping_file = MappingFile(
+        debug=self._debug, output_writer=self._output_writer)
+    active_mapping_file.Open(active_mapping_file_path)
 
     return active_mapping_file
 
@@ -3506,22 +3945,89 @@ class CIMRepository(data_format.BinaryDataFormat):
 
     return class_value_data_map
 
+  def _GetFirstKeyFromIndex(self, first_key):
+    """Retrieves the first key in the index that is equal or larger than a key.
+
+    Only the index pages on the path from the root page to the key are read.
+
+    Args:
+      first_key (str): first key, inclusive.
+
+    Returns:
+      str: a CIM key or None if not available.
+    """
+    result_key = None
+
+    index_page = self._GetIndexRootPage()
+    while index_page:
+      number_of_keys = len(index_page.keys)
+
+      if index_page.sub_pages and len(index_page.sub_pages) != (
+          number_of_keys + 1):
+        index_keys = [
+            key for key in self._GetKeysFromIndexPage(index_page)
+            if key >= first_key]
+        if index_keys:
+          result_key = min(index_keys)
+        break
+
+      key_index = number_of_keys
+      for index, key in enumerate(index_page.keys):
+        if key >= first_key:
+          key_index = index
+          result_key = key
+          break
+
+      if not index_page.sub_pages:
+        break
+
+      index_page = self._GetIndexPageByMappedPageNumber(
+          index_page.sub_pages[key_index])
+
+    return result_key
+
   def _GetHashFromString(self, string):
     """Retrieves the hash of a string.
 
+    The hashes are cached by format version and string, with the least recently
+    used hashes evicted from the cache once it is full.
+
     Args:
       string (str): string to hash.
 
     Returns:
       str: hash of the string.
     """
-    string_data = string.upper().encode('utf-16-le')
-    if self.format_version in ('2.0', '2.1'):
-      string_hash = hashlib.md5(string_data)
+    lookup_key = (self.format_version, string)
+
+    string_hash = self._string_hashes.get(lookup_key, None)
+    if string_hash:
+      self._string_hashes.move_to_end(lookup_key)
+
     else:
-      string_hash = hashlib.sha256(string_data)
+      string_data = string.upper().encode('utf-16-le')
+      if self.format_version in ('2.0', '2.1'):
+        string_hash = hashlib.md5(string_data).hexdigest()
+      else:
+        string_hash = hashlib.sha256(string_data).hexdigest()
 
-    return string_hash.hexdigest()
+      if len(self._string_hashes) >= self._MAXIMUM_NUMBER_OF_CACHED_HASHES:
+        self._string_hashes.popitem(last=False)
+
+      self._string_hashes[lookup_key] = string_hash
+
+    return string_hash
+
+  def _GetHashesFromStrings(self, strings):
+    """Retrieves the hashes of strings.
+
+    Args:
+      strings (iterable[str]): strings to hash.
+
+    Returns:
+      dict[str, str]: hashes of the strings per string.
+    """
+    return {string: self._GetHashFromString(string) for string in strings}
 
   def _GetIndexPageByMappedPageNumber(self, mapped_page_number):
     """Retrieves a specific index page by mapped page number.
@@ -3543,6 +4049,36 @@ class CIMRepository(data_format.BinaryDataFormat):
 
     return index_page
 
+  def _GetIndexPagesByMappedPageNumbers(self, mapped_page_numbers):
+    """Retrieves specific index pages by mapped page numbers.
+
+    The index pages are read in order of their physical page number.
+
+    Args:
+      mapped_page_numbers (list[int]): mapped page numbers.
+
+    Returns:
+      list[IndexBinaryTreePage]: index binary-tree pages in order of the mapped
+          page numbers, where a page that could not be read is None.
+    """
+    page_numbers = [
+        self._index_mapping_table.ResolveMappedPageNumber(mapped_page_number)
+        for mapped_page_number in mapped_page_numbers]
+
+    index_pages = [None] * len(page_numbers)
+    for index in sorted(
+        range(len(page_numbers)), key=lambda index: page_numbers[index]):
+      page_number = page_numbers[index]
+
+      index_page = self._index_binary_tree_file.GetPage(page_number)
+      if not index_page:
+        logging.warning(
+            f'Unable to read index binary-tree page: {page_number:d}.')
+
+      index_pages[index] = index_page
+
+    return index_pages
+
   def _GetIndexFirstMappedPage(self):
     """Retrieves the index first mapped page.
 
@@ -3593,21 +4129,293 @@ class CIMRepository(data_format.BinaryDataFormat):
 
     return self._index_root_page
 
+  def _GetInstancesWithWorkers(self, number_of_workers, ordered=True):
+    """Retrieves instances using worker processes.
+
+    The instance object record values are read from the index and partitioned
+    in batches, which are read and decoded by worker processes that each open
+    the CIM repository.
+
+    Args:
+      number_of_workers (int): number of worker processes.
+      ordered (Optional[bool]): True if the instances should be returned in
+          index key order.
+
+    Yields:
+      Instance: an instance.
+    """
+    object_record_values = [
+        values for _, values in self._ReadInstanceObjectRecordValues()]
+
+    batches = [
+        object_record_values[index:index + self._INSTANCES_BATCH_SIZE]
+        for index in range(
+            0, len(object_record_values), self._INSTANCES_BATCH_SIZE)]
+
+    with multiprocessing.Pool(
+        processes=number_of_workers,
+        initializer=CIMRepositoryInstancesWorker.Initialize,
+        initargs=(self._path, )) as pool:
+      if ordered:
+        results = pool.imap(CIMRepositoryInstancesWorker.ReadInstances, batches)
+      else:
+        results = pool.imap_unordered(
+            CIMRepositoryInstancesWorker.ReadInstances, batches)
+
+      for instances_values in results:
+        for instance_values in instances_values:
+          instance = Instance(
+              debug=self._debug, output_writer=self._output_writer)
+
+          # pylint: disable=attribute-defined-outside-init
+          (instance.class_name, instance.derivation, instance.dynasty,
+           instance.super_class_name, instance.properties) = instance_values
+
+          yield instance
+
+      # Let the worker processes exit normally so that they close their CIM
+      # repository.
+      pool.close()
+      pool.join()
+
   def _GetKeysFromIndexPage(self, index_page):
     """Retrieves the keys from an index page.
 
+    The index pages are traversed depth-first using an explicit stack. The sub
+    pages of an index page are read before they are traversed.
+
+    Args:
+      index_page (IndexBinaryTreePage): index binary-tree page.
+
     Yields:
       str: a CIM key.
     """
-    if index_page:
+    index_pages_stack = [index_page]
+    while index_pages_stack:
+      index_page = index_pages_stack.pop()
+      if not index_page:
+        continue
+
       for key in index_page.keys:
         yield key
 
-      for mapped_page_number in index_page.sub_pages:
-        sub_index_page = self._GetIndexPageByMappedPageNumber(
-            mapped_page_number)
-        for key in self._GetKeysFromIndexPage(sub_index_page):
-          yield key
+      if index_page.sub_pages:
+        sub_index_pages = self._GetIndexPagesByMappedPageNumbers(
+            index_page.sub_pages)
+        index_pages_stack.extend(reversed(sub_index_pages))
+
+  def _GetKeysFromIndexByRange(self, first_key, last_key=None):
+    """Retrieves the keys in a specific range from the index.
+
+    The index binary-tree is traversed in key order and only the index pages
+    that can contain keys in the range are read.
+
+    Args:
+      first_key (str): first key in the range, inclusive.
+      last_key (Optional[str]): last key in the range, exclusive, or None to
+          include all keys after the first key.
+
+    Yields:
+      str: a CIM key.
+    """
+    index_page = self._GetIndexRootPage()
+
+    index_items_stack = [index_page]
+    while index_items_stack:
+      index_item = index_items_stack.pop()
+      if not index_item:
+        continue
+
+      if isinstance(index_item, str):
+        yield index_item
+        continue
+
+      index_page = index_item
+      number_of_keys = len(index_page.keys)
+
+      if index_page.sub_pages and len(index_page.sub_pages) != (
+          number_of_keys + 1):
+        # The sub pages cannot be matched with the keys, hence the keys of all
+        # sub pages are filtered.
+        index_keys = sorted(
+            key for key in self._GetKeysFromIndexPage(index_page)
+            if key >= first_key and (last_key is None or key < last_key))
+        index_items_stack.extend(reversed(index_keys))
+        continue
+
+      # The keys in a sub page are smaller than the key with the same index.
+      index_items = []
+      for key_index, key in enumerate(index_page.keys):
+        if key < first_key:
+          continue
+
+        if index_page.sub_pages:
+          index_items.append(key_index)
+
+        if last_key is not None and key >= last_key:
+          break
+
+        index_items.append(key)
+
+      else:
+        if index_page.sub_pages:
+          index_items.append(number_of_keys)
+
+      sub_page_indexes = [
+          index_item for index_item in index_items
+          if not isinstance(index_item, str)]
+
+      sub_index_pages = self._GetIndexPagesByMappedPageNumbers([
+          index_page.sub_pages[sub_page_index]
+          for sub_page_index in sub_page_indexes])
+      sub_index_pages = dict(zip(sub_page_indexes, sub_index_pages))
+
+      index_items_stack.extend(reversed([
+          index_item if isinstance(index_item, str) else
+          sub_index_pages[index_item] for index_item in index_items]))
+
+  def _GetKeysFromIndexByPrefix(self, key_prefix):
+    """Retrieves the keys with a specific prefix from the index.
+
+    Args:
+      key_prefix (str): key prefix.
+
+    Yields:
+      str: a CIM key.
+    """
+    last_key = ''.join([key_prefix[:-1], chr(ord(key_prefix[-1]) + 1)])
+
+    for key in self._GetKeysFromIndexByRange(key_prefix, last_key=last_key):
+      yield key
+
+  def _GetInstanceObjectRecordValuesByClass(
+      self, namespace_hash, class_name_hash):
+    """Retrieves the instance object record values of a class from the index.
+
+    Args:
+      namespace_hash (str): hash of the namespace.
+      class_name_hash (str): hash of the class name.
+
+    Yields:
+      tuple[str, int, int, int]: data type, mapped page number, record
+          identifier and record data size of an instance object record.
+    """
+    key_prefix = ''.join([
+        self._KEY_SEGMENT_SEPARATOR, 'NS_', namespace_hash.upper(),
+        self._KEY_SEGMENT_SEPARATOR, 'CI_', class_name_hash.upper(),
+        self._KEY_SEGMENT_SEPARATOR])
+
+    for key in self._GetKeysFromIndexByPrefix(key_prefix):
+      key_segments = key.split(self._KEY_SEGMENT_SEPARATOR)
+
+      data_type, _, mapped_page_number, record_identifier, data_size = (
+          self._GetObjectRecordValuesFromKey(key_segments[-1]))
+
+      if data_type in ('I', 'IL'):
+        yield data_type, mapped_page_number, record_identifier, data_size
+
+  def _GetNamespaceHashesFromIndex(self):
+    """Retrieves the namespace hashes from the index.
+
+    The index is searched for the first key of every namespace, hence the keys
+    within a namespace are not read.
+
+    Yields:
+      str: hash of a namespace.
+    """
+    key_prefix = ''.join([self._KEY_SEGMENT_SEPARATOR, 'NS_'])
+
+    key = self._GetFirstKeyFromIndex(key_prefix)
+    while key and key.startswith(key_prefix):
+      key_segments = key.split(self._KEY_SEGMENT_SEPARATOR)
+
+      namespace_hash = key_segments[1][3:]
+      yield namespace_hash.lower()
+
+      # Continue with the first key after all the keys of the namespace.
+      first_key = ''.join([
+          self._KEY_SEGMENT_SEPARATOR, key_segments[1],
+          chr(ord(self._KEY_SEGMENT_SEPARATOR) + 1)])
+
+      key = self._GetFirstKeyFromIndex(first_key)
+
+  def _GetNamespacesByHash(self, namespace_hashes):
+    """Retrieves namespaces by hash.
+
+    The namespace hierarchy is traversed breadth-first starting with the ROOT
+    namespace, where the __NAMESPACE instances of a parent namespace are read
+    using an index key prefix lookup, until all the requested namespaces are
+    resolved. The resolved namespaces and the parent namespaces that remain
+    to be traversed are cached, such that a subsequent call continues the
+    traversal and a namespace hierarchy is never traversed twice. Namespaces
+    that are not reachable from ROOT are resolved from the common namespaces.
+
+    Args:
+      namespace_hashes (list[str]): hashes of the namespaces.
+
+    Returns:
+      dict[str, str]: namespaces per hash of the namespace, of the requested
+          namespaces that could be resolved.
+    """
+    common_namespace_hashes = self._GetHashesFromStrings(
+        self._COMMON_NAMESPACES)
+
+    if self._namespaces_per_hash is None:
+      root_namespace_hash = common_namespace_hashes['ROOT']
+
+      self._namespaces_per_hash = {root_namespace_hash: 'ROOT'}
+      self._namespaces_queue = collections.deque([
+          (root_namespace_hash, 'ROOT')])
+
+    unresolved_namespace_hashes = set(
+        namespace_hash for namespace_hash in namespace_hashes
+        if namespace_hash not in self._namespaces_per_hash)
+
+    class_name_hash = self._GetHashFromString('__NAMESPACE')
+
+    while unresolved_namespace_hashes and self._namespaces_queue:
+      parent_namespace_hash, parent_namespace = (
+          self._namespaces_queue.popleft())
+
+      object_record_values = set()
+      for values in self._GetInstanceObjectRecordValuesByClass(
+          parent_namespace_hash, class_name_hash):
+        _, mapped_page_number, record_identifier, _ = values
+        if (mapped_page_number, record_identifier) in object_record_values:
+          continue
+
+        object_record_values.add((mapped_page_number, record_identifier))
+
+        instance = self._ReadInstanceFromObjectRecordValues(values)
+
+        name_property = instance.properties.get('Name', None)
+        if not name_property:
+          continue
+
+        namespace = '\\'.join([parent_namespace, name_property])
+        namespace_hash = self._GetHashFromString(namespace)
+        if namespace_hash in self._namespaces_per_hash:
+          continue
+
+        self._namespaces_per_hash[namespace_hash] = namespace
+        self._namespaces_queue.append((namespace_hash, namespace))
+
+        unresolved_namespace_hashes.discard(namespace_hash)
+
+    common_namespaces_per_hash = {
+        namespace_hash: namespace
+        for namespace, namespace_hash in common_namespace_hashes.items()}
+
+    namespaces_per_hash = {}
+    for namespace_hash in namespace_hashes:
+      namespace = self._namespaces_per_hash.get(namespace_hash, None)
+      if not namespace:
+        namespace = common_namespaces_per_hash.get(namespace_hash, None)
+
+      if namespace:
+        namespaces_per_hash[namespace_hash] = namespace
+
+    return namespaces_per_hash
 
   def _GetObjectsPageByMappedPageNumber(self, mapped_page_number, is_data_page):
     """Retrieves a specific objects page by mapped page number.
@@ -3649,39 +4457,22 @@ class CIMRepository(data_format.BinaryDataFormat):
     if not self._objects_data_file:
       raise RuntimeError('Objects.data file was not opened.')
 
-    data_segments = []
-    is_data_page = False
-    data_segment_index = 0
-    while data_size > 0:
-      object_page = self._GetObjectsPageByMappedPageNumber(
-          mapped_page_number, is_data_page)
-      if not object_page:
-        errors.ParseError((
-            f'Unable to read objects record: {record_identifier:d} data '
-            f'segment: {data_segment_index:d}.'))
-
-      if not is_data_page:
-        object_descriptor = object_page.GetObjectDescriptor(
-            record_identifier, data_size)
-
-        data_offset = object_descriptor.data_offset
-        is_data_page = True
-      else:
-        data_offset = 0
+    object_page = self._GetObjectsPageByMappedPageNumber(
+        mapped_page_number, False)
+    if not object_page:
+      raise errors.ParseError(
+          f'Unable to read objects record: {record_identifier:d} page.')
 
-      data_segment = self._objects_data_file.ReadObjectRecordDataSegment(
-          object_page, data_offset, data_size)
-      if not data_segment:
-        errors.ParseError((
-            f'Unable to read objects record: {record_identifier:d} data '
-            f'segment: {data_segment_index:d}.'))
+    object_descriptor = object_page.GetObjectDescriptor(
+        record_identifier, data_size)
+    if not object_descriptor:
+      raise errors.ParseError(
+          f'Unable to read objects record: {record_identifier:d} descriptor.')
 
-      data_segments.append(data_segment)
-      data_size -= len(data_segment)
-      data_segment_index += 1
-      mapped_page_number += 1
+    object_record_data = self._objects_data_file.ReadObjectRecordData(
+        self._objects_mapping_table, mapped_page_number,
+        object_descriptor.data_offset, data_size)
 
-    object_record_data = b''.join(data_segments)
     return ObjectRecord(data_type, object_record_data)
 
   def _GetObjectRecordValuesFromKey(self, key_segment):
@@ -3727,6 +4518,52 @@ class CIMRepository(data_format.BinaryDataFormat):
 
     return data_type, name_hash, page_number, record_identifier, data_size
 
+  def _GetSubClassNameHashes(self, namespace_hash, class_name_hash):
+    """Retrieves the hashes of the class names derived from a class.
+
+    Args:
+      namespace_hash (str): hash of the namespace.
+      class_name_hash (str): hash of the name of the super class.
+
+    Returns:
+      list[str]: hashes of the class names of the class and the classes that
+          are directly or indirectly derived from it.
+    """
+    class_name_hashes = [class_name_hash]
+
+    class_name_hashes_queue = collections.deque([class_name_hash])
+    while class_name_hashes_queue:
+      super_class_name_hash = class_name_hashes_queue.popleft()
+
+      key_prefix = ''.join([
+          self._KEY_SEGMENT_SEPARATOR, 'NS_', namespace_hash.upper(),
+          self._KEY_SEGMENT_SEPARATOR, 'CR_', super_class_name_hash.upper(),
+          self._KEY_SEGMENT_SEPARATOR, 'C_'])
+
+      for key in self._GetKeysFromIndexByPrefix(key_prefix):
+        key_segments = key.split(self._KEY_SEGMENT_SEPARATOR)
+
+        sub_class_name_hash = key_segments[-1][2:].lower()
+        if sub_class_name_hash not in class_name_hashes:
+          class_name_hashes.append(sub_class_name_hash)
+          class_name_hashes_queue.append(sub_class_name_hash)
+
+    return class_name_hashes
+
+  def _NormalizeKeyValue(self, key_value):
+    """Normalizes a key property value for case-insensitive lookups.
+
+    Args:
+      key_value (str): key property value, such as a name, or None.
+
+    Returns:
+      str: normalized key property value or None if not available.
+    """
+    if not isinstance(key_value, str):
+      return key_value
+
+    return key_value.lower()
+
   def _OpenIndexBinaryTreeFile(self, path):
     """Opens an index binary tree.
 
@@ -3846,6 +4683,42 @@ class CIMRepository(data_format.BinaryDataFormat):
 
     return repository_file
 
+  def _ParseObjectPath(self, object_path):
+    """Parses an object path.
+
+    Args:
+      object_path (str): object path, such as:
+          \\\\.\\ROOT\\subscription:__EventFilter.Name="MyFilter"
+
+    Returns:
+      tuple[str, str]: class name and value of the Name key of the object or
+          None if not available.
+    """
+    if not object_path:
+      return None, None
+
+    # Strip the server and namespace of the object path.
+    key_value_offset = object_path.find('"')
+    if key_value_offset < 0:
+      key_value_offset = len(object_path)
+
+    relative_path_offset = object_path.rfind(':', 0, key_value_offset) + 1
+
+    class_name, _, key_values = object_path[relative_path_offset:].partition(
+        '.')
+
+    # Singleton objects are represented as: Class=@
+    class_name, _, _ = class_name.partition('=')
+
+    key_name, _, key_value = key_values.partition('=')
+    if key_name != 'Name':
+      return class_name or None, None
+
+    if len(key_value) >= 2 and key_value[0] == '"' and key_value[-1] == '"':
+      key_value = key_value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+
+    return class_name or None, key_value
+
   def _ReadClassDefinitionObjectRecords(self):
     """Reads class definition object records.
 
@@ -3955,12 +4828,47 @@ class CIMRepository(data_format.BinaryDataFormat):
 
     return instance
 
+  def _ReadInstanceFromObjectRecordValues(self, object_record_values):
+    """Reads an instance from object record values.
+
+    Args:
+      object_record_values (tuple[str, int, int, int]): data type, mapped page
+          number, record identifier and record data size of an instance object
+          record.
+
+    Returns:
+      Instance: instance.
+    """
+    object_record = self._GetObjectRecord(*object_record_values)
+
+    instance_reference = InstanceReference(
+        self.format_version, debug=self._debug,
+        output_writer=self._output_writer)
+
+    instance_reference.ReadObjectRecord(object_record.data)
+
+    return self._ReadInstance(instance_reference)
+
   def _ReadInstanceObjectRecords(self):
     """Reads instance object records.
 
     Yields:
       tuple[str, ObjectRecord]: name hash and instance object record.
     """
+    for name_hash, object_record_values in (
+        self._ReadInstanceObjectRecordValues()):
+      object_record = self._GetObjectRecord(*object_record_values)
+
+      yield name_hash, object_record
+
+  def _ReadInstanceObjectRecordValues(self):
+    """Reads instance object record values from the index.
+
+    Yields:
+      tuple[str, tuple[str, int, int, int]]: name hash and data type, mapped
+          page number, record identifier and record data size of an instance
+          object record.
+    """
     index_page = self._GetIndexRootPage()
     for key in self._GetKeysFromIndexPage(index_page):
       key_segments = key.split(self._KEY_SEGMENT_SEPARATOR)
@@ -3971,18 +4879,20 @@ class CIMRepository(data_format.BinaryDataFormat):
       if data_type not in ('I', 'IL'):
         continue
 
-      object_record = self._GetObjectRecord(
+      yield name_hash, (
           data_type, mapped_page_number, record_identifier, data_size)
 
-      yield name_hash, object_record
+  def _ReadNamespaceInstancesPerParent(self):
+    """Reads the namespace instances per parent namespace.
 
-  def _ReadNamespacesFromObjectRecords(self):
-    """Reads namespaces from object records."""
+    Returns:
+      dict[str, list[Instance]]: namespace instances per hash of the name of
+          the parent namespace.
+    """
     class_name_hash = self._GetHashFromString('__NAMESPACE')
 
     object_record_values = set()
-    instances_per_namespace = {}
-    parent_namespaces = set()
+    instances_per_parent = {}
 
     index_page = self._GetIndexRootPage()
     for key in self._GetKeysFromIndexPage(index_page):
@@ -3992,9 +4902,6 @@ class CIMRepository(data_format.BinaryDataFormat):
       if not key_segment.startswith('NS_'):
         continue
 
-      namespace_hash = key_segment[3:].lower()
-      parent_namespaces.add(namespace_hash)
-
       _, _, key_segment = key_segments[2].partition('_')
       if key_segment.lower() != class_name_hash:
         continue
@@ -4015,46 +4922,72 @@ class CIMRepository(data_format.BinaryDataFormat):
 
       instance = self._ReadInstanceFromObjectRecord(object_record)
 
-      if namespace_hash not in instances_per_namespace:
-        instances_per_namespace[namespace_hash] = []
+      parent_namespace_hash = key_segments[1][3:].lower()
+      instances_per_parent.setdefault(parent_namespace_hash, []).append(
+          instance)
 
-      instances_per_namespace[namespace_hash].append(instance)
+    return instances_per_parent
 
-    namespaces_by_hash = {}
-    for namespace in self._COMMON_NAMESPACES:
-      namespace_hash = self._GetHashFromString(namespace)
-      namespaces_by_hash[namespace_hash] = namespace
+  def _ReadNamespacesFromObjectRecords(self):
+    """Reads namespaces from object records.
 
-    for _ in range(5):
-      unresolved_namespaces = set()
-      for parent_namespace_hash in parent_namespaces:
-        parent_namespace = namespaces_by_hash.get(parent_namespace_hash, None)
-        if not parent_namespace:
-          unresolved_namespaces.add(parent_namespace_hash)
-          continue
+    The namespace hierarchy is traversed breadth-first starting with the ROOT
+    namespace, such that the name of every namespace is hashed only once.
+    Parent namespaces that are not reachable from ROOT, for example due to
+    a missing namespace instance, are resolved from the common namespaces.
+    """
+    instances_per_parent = self._ReadNamespaceInstancesPerParent()
 
-        instances = instances_per_namespace.get(parent_namespace_hash, None)
-        if not instances:
-          continue
+    common_namespace_hashes = self._GetHashesFromStrings(
+        self._COMMON_NAMESPACES)
+
+    # Common namespaces are only used to resolve parent namespaces that are
+    # not reachable from the ROOT namespace.
+    unreachable_namespaces_queue = collections.deque([
+        (namespace_hash, namespace)
+        for namespace, namespace_hash in common_namespace_hashes.items()
+        if namespace_hash in instances_per_parent])
+
+    root_namespace_hash = common_namespace_hashes['ROOT']
+
+    namespaces_queue = collections.deque([(root_namespace_hash, 'ROOT')])
+    resolved_namespace_hashes = set()
+
+    while namespaces_queue or unreachable_namespaces_queue:
+      if not namespaces_queue:
+        namespaces_queue.append(unreachable_namespaces_queue.popleft())
+
+      parent_namespace_hash, parent_namespace = namespaces_queue.popleft()
+      if parent_namespace_hash in resolved_namespace_hashes:
+        continue
 
-        for instance in instances:
-          name_property = instance.properties.get('Name', None)
+      resolved_namespace_hashes.add(parent_namespace_hash)
 
-          namespace = '\\'.join([parent_namespace, name_property])
+      for instance in instances_per_parent.get(parent_namespace_hash, []):
+        name_property = instance.properties.get('Name', None)
 
-          namespace_hash = self._GetHashFromString(namespace)
-          namespaces_by_hash[namespace_hash] = namespace
+        namespace = '\\'.join([parent_namespace, name_property])
 
-          instance.namespace = namespace
-          self._namespace_instances.append(instance)
+        namespace_hash = self._GetHashFromString(namespace)
 
-      parent_namespaces = unresolved_namespaces
+        instance.namespace = namespace
+        self._namespace_instances.append(instance)
+
+        namespaces_queue.append((namespace_hash, namespace))
+
+    if self._debug:
+      for parent_namespace_hash in instances_per_parent:
+        if parent_namespace_hash not in resolved_namespace_hashes:
+          self._DebugPrintText(
+              f'Unresolved parent namespace: {parent_namespace_hash:s}\n')
 
   def Close(self):
     """Closes the CIM repository."""
     self._class_definitions_by_hash = {}
     self._class_value_data_map_by_hash = {}
     self._namespace_instances = []
+    self._namespaces_per_hash = None
+    self._namespaces_queue = None
 
     self._index_mapping_table = None
     self._index_root_page = None
@@ -4068,9 +5001,90 @@ class CIMRepository(data_format.BinaryDataFormat):
       self._index_binary_tree_file.Close()
       self._index_binary_tree_file = None
 
-  def GetInstances(self):
+  def GetEventConsumerBindings(self):
+    """Retrieves the event filter to consumer bindings.
+
+    Only the index keys of the relevant classes and the corresponding instance
+    object records are read.
+
+    Yields:
+      EventConsumerBinding: an event filter to consumer binding.
+    """
+    if not self._index_binary_tree_file or not self._objects_data_file:
+      return
+
+    class_name_hashes = self._GetHashesFromStrings([
+        '__EventConsumer', '__EventFilter', '__FilterToConsumerBinding'])
+
+    bindings_per_namespace_hash = {}
+    for namespace_hash in self._GetNamespaceHashesFromIndex():
+      bindings = []
+      for object_record_values in self._GetInstanceObjectRecordValuesByClass(
+          namespace_hash, class_name_hashes['__FilterToConsumerBinding']):
+        instance = self._ReadInstanceFromObjectRecordValues(
+            object_record_values)
+        bindings.append(instance)
+
+      if bindings:
+        bindings_per_namespace_hash[namespace_hash] = bindings
+
+    # Only the namespaces that contain bindings are resolved.
+    namespaces_per_hash = self._GetNamespacesByHash(
+        list(bindings_per_namespace_hash.keys()))
+
+    for namespace_hash, bindings in bindings_per_namespace_hash.items():
+      filters = {}
+      for object_record_values in self._GetInstanceObjectRecordValuesByClass(
+          namespace_hash, class_name_hashes['__EventFilter']):
+        instance = self._ReadInstanceFromObjectRecordValues(
+            object_record_values)
+        lookup_key = self._NormalizeKeyValue(
+            instance.properties.get('Name', None))
+        filters[lookup_key] = instance
+
+      consumers = {}
+      for consumer_class_name_hash in self._GetSubClassNameHashes(
+          namespace_hash, class_name_hashes['__EventConsumer']):
+        for object_record_values in (
+            self._GetInstanceObjectRecordValuesByClass(
+                namespace_hash, consumer_class_name_hash)):
+          instance = self._ReadInstanceFromObjectRecordValues(
+              object_record_values)
+          lookup_key = (
+              (instance.class_name or '').lower(),
+              self._NormalizeKeyValue(instance.properties.get('Name', None)))
+          consumers[lookup_key] = instance
+
+      namespace = namespaces_per_hash.get(namespace_hash, None)
+
+      for binding in bindings:
+        event_consumer_binding = EventConsumerBinding(namespace_hash, binding)
+        event_consumer_binding.namespace = namespace
+
+        _, filter_name = self._ParseObjectPath(
+            binding.properties.get('Filter', None))
+        event_consumer_binding.filter = filters.get(
+            self._NormalizeKeyValue(filter_name), None)
+
+        consumer_class_name, consumer_name = self._ParseObjectPath(
+            binding.properties.get('Consumer', None))
+        lookup_key = (
+            (consumer_class_name or '').lower(),
+            self._NormalizeKeyValue(consumer_name))
+        event_consumer_binding.consumer = consumers.get(lookup_key, None)
+
+        yield event_consumer_binding
+
+  def GetInstances(self, number_of_workers=1, ordered=True):
     """Retrieves instances.
 
+    Args:
+      number_of_workers (Optional[int]): number of worker processes to read
+          the instances with, where 1 represents reading the instances in
+          the current process.
+      ordered (Optional[bool]): True if the instances should be returned in
+          index key order, only used when reading with worker processes.
+
     Yields:
       Instance: an instance.
     """
@@ -4078,15 +5092,14 @@ class CIMRepository(data_format.BinaryDataFormat):
       for instance in self._repository_file.ReadInstances():
         yield instance
 
-    else:
-      for _, object_record in self._ReadInstanceObjectRecords():
-        instance_reference = InstanceReference(
-            self.format_version, debug=self._debug,
-            output_writer=self._output_writer)
-
-        instance_reference.ReadObjectRecord(object_record.data)
+    elif number_of_workers > 1 and not self._debug:
+      for instance in self._GetInstancesWithWorkers(
+          number_of_workers, ordered=ordered):
+        yield instance
 
-        yield self._ReadInstance(instance_reference)
+    else:
+      for _, object_record_values in self._ReadInstanceObjectRecordValues():
+        yield self._ReadInstanceFromObjectRecordValues(object_record_values)
 
   def GetNamespaces(self):
     """Retrieves namespaces.
@@ -4142,6 +5155,8 @@ class CIMRepository(data_format.BinaryDataFormat):
     """
     basename = os.path.basename(path).lower()
 
+    self._path = path
+
     if basename in ('index.map', 'mapping1.map', 'mapping2.map', 'mapping3.map',
                     'objects.map'):
       path = os.path.dirname(path)
@@ -4171,6 +5186,9 @@ class CIMRepository(data_format.BinaryDataFormat):
       else:
         self.format_version = '2.2'
 
+      self._GetHashesFromStrings(self._COMMON_CLASS_NAMES)
+      self._GetHashesFromStrings(self._COMMON_NAMESPACES)
+
       if basename == 'index.btr' or not active_mapping_file:
         index_mapping_file.Close()
 
@@ -4193,3 +5211,47 @@ class CIMRepository(data_format.BinaryDataFormat):
       self._objects_data_file = self._OpenObjectsDataFile(path)
 
       self._ReadClassDefinitionsFromObjectRecords()
+
+
+class CIMRepositoryInstancesWorker(object):
+  """Worker process to read instances from a CIM repository."""
+
+  _cim_repository = None
+
+  @classmethod
+  def Initialize(cls, path):
+    """Initializes the worker process.
+
+    Args:
+      path (str): path to the CIM repository.
+    """
+    cls._cim_repository = CIMRepository()
+    cls._cim_repository.Open(path)
+
+    multiprocessing_util.Finalize(
+        None, cls._cim_repository.Close, exitpriority=0)
+
+  @classmethod
+  def ReadInstances(cls, object_record_values):
+    """Reads instances.
+
+    Args:
+      object_record_values (list[tuple[str, int, int, int]]): data type, mapped
+          page number, record identifier and record data size of the instance
+          object records.
+
+    Returns:
+      list[tuple[str, list[str], str, str, dict[str, object]]]: class name,
+          derivation, dynasty, super class name and properties per instance.
+    """
+    instances_values = []
+    for values in object_record_values:
+      # pylint: disable=protected-access
+      instance = cls._cim_repository._ReadInstanceFromObjectRecordValues(
+          values)
+
+      instances_values.append((
+          instance.class_name, instance.derivation, instance.dynasty,
+          instance.super_class_name, instance.properties))
+
+    return instances_values
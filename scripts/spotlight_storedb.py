@@ -95,14 +95,39 @@ def Main():
   argument_parser = argparse.ArgumentParser(description=(
       'Extracts information from Apple Spotlight store database files.'))
 
+  argument_parser.add_argument(
+      '--attributes', dest='attributes', action='store', default=None,
+      metavar='NAMES', help=(
+          'comma separated key names of the metadata attributes of the item '
+          'to show, such as: "_kMDItemFileName,kMDItemFSCreationDate". By '
+          'default all metadata attributes are shown.'))
+
   argument_parser.add_argument(
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--index_cache', '--index-cache', dest='index_cache', action='store',
+      default=None, metavar='PATH', help=(
+          'path of an index cache file, which is used to store the index of '
+          'the database so that subsequent invocations do not need to read '
+          'all the record pages.'))
+
   argument_parser.add_argument(
       '-i', '--item', dest='item', type=int, action='store', default=None,
       metavar='FSID', help='file system identifier (FSID) of the item to show.')
 
+  argument_parser.add_argument(
+      '--paths', dest='paths', action='store_true', default=False, help=(
+          'show the file system identifier (FSID) and path of all items.'))
+
+  argument_parser.add_argument(
+      '--threads', dest='threads', type=int, action='store', default=1,
+      metavar='N', help=(
+          'number of threads to decompress record pages with, where 1 '
+          'represents decompressing record pages without additional '
+          'threads.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Apple Spotlight store database file.')
@@ -116,6 +141,13 @@ def Main():
     print('')
     return False
 
+  if options.threads < 1:
+    print('Unsupported number of threads.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
@@ -129,10 +161,15 @@ def Main():
     return False
 
   spotlight_store_database = spotlight_storedb.AppleSpotlightStoreDatabaseFile(
-      debug=options.debug, output_writer=output_writer)
+      debug=options.debug, output_writer=output_writer,
+      number_of_threads=options.threads, index_cache_path=options.index_cache)
   spotlight_store_database.Open(options.source)
 
-  if options.item is None:
+  if options.paths:
+    for identifier, path in spotlight_store_database.IteratePaths():
+      output_writer.WriteText(f'{identifier:d}\t{path:s}\n')
+
+  elif options.item is None:
     properties_plist = ''
     metadata_version = ''
 
@@ -165,8 +202,12 @@ def Main():
       output_writer.WriteText('\n')
 
   else:
+    attribute_names = None
+    if options.attributes:
+      attribute_names = set(options.attributes.split(','))
+
     metadata_item = spotlight_store_database.GetMetadataItemByIdentifier(
-        options.item)
+        options.item, attribute_names=attribute_names)
     if not metadata_item:
       output_writer.WriteText(f'No such metadata item: {options.item:d}\n')
     else:
@@ -4,8 +4,11 @@
 
 import argparse
 import logging
+import os
 import sys
 
+from dfdatetime import posix_time as dfdatetime_posix_time
+
 from dtformats import output_writers
 from dtformats import unified_logging
 
@@ -24,9 +27,49 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--end_time', '--end-time', dest='end_time', type=int, action='store',
+      default=None, metavar='TIME', help=(
+          'continuous time of the end of the time range of the tracepoints '
+          'to show or, when the source is a log archive directory, wall clock '
+          'time as the number of nanoseconds since January 1, 1970 00:00:00 '
+          'UTC.'))
+
+  argument_parser.add_argument(
+      '--index_cache', '--index-cache', dest='index_cache', action='store',
+      default=None, metavar='PATH', help=(
+          'path of an index cache file, which is used to store the chunk set '
+          'time ranges of a tracev3 file so that subsequent invocations do '
+          'not need to read all the chunk headers, or of an existing '
+          'directory to store the index cache files of the tracev3 files in '
+          'when the source is a log archive directory.'))
+
+  argument_parser.add_argument(
+      '--start_time', '--start-time', dest='start_time', type=int,
+      action='store', default=None, metavar='TIME', help=(
+          'continuous time of the start of the time range of the tracepoints '
+          'to show or, when the source is a log archive directory, wall clock '
+          'time as the number of nanoseconds since January 1, 1970 00:00:00 '
+          'UTC.'))
+
+  argument_parser.add_argument(
+      '--uuidtext', dest='uuidtext', action='store', default=None,
+      metavar='PATH', help=(
+          'path of the uuidtext directory, used to resolve format strings '
+          'when the source is a directory that does not contain the uuidtext '
+          'files, such as /var/db/diagnostics.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='workers', type=int, action='store', default=1,
+      metavar='N', help=(
+          'number of worker processes to decompress and parse tracev3 chunk '
+          'sets with, where 1 represents reading chunk sets without worker '
+          'processes.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None, help=(
-          'path of the Apple Unified Logging and Activity Tracing file.'))
+          'path of the Apple Unified Logging and Activity Tracing file or '
+          'log archive directory, such as a .logarchive.'))
 
   options = argument_parser.parse_args()
 
@@ -37,6 +80,13 @@ def Main():
     print('')
     return False
 
+  if options.workers < 1:
+    print('Unsupported number of workers.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
@@ -49,6 +99,68 @@ def Main():
     print('')
     return False
 
+  if os.path.isdir(options.source):
+    if options.debug:
+      print('Debug output is not supported for a log archive directory.')
+      print('')
+      return False
+
+    if options.index_cache and not os.path.isdir(options.index_cache):
+      print((
+          'Index cache must be a directory when the source is a log archive '
+          'directory.'))
+      print('')
+      return False
+
+    log_archive = unified_logging.LogArchive(
+        number_of_workers=options.workers, uuidtext_path=options.uuidtext,
+        index_cache_path=options.index_cache)
+    log_archive.Open(options.source)
+
+    try:
+      output_writer.WriteText(
+          'Apple Unified Logging and Activity Tracing information:\n')
+
+      for index, log_archive_entry in enumerate(log_archive.IterateEntries(
+          start_time=options.start_time, end_time=options.end_time)):
+        firehose_tracepoint = log_archive_entry.firehose_tracepoint
+
+        date_time_string = 'N/A'
+        if log_archive_entry.wall_clock_time is not None:
+          date_time = dfdatetime_posix_time.PosixTimeInNanoseconds(
+              timestamp=log_archive_entry.wall_clock_time)
+          date_time_string = date_time.CopyToDateTimeString()
+
+        output_writer.WriteText(f'Entry {index:d}:\n')
+        output_writer.WriteText(f'    path:\t{log_archive_entry.path:s}\n')
+        output_writer.WriteText(f'    date and time:\t{date_time_string:s}\n')
+        output_writer.WriteText((
+            f'    continuous time:\t'
+            f'{firehose_tracepoint.continuous_time:d}\n'))
+        output_writer.WriteText((
+            f'    process identifiers:\t'
+            f'{firehose_tracepoint.process_identifier1:d}, '
+            f'{firehose_tracepoint.process_identifier2:d}\n'))
+        output_writer.WriteText((
+            f'    thread identifier:\t'
+            f'{firehose_tracepoint.thread_identifier:d}\n'))
+        output_writer.WriteText((
+            f'    format string location:\t'
+            f'0x{firehose_tracepoint.format_string_location:08x}\n'))
+
+        format_string = log_archive_entry.format_string
+        if format_string is None:
+          format_string = 'N/A'
+        output_writer.WriteText(f'    format string:\t{format_string:s}\n')
+        output_writer.WriteText('\n')
+
+    finally:
+      log_archive.Close()
+
+    output_writer.Close()
+
+    return True
+
   with open(options.source, 'rb') as file_object:
     file_signature = file_object.read(4)
 
@@ -62,7 +174,8 @@ def Main():
 
   else:
     unified_logging_file = unified_logging.TraceV3File(
-        debug=options.debug, output_writer=output_writer)
+        debug=options.debug, output_writer=output_writer,
+        index_cache_path=options.index_cache)
 
   unified_logging_file.Open(options.source)
 
@@ -98,6 +211,31 @@ def Main():
       output_writer.WriteText(f'    path:\t{dsc_range.path:s}\n')
       output_writer.WriteText('\n')
 
+  elif file_signature != b'\x99\x88\x77\x66':
+    for index, firehose_tracepoint in enumerate(
+        unified_logging_file.IterateTracepoints(
+            number_of_workers=options.workers, start_time=options.start_time,
+            end_time=options.end_time)):
+      output_writer.WriteText(f'Tracepoint {index:d}:\n')
+      output_writer.WriteText((
+          f'    chunk offset:\t0x{firehose_tracepoint.chunk_offset:08x}\n'))
+      output_writer.WriteText((
+          f'    process identifiers:\t'
+          f'{firehose_tracepoint.process_identifier1:d}, '
+          f'{firehose_tracepoint.process_identifier2:d}\n'))
+      output_writer.WriteText((
+          f'    thread identifier:\t'
+          f'{firehose_tracepoint.thread_identifier:d}\n'))
+      output_writer.WriteText((
+          f'    continuous time:\t'
+          f'{firehose_tracepoint.continuous_time:d}\n'))
+      output_writer.WriteText((
+          f'    format string location:\t'
+          f'0x{firehose_tracepoint.format_string_location:08x}\n'))
+      output_writer.WriteText((
+          f'    data size:\t{len(firehose_tracepoint.data):d}\n'))
+      output_writer.WriteText('\n')
+
   unified_logging_file.Close()
 
   output_writer.Close()
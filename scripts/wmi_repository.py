@@ -62,6 +62,54 @@ def PrintInstance(instance):
   print('')
 
 
+def PrintEventConsumerBinding(event_consumer_binding):
+  """Writes an event filter to consumer binding to stdout.
+
+  Args:
+    event_consumer_binding (EventConsumerBinding): event filter to consumer
+        binding.
+  """
+  namespace = (
+      event_consumer_binding.namespace or event_consumer_binding.namespace_hash)
+
+  name_value_pairs = [
+      ('Namespace', namespace),
+      ('Filter', event_consumer_binding.binding.properties.get('Filter', None)),
+      ('Consumer', event_consumer_binding.binding.properties.get(
+          'Consumer', None))]
+
+  if event_consumer_binding.filter:
+    filter_properties = event_consumer_binding.filter.properties
+    name_value_pairs.extend([
+        ('Filter query language', filter_properties.get('QueryLanguage', None)),
+        ('Filter query', filter_properties.get('Query', None))])
+
+  if event_consumer_binding.consumer:
+    consumer_properties = event_consumer_binding.consumer.properties
+    name_value_pairs.append((
+        'Consumer class', event_consumer_binding.consumer.class_name))
+
+    for property_name in (
+        'CommandLineTemplate', 'ExecutablePath', 'ScriptFileName',
+        'ScriptingEngine', 'ScriptText'):
+      property_value = consumer_properties.get(property_name, None)
+      if property_value is not None:
+        name_value_pairs.append((f'Consumer {property_name:s}', property_value))
+
+  largest_name = max([len(name) for name, _ in name_value_pairs])
+
+  for name, value in name_value_pairs:
+    if value is None:
+      value = ''
+    else:
+      value = f'{value!s}'
+
+    alignment_string = ' ' * (largest_name - len(name))
+    print(f'{name:s}{alignment_string:s} : {value:s}')
+
+  print('')
+
+
 def PrintNamespace(instance):
   """Writes a namespace to stdout.
 
@@ -90,6 +138,18 @@ def Main():
       '--output_mode', '--output-mode', dest='output_mode', action='store',
       default='instances', help='output mode.')
 
+  argument_parser.add_argument(
+      '--unordered', dest='unordered', action='store_true', default=False,
+      help=(
+          'return instances in the order they are read by the worker '
+          'processes instead of index key order.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='workers', type=int, action='store', default=1,
+      metavar='N', help=(
+          'number of worker processes to read instances with, where 1 '
+          'represents reading instances without worker processes.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help=(
@@ -105,6 +165,13 @@ def Main():
     print('')
     return False
 
+  if options.workers < 1:
+    print('Unsupported number of workers.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
@@ -131,9 +198,14 @@ def Main():
       print(key_path)
 
   elif options.output_mode == 'instances':
-    for instance in cim_repository.GetInstances():
+    for instance in cim_repository.GetInstances(
+        number_of_workers=options.workers, ordered=not options.unordered):
       PrintInstance(instance)
 
+  elif options.output_mode == 'persistence':
+    for event_consumer_binding in cim_repository.GetEventConsumerBindings():
+      PrintEventConsumerBinding(event_consumer_binding)
+
   elif options.output_mode == 'namespaces':
     for instance in sorted(
         cim_repository.GetNamespaces(),
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Tests for the decompressors."""
+
+import struct
+import unittest
+import zlib
+
+import lz4.block
+
+from dtformats import decompressors
+from dtformats import errors
+
+from tests import test_lib
+
+
+class LZ4BlockStreamDecompressorTest(test_lib.BaseTestCase):
+  """Apple LZ4 block stream decompressor tests."""
+
+  _FIRST_BLOCK_DATA = b'first block of uncompressed data ' * 32
+  _SECOND_BLOCK_DATA = b'uncompressed block data'
+  _THIRD_BLOCK_DATA = b'first block of uncompressed data ' * 16
+
+  def _CreateCompressedBlock(self, data, dictionary=b''):
+    """Creates a LZ4 compressed block.
+
+    Args:
+      data (bytes): uncompressed data.
+      dictionary (Optional[bytes]): data preceding the block.
+
+    Returns:
+      bytes: LZ4 compressed block, including the block header.
+    """
+    compressed_data = lz4.block.compress(
+        data, store_size=False, dict=dictionary)
+    return b''.join([
+        b'bv41', struct.pack('<II', len(data), len(compressed_data)),
+        compressed_data])
+
+  def _CreateUncompressedBlock(self, data):
+    """Creates a LZ4 uncompressed block.
+
+    Args:
+      data (bytes): uncompressed data.
+
+    Returns:
+      bytes: LZ4 uncompressed block, including the block header.
+    """
+    return b''.join([b'bv4-', struct.pack('<I', len(data)), data])
+
+  def testDecompress(self):
+    """Tests the Decompress function."""
+    decompressor = decompressors.LZ4BlockStreamDecompressor()
+
+    compressed_data = b''.join([
+        self._CreateCompressedBlock(self._FIRST_BLOCK_DATA), b'bv4$'])
+
+    uncompressed_data, compressed_data_size = decompressor.Decompress(
+        compressed_data + b'\x00' * 8)
+    self.assertEqual(uncompressed_data, self._FIRST_BLOCK_DATA)
+    self.assertEqual(compressed_data_size, len(compressed_data))
+
+    compressed_data = b''.join([
+        self._CreateUncompressedBlock(self._SECOND_BLOCK_DATA), b'bv4$'])
+
+    uncompressed_data, _ = decompressor.Decompress(compressed_data)
+    self.assertEqual(uncompressed_data, self._SECOND_BLOCK_DATA)
+
+    with self.assertRaises(errors.ParseError):
+      decompressor.Decompress(compressed_data, uncompressed_data_size=1)
+
+    with self.assertRaises(errors.ParseError):
+      decompressor.Decompress(compressed_data[:-4])
+
+    with self.assertRaises(errors.ParseError):
+      decompressor.Decompress(compressed_data[:6])
+
+  def testDecompressMultipleBlocks(self):
+    """Tests the Decompress function with multiple blocks."""
+    decompressor = decompressors.LZ4BlockStreamDecompressor()
+
+    preceding_data = self._FIRST_BLOCK_DATA + self._SECOND_BLOCK_DATA
+
+    compressed_data = b''.join([
+        self._CreateCompressedBlock(self._FIRST_BLOCK_DATA),
+        self._CreateUncompressedBlock(self._SECOND_BLOCK_DATA),
+        self._CreateCompressedBlock(
+            self._THIRD_BLOCK_DATA, dictionary=preceding_data),
+        b'bv4$'])
+
+    expected_data = preceding_data + self._THIRD_BLOCK_DATA
+
+    uncompressed_data, compressed_data_size = decompressor.Decompress(
+        compressed_data, uncompressed_data_size=len(expected_data))
+    self.assertIsInstance(uncompressed_data, bytearray)
+    self.assertEqual(uncompressed_data, expected_data)
+    self.assertEqual(compressed_data_size, len(compressed_data))
+
+
+class ZlibDecompressorTest(test_lib.BaseTestCase):
+  """Zlib decompressor tests."""
+
+  def testDecompress(self):
+    """Tests the Decompress function."""
+    decompressor = decompressors.ZlibDecompressor()
+
+    compressed_data = zlib.compress(b'uncompressed data')
+
+    uncompressed_data, compressed_data_size = decompressor.Decompress(
+        compressed_data + b'\x00' * 8)
+    self.assertEqual(uncompressed_data, b'uncompressed data')
+    self.assertEqual(compressed_data_size, len(compressed_data))
+
+    with self.assertRaises(errors.ParseError):
+      decompressor.Decompress(compressed_data, uncompressed_data_size=1)
+
+    with self.assertRaises(errors.ParseError):
+      decompressor.Decompress(b'\x78\x9c\xff\xff\xff\xff')
+
+
+class DecompressorManagerTest(test_lib.BaseTestCase):
+  """Decompressor manager tests."""
+
+  def testDecompress(self):
+    """Tests the Decompress function."""
+    uncompressed_data, _ = decompressors.DecompressorManager.Decompress(
+        zlib.compress(b'uncompressed data'))
+    self.assertEqual(uncompressed_data, b'uncompressed data')
+
+    with self.assertRaises(errors.ParseError):
+      decompressors.DecompressorManager.Decompress(b'test')
+
+  def testGetDecompressor(self):
+    """Tests the GetDecompressor function."""
+    decompressor = decompressors.DecompressorManager.GetDecompressor(
+        b'bv4-\x00\x00\x00\x00bv4$')
+    self.assertIsInstance(
+        decompressor, decompressors.LZ4BlockStreamDecompressor)
+
+    decompressor = decompressors.DecompressorManager.GetDecompressor(
+        b'bvx2')
+    self.assertIsInstance(decompressor, decompressors.LZFSEDecompressor)
+
+    decompressor = decompressors.DecompressorManager.GetDecompressor(
+        zlib.compress(b'uncompressed data'))
+    self.assertIsInstance(decompressor, decompressors.ZlibDecompressor)
+
+    decompressor = decompressors.DecompressorManager.GetDecompressor(b'test')
+    self.assertIsNone(decompressor)
+
+  def testRegisterDecompressor(self):
+    """Tests the RegisterDecompressor and DeregisterDecompressor functions."""
+
+    class TestDecompressor(decompressors.Decompressor):
+      """Test decompressor."""
+
+      SIGNATURES = (b'test',)
+
+      def Decompress(self, compressed_data, uncompressed_data_size=None):
+        """Decompresses the data."""
+        return compressed_data[4:], len(compressed_data)
+
+    decompressors.DecompressorManager.RegisterDecompressor(TestDecompressor)
+
+    try:
+      with self.assertRaises(KeyError):
+        decompressors.DecompressorManager.RegisterDecompressor(
+            TestDecompressor)
+
+      uncompressed_data, _ = decompressors.DecompressorManager.Decompress(
+          b'testdata')
+      self.assertEqual(uncompressed_data, b'data')
+
+    finally:
+      decompressors.DecompressorManager.DeregisterDecompressor(
+          TestDecompressor)
+
+    with self.assertRaises(KeyError):
+      decompressors.DecompressorManager.DeregisterDecompressor(
+          TestDecompressor)
+
+
+if __name__ == '__main__':
+  unittest.main()
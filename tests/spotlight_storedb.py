@@ -1,24 +1,545 @@
 # -*- coding: utf-8 -*-
 """Tests for Apple Spotlight store database files."""
 
+import array
+import io
+import os
+import struct
+import sys
+import tempfile
 import unittest
+import zlib
 
+import lz4.block
+
+from dtformats import errors
 from dtformats import spotlight_storedb
 
 from tests import test_lib
 
 
+def _CreateVariableSizeInteger(integer_value):
+  """Creates a variable size integer.
+
+  Args:
+    integer_value (int): integer value, which must be smaller than 2^32.
+
+  Returns:
+    bytes: variable size integer data.
+  """
+  if integer_value < 0x80:
+    return bytes([integer_value])
+
+  if integer_value < 0x4000:
+    return bytes([0x80 | (integer_value >> 8), integer_value & 0xff])
+
+  if integer_value < 0x200000:
+    return bytes([
+        0xc0 | (integer_value >> 16), (integer_value >> 8) & 0xff,
+        integer_value & 0xff])
+
+  if integer_value < 0x10000000:
+    return bytes([
+        0xe0 | (integer_value >> 24), (integer_value >> 16) & 0xff,
+        (integer_value >> 8) & 0xff, integer_value & 0xff])
+
+  return b''.join([b'\xf0', struct.pack('>I', integer_value)])
+
+
+def _CreatePropertyPage(property_table_type, page_values_data):
+  """Creates a property page.
+
+  Args:
+    property_table_type (int): property table type.
+    page_values_data (bytes): page values data.
+
+  Returns:
+    bytes: property page data.
+  """
+  used_page_size = 20 + 12 + len(page_values_data)
+  page_data = b''.join([
+      b'2pbd', struct.pack(
+          '<IIII', 0x1000, used_page_size, property_table_type, 0),
+      struct.pack('<IQ', 0, 0), page_values_data])
+
+  return page_data.ljust(0x1000, b'\x00')
+
+
+def _CreateRecord(
+    identifier, parent_identifier, last_update_time, attributes_data):
+  """Creates a record.
+
+  Args:
+    identifier (int): file (system) entry identifier.
+    parent_identifier (int): parent file (system) entry identifier.
+    last_update_time (int): last update time.
+    attributes_data (bytes): metadata attributes data.
+
+  Returns:
+    bytes: record data.
+  """
+  record_data = b''.join([
+      _CreateVariableSizeInteger(identifier), b'\x00',
+      _CreateVariableSizeInteger(identifier + 1000),
+      _CreateVariableSizeInteger(parent_identifier),
+      _CreateVariableSizeInteger(last_update_time), attributes_data])
+
+  return b''.join([struct.pack('<I', len(record_data)), record_data])
+
+
+def _CreateRecordWithFileName(
+    identifier, parent_identifier, file_name, creation_time=None):
+  """Creates a record with a file name metadata attribute.
+
+  Args:
+    identifier (int): file (system) entry identifier.
+    parent_identifier (int): parent file (system) entry identifier.
+    file_name (str): file name.
+    creation_time (Optional[float]): creation date and time as a Cocoa
+        timestamp.
+
+  Returns:
+    bytes: record data.
+  """
+  file_name_data = b''.join([file_name.encode('utf8'), b'\x00'])
+
+  # Metadata type 1: _kMDItemFileName string
+  attributes_data = [
+      b'\x01', _CreateVariableSizeInteger(len(file_name_data)),
+      file_name_data]
+
+  if creation_time is None:
+    relative_metadata_type_index = b'\x03'
+  else:
+    # Metadata type 2: kMDItemFSCreationDate date and time
+    attributes_data.extend([b'\x01', struct.pack('<d', creation_time)])
+    relative_metadata_type_index = b'\x02'
+
+  # Metadata type 4: kMDItemContentType value with table index 1
+  attributes_data.extend([relative_metadata_type_index, b'\x01'])
+
+  # Metadata type 5: kMDItemKeywords values list with table index 1
+  attributes_data.extend([b'\x01', b'\x01'])
+
+  # Metadata type 6: kMDItemFSSize integer, as the last attribute of the record
+  # that consists of a single byte.
+  attributes_data.extend([b'\x01', _CreateVariableSizeInteger(identifier)])
+
+  return _CreateRecord(
+      identifier, parent_identifier, 1600000000 + identifier,
+      b''.join(attributes_data))
+
+
+def _CreateTestStoreDatabaseData():
+  """Creates the data of a test store database.
+
+  Returns:
+    bytes: store database data.
+  """
+  file_header_data = b''.join([
+      b'8tsd', struct.pack(
+          '<IIIIIIIIIIIIIIII', 0, 0, 0, 0, 0, 0, 0, 0, 0x1000, 0x1000,
+          0x1000, 2, 3, 0, 4, 0),
+      b'\x00' * 256, b'/\x00'.ljust(256, b'\x00')])
+
+  map_page_data = b''.join([
+      b'1mbd', struct.pack('<IIII', 0x1000, 2, 0, 0),
+      struct.pack('<QII', 0, 5, 0), struct.pack('<QII', 0, 6, 0)])
+
+  metadata_types_data = b''.join([
+      struct.pack('<IBB', 1, 0x0b, 0x00), b'_kMDItemFileName\x00',
+      struct.pack('<IBB', 2, 0x0c, 0x00), b'kMDItemFSCreationDate\x00',
+      struct.pack('<IBB', 4, 0x0f, 0x00), b'kMDItemContentType\x00',
+      struct.pack('<IBB', 5, 0x0f, 0x02), b'kMDItemKeywords\x00',
+      struct.pack('<IBB', 6, 0x00, 0x00), b'kMDItemFSSize\x00'])
+
+  metadata_values_data = b''.join([
+      struct.pack('<I', 1), b'public.folder\x00',
+      struct.pack('<I', 2), b'public.plain-text\x00'])
+
+  metadata_lists_data = b''.join([
+      struct.pack('<I', 1), _CreateVariableSizeInteger(8),
+      struct.pack('<II', 1, 2)])
+
+  zlib_records_data = b''.join([
+      _CreateRecordWithFileName(1, 0, 'root'),
+      _CreateRecordWithFileName(2, 1, 'Users', creation_time=600000000.0),
+      _CreateRecordWithFileName(3, 2, 'test'),
+      _CreateRecordWithFileName(4, 3, 'Documents')])
+
+  zlib_compressed_data = zlib.compress(zlib_records_data)
+
+  zlib_record_page_data = b''.join([
+      b'2pbd', struct.pack(
+          '<IIII', 0x1000, 20 + len(zlib_compressed_data), 0x00000009,
+          len(zlib_records_data)),
+      zlib_compressed_data]).ljust(0x1000, b'\x00')
+
+  lz4_records_data = b''.join([
+      _CreateRecordWithFileName(5, 4, 'file1.txt'),
+      _CreateRecordWithFileName(6, 4, 'file2.txt'),
+      _CreateRecordWithFileName(7, 3, 'Desktop')])
+
+  lz4_compressed_data = lz4.block.compress(lz4_records_data, store_size=False)
+
+  lz4_block_data = b''.join([
+      b'bv41', struct.pack(
+          '<II', len(lz4_records_data), len(lz4_compressed_data)),
+      lz4_compressed_data, b'bv4$'])
+
+  lz4_record_page_data = b''.join([
+      b'2pbd', struct.pack(
+          '<IIII', 0x1000, 20 + len(lz4_block_data), 0x00001009,
+          len(lz4_records_data)),
+      lz4_block_data]).ljust(0x1000, b'\x00')
+
+  return b''.join([
+      file_header_data.ljust(0x1000, b'\x00'),
+      map_page_data.ljust(0x1000, b'\x00'),
+      _CreatePropertyPage(0x00000011, metadata_types_data),
+      _CreatePropertyPage(0x00000021, metadata_values_data),
+      _CreatePropertyPage(0x00000081, metadata_lists_data),
+      zlib_record_page_data, lz4_record_page_data])
+
+
+class SpotlightStoreRecordDescriptorTableTest(test_lib.BaseTestCase):
+  """Spotlight store database record descriptor table tests."""
+
+  def testAddRecordDescriptor(self):
+    """Tests the AddRecordDescriptor function."""
+    record_descriptors = spotlight_storedb.SpotlightStoreRecordDescriptorTable()
+    self.assertEqual(record_descriptors.number_of_records, 0)
+
+    record_descriptors.AddRecordDescriptor(5, 1005, 1600000005, 0x6000, 20, 4)
+    record_descriptors.AddRecordDescriptor(2, 1002, 1600000002, 0x5000, 20, 1)
+    record_descriptors.AddRecordDescriptor(5, 1005, 1600000006, 0x7000, 40, 3)
+
+    self.assertEqual(record_descriptors.number_of_records, 2)
+    self.assertEqual(list(record_descriptors.GetIdentifiers()), [2, 5])
+
+    columns = record_descriptors.GetColumns()
+    self.assertEqual(len(columns), 6)
+    self.assertEqual(list(columns[3]), [0x5000, 0x7000])
+
+    for column in columns:
+      self.assertIsInstance(column, array.array)
+
+  def testGetParentIdentifier(self):
+    """Tests the GetParentIdentifier function."""
+    record_descriptors = spotlight_storedb.SpotlightStoreRecordDescriptorTable()
+    record_descriptors.AddRecordDescriptor(5, 1005, 1600000005, 0x6000, 20, 4)
+
+    self.assertEqual(record_descriptors.GetParentIdentifier(5), 4)
+    self.assertIsNone(record_descriptors.GetParentIdentifier(4))
+
+  def testGetRecordDescriptor(self):
+    """Tests the GetRecordDescriptor function."""
+    record_descriptors = spotlight_storedb.SpotlightStoreRecordDescriptorTable()
+    record_descriptors.AddRecordDescriptor(5, 1005, 1600000005, 0x6000, 20, 4)
+    record_descriptors.AddRecordDescriptor(3, 1003, 1600000003, 0x5000, 40, 2)
+
+    record_descriptor = record_descriptors.GetRecordDescriptor(5)
+    self.assertIsNotNone(record_descriptor)
+    self.assertEqual(record_descriptor.identifier, 5)
+    self.assertEqual(record_descriptor.item_identifier, 1005)
+    self.assertEqual(record_descriptor.last_update_time, 1600000005)
+    self.assertEqual(record_descriptor.page_offset, 0x6000)
+    self.assertEqual(record_descriptor.page_value_offset, 20)
+    self.assertEqual(record_descriptor.parent_identifier, 4)
+
+    record_descriptor = record_descriptors.GetRecordDescriptor(4)
+    self.assertIsNone(record_descriptor)
+
+    record_descriptor = record_descriptors.GetRecordDescriptor(99)
+    self.assertIsNone(record_descriptor)
+
+  def testHasIdentifier(self):
+    """Tests the HasIdentifier function."""
+    record_descriptors = spotlight_storedb.SpotlightStoreRecordDescriptorTable()
+    record_descriptors.AddRecordDescriptor(5, 1005, 1600000005, 0x6000, 20, 4)
+
+    self.assertTrue(record_descriptors.HasIdentifier(5))
+    self.assertFalse(record_descriptors.HasIdentifier(1))
+
+
 class AppleSpotlightStoreDatabaseFileTest(test_lib.BaseTestCase):
   """Apple Spotlight store database file tests."""
 
   # pylint: disable=protected-access
 
+  def testGetMetadataItemByIdentifier(self):
+    """Tests the _GetMetadataItemByIdentifier function."""
+    file_object = io.BytesIO(_CreateTestStoreDatabaseData())
+
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+    test_file.ReadFileObject(file_object)
+
+    metadata_item = test_file._GetMetadataItemByIdentifier(file_object, 2)
+    self.assertIsNotNone(metadata_item)
+    self.assertEqual(metadata_item.identifier, 2)
+    self.assertEqual(metadata_item.item_identifier, 1002)
+    self.assertEqual(metadata_item.last_update_time, 1600000002)
+    self.assertEqual(metadata_item.parent_identifier, 1)
+
+    self.assertEqual(sorted(metadata_item.attributes.keys()), [
+        '_kMDItemFileName', 'kMDItemContentType', 'kMDItemFSCreationDate',
+        'kMDItemFSSize', 'kMDItemKeywords'])
+
+    metadata_attribute = metadata_item.attributes['_kMDItemFileName']
+    self.assertEqual(metadata_attribute.value, 'Users')
+
+    metadata_attribute = metadata_item.attributes['kMDItemFSCreationDate']
+    self.assertEqual(metadata_attribute.value, 600000000.0)
+
+    metadata_attribute = metadata_item.attributes['kMDItemContentType']
+    self.assertEqual(metadata_attribute.value, 'public.folder')
+
+    metadata_attribute = metadata_item.attributes['kMDItemKeywords']
+    self.assertEqual(
+        metadata_attribute.value, ['public.folder', 'public.plain-text'])
+
+    metadata_item = test_file._GetMetadataItemByIdentifier(file_object, 6)
+    self.assertIsNotNone(metadata_item)
+    self.assertEqual(metadata_item.parent_identifier, 4)
+
+    metadata_attribute = metadata_item.attributes['_kMDItemFileName']
+    self.assertEqual(metadata_attribute.value, 'file2.txt')
+
+    metadata_item = test_file._GetMetadataItemByIdentifier(file_object, 99)
+    self.assertIsNone(metadata_item)
+
+  def testGetMetadataItemByIdentifierWithMetadataTypeIndexes(self):
+    """Tests the _GetMetadataItemByIdentifier function with type indexes."""
+    file_object = io.BytesIO(_CreateTestStoreDatabaseData())
+
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+    test_file.ReadFileObject(file_object)
+
+    metadata_type_indexes = test_file._GetMetadataTypeIndexes(
+        set(['_kMDItemFileName', 'kMDItemFSSize']))
+
+    metadata_item = test_file._GetMetadataItemByIdentifier(
+        file_object, 2, metadata_type_indexes=metadata_type_indexes)
+    self.assertIsNotNone(metadata_item)
+    self.assertEqual(metadata_item.parent_identifier, 1)
+
+    self.assertEqual(sorted(metadata_item.attributes.keys()), [
+        '_kMDItemFileName', 'kMDItemFSSize'])
+
+    metadata_attribute = metadata_item.attributes['_kMDItemFileName']
+    self.assertEqual(metadata_attribute.value, 'Users')
+
+    metadata_attribute = metadata_item.attributes['kMDItemFSSize']
+    self.assertEqual(metadata_attribute.value, 2)
+
+  def testGetMetadataTypeIndexes(self):
+    """Tests the _GetMetadataTypeIndexes function."""
+    file_object = io.BytesIO(_CreateTestStoreDatabaseData())
+
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+    test_file.ReadFileObject(file_object)
+
+    metadata_type_indexes = test_file._GetMetadataTypeIndexes(
+        set(['_kMDItemFileName', 'kMDItemKeywords', 'bogus']))
+    self.assertEqual(metadata_type_indexes, frozenset([1, 5]))
+
+    cached_metadata_type_indexes = test_file._GetMetadataTypeIndexes(
+        ['kMDItemKeywords', '_kMDItemFileName', 'bogus'])
+    self.assertIs(cached_metadata_type_indexes, metadata_type_indexes)
+
+  def testGetPathOfParent(self):
+    """Tests the _GetPathOfParent function."""
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+    test_file._file_names = {2: 'Users', 3: 'test', 4: None, 5: 'file.txt'}
+
+    for identifier, parent_identifier in ((2, 1), (3, 2), (4, 3), (5, 4)):
+      test_file._record_descriptors.AddRecordDescriptor(
+          identifier, 0, 0, 0x5000, 20, parent_identifier)
+
+    path = test_file._GetPathOfParent(5)
+    self.assertEqual(path, '/Users/test/(null)')
+    self.assertEqual(test_file._paths, {
+        2: '/Users', 3: '/Users/test', 4: '/Users/test/(null)'})
+
+    path = test_file._GetPathOfParent(2)
+    self.assertEqual(path, '')
+
+    # Test with a loop of parent identifiers.
+    test_file._paths = {}
+    test_file._record_descriptors.AddRecordDescriptor(2, 0, 0, 0x5000, 20, 4)
+
+    path = test_file._GetPathOfParent(5)
+    self.assertEqual(path, '/Users/test/(null)')
+
+  def testGetRecordPageData(self):
+    """Tests the _GetRecordPageData function."""
+    file_object = io.BytesIO(_CreateTestStoreDatabaseData())
+
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+    test_file._MAXIMUM_RECORD_PAGES_CACHE_SIZE = 256
+
+    page_data = test_file._GetRecordPageData(file_object, 0x5000)
+    self.assertEqual(len(page_data), 123)
+    self.assertEqual(list(test_file._record_pages_cache.keys()), [0x5000])
+
+    test_file._GetRecordPageData(file_object, 0x6000)
+    self.assertEqual(
+        list(test_file._record_pages_cache.keys()), [0x5000, 0x6000])
+
+    cached_page_data = test_file._GetRecordPageData(file_object, 0x5000)
+    self.assertIs(cached_page_data, page_data)
+    self.assertEqual(
+        list(test_file._record_pages_cache.keys()), [0x6000, 0x5000])
+
+    # Exceed the maximum cache size to evict the least recently used page.
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+    test_file._MAXIMUM_RECORD_PAGES_CACHE_SIZE = 160
+
+    test_file._GetRecordPageData(file_object, 0x5000)
+    test_file._GetRecordPageData(file_object, 0x6000)
+    self.assertEqual(list(test_file._record_pages_cache.keys()), [0x6000])
+    self.assertEqual(test_file._record_pages_cache_size, 94)
+
   # TODO: add test for _FormatStreamAsSignature
   # TODO: add test for _ReadFileHeader
   # TODO: add test for _ReadMapPages
-  # TODO: add test for _ReadPropertyPage
   # TODO: add test for _ReadPropertyPages
-  # TODO: add test for _ReadPropertyPageValues
+
+  def testParsePropertyPageValues(self):
+    """Tests the _ParsePropertyPageValues function."""
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+
+    data = b''.join([
+        struct.pack('<IBB', 1, 0x0b, 0x00), b'_kMDItemFileName\x00',
+        struct.pack('<IBB', 6, 0x00, 0x00), b'kMDItemFSSize\x00'])
+
+    property_table = {}
+    test_file._ParsePropertyPageValues(
+        0x00000011, data, 0, len(data), property_table)
+
+    self.assertEqual(sorted(property_table.keys()), [1, 6])
+
+    property_value = property_table[6]
+    self.assertIs(property_value.key_name, sys.intern('kMDItemFSSize'))
+    self.assertEqual(property_value.property_type, 0x00)
+    self.assertEqual(property_value.value_type, 0x00)
+
+    data = b''.join([struct.pack('<I', 1), b'public.folder\x00'])
+
+    test_file._ParsePropertyPageValues(
+        0x00000021, data, 0, len(data), test_file._metadata_values)
+
+    data = b''.join([
+        struct.pack('<I', 1), _CreateVariableSizeInteger(8),
+        struct.pack('<II', 1, 2)])
+
+    property_table = {}
+    test_file._ParsePropertyPageValues(
+        0x00000081, data, 0, len(data), property_table)
+
+    self.assertEqual(property_table[1].values_list, ['public.folder', ''])
+
+    with self.assertRaises(errors.ParseError):
+      test_file._ParsePropertyPageValues(
+          0x00000011, data[:8], 0, 8, property_table)
+
+    with self.assertRaises(errors.ParseError):
+      test_file._ParsePropertyPageValues(
+          0x00000081, data, 0, len(data) - 4, property_table)
+
+    output_writer = test_lib.TestOutputWriter()
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile(
+        debug=True, output_writer=output_writer)
+
+    property_table = {}
+    test_file._ParsePropertyPageValues(
+        0x00000081, data, 0, len(data), property_table)
+
+    self.assertEqual(property_table[1].values_list, ['', ''])
+    self.assertNotEqual(output_writer.output, [])
+
+  def testReadMetadataAttributeVariableSizeIntegerValue(self):
+    """Tests the _ReadMetadataAttributeVariableSizeIntegerValue function."""
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+
+    value, data_offset = (
+        test_file._ReadMetadataAttributeVariableSizeIntegerValue(
+            0x00, b'\x00\x80\x24', 1))
+    self.assertEqual(value, 36)
+    self.assertEqual(data_offset, 3)
+
+    value, data_offset = (
+        test_file._ReadMetadataAttributeVariableSizeIntegerValue(
+            0x02, b'\x00\x03\x01\x80\x24\x09', 1))
+    self.assertEqual(value, [1, 36])
+    self.assertEqual(data_offset, 5)
+
+  def testReadPropertyPages(self):
+    """Tests the _ReadPropertyPages function."""
+    first_page_data = bytearray(_CreatePropertyPage(0x00000021, b''.join([
+        struct.pack('<I', 1), b'public.folder\x00'])))
+    second_page_data = _CreatePropertyPage(0x00000021, b''.join([
+        struct.pack('<I', 2), b'public.plain-text\x00']))
+
+    # Chain the property pages in block 2 and block 1.
+    first_page_data[20:24] = struct.pack('<I', 1)
+
+    file_object = io.BytesIO(b''.join([
+        b'\x00' * 0x1000, second_page_data, bytes(first_page_data)]))
+
+    for read_size in (0x1000, 0x3000):
+      test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+      test_file._PROPERTY_PAGES_READ_SIZE = read_size
+
+      property_table = {}
+      test_file._ReadPropertyPages(file_object, 2, property_table)
+
+      self.assertEqual(sorted(property_table.keys()), [1, 2])
+      self.assertEqual(property_table[2].value_name, 'public.plain-text')
+
+    output_writer = test_lib.TestOutputWriter()
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile(
+        debug=True, output_writer=output_writer)
+
+    property_table = {}
+    test_file._ReadPropertyPages(file_object, 2, property_table)
+
+    self.assertEqual(sorted(property_table.keys()), [1, 2])
+    self.assertEqual(property_table[2].value_name, 'public.plain-text')
+
+    # Test a property page chain that contains a loop.
+    second_page_data = bytearray(second_page_data)
+    second_page_data[20:24] = struct.pack('<I', 2)
+
+    file_object = io.BytesIO(b''.join([
+        b'\x00' * 0x1000, bytes(second_page_data), bytes(first_page_data)]))
+
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+
+    with self.assertRaises(errors.ParseError):
+      test_file._ReadPropertyPages(file_object, 2, {})
+
+  def testReadRecordPages(self):
+    """Tests the _ReadRecordPages function."""
+    file_object = io.BytesIO(_CreateTestStoreDatabaseData())
+
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+
+    record_pages = list(test_file._ReadRecordPages(
+        file_object, [0x5000, 0x6000]))
+    self.assertEqual(len(record_pages), 2)
+    self.assertEqual(record_pages[0][0], 0x5000)
+    self.assertEqual(len(record_pages[0][1]), 123)
+    self.assertEqual(record_pages[1][0], 0x6000)
+    self.assertEqual(len(record_pages[1][1]), 94)
+
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile(
+        number_of_threads=4)
+
+    # Read more record pages than can be pending to test the ordered hand-off.
+    threaded_record_pages = list(test_file._ReadRecordPages(
+        file_object, [0x5000, 0x6000] * 10))
+    self.assertEqual(threaded_record_pages, record_pages * 10)
 
   def testReadVariableSizeInteger(self):
     """Tests the _ReadVariableSizeInteger function."""
@@ -77,8 +598,246 @@ class AppleSpotlightStoreDatabaseFileTest(test_lib.BaseTestCase):
     self.assertEqual(integer_value, 72623859790382856)
     self.assertEqual(bytes_read, 9)
 
+  def testReadVariableSizeIntegerAtOffset(self):
+    """Tests the _ReadVariableSizeIntegerAtOffset function."""
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+
+    test_data = b''.join([
+        b'\x24', b'\x80\x24', b'\xf1\x02\x03\x04\x05',
+        b'\xff\x01\x02\x03\x04\x05\x06\x07\x08'])
+
+    integer_value, data_offset = test_file._ReadVariableSizeIntegerAtOffset(
+        test_data, 0)
+    self.assertEqual(integer_value, 36)
+    self.assertEqual(data_offset, 1)
+
+    integer_value, data_offset = test_file._ReadVariableSizeIntegerAtOffset(
+        test_data, data_offset)
+    self.assertEqual(integer_value, 36)
+    self.assertEqual(data_offset, 3)
+
+    integer_value, data_offset = test_file._ReadVariableSizeIntegerAtOffset(
+        test_data, data_offset)
+    self.assertEqual(integer_value, 4328719365)
+    self.assertEqual(data_offset, 8)
+
+    integer_value, data_offset = test_file._ReadVariableSizeIntegerAtOffset(
+        test_data, data_offset)
+    self.assertEqual(integer_value, 72623859790382856)
+    self.assertEqual(data_offset, 17)
+
+    with self.assertRaises(errors.ParseError):
+      test_file._ReadVariableSizeIntegerAtOffset(test_data, data_offset)
+
+    with self.assertRaises(errors.ParseError):
+      test_file._ReadVariableSizeIntegerAtOffset(b'\xc0\x00', 0)
+
+  def testReadVariableSizeIntegersAtOffset(self):
+    """Tests the _ReadVariableSizeIntegersAtOffset function."""
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+
+    integer_values, data_offset = (
+        test_file._ReadVariableSizeIntegersAtOffset(
+            b'\x00\x24\x80\x24\xc0\x00\x24', 1, 3))
+    self.assertEqual(integer_values, [36, 36, 36])
+    self.assertEqual(data_offset, 7)
+
+  def testSkipMetadataAttribute(self):
+    """Tests the _SkipMetadataAttribute function."""
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+
+    test_values = [
+        (0x00, 0x00, b'\x00\x80\x24\xff'),
+        (0x07, 0x00, b'\x00\xc0\x00\x24\xff'),
+        (0x07, 0x02, b'\x00\x03\x01\x80\x24\xff'),
+        (0x08, 0x00, b'\x00\x01\xff'),
+        (0x08, 0x02, b'\x00\x02\x01\x02\xff'),
+        (0x09, 0x00, b'\x00\x00\x00\x80\x3f\xff'),
+        (0x09, 0x02, b'\x00\x04\x00\x00\x80\x3f\xff'),
+        (0x0a, 0x00, b'\x00\x00\x00\x00\x00\x00\x00\xf0\x3f\xff'),
+        (0x0b, 0x00, b'\x00\x04abc\x00\xff'),
+        (0x0b, 0x02, b'\x00\x04a\x00b\x00\xff'),
+        (0x0c, 0x02, (
+            b'\x00\x08\x00\x00\x00\x00\x00\x00\xf0\x3f\xff')),
+        (0x0e, 0x00, b'\x00\x02\x01\x02\xff'),
+        (0x0f, 0x00, b'\x00\x80\x01\xff')]
+
+    for value_type, property_type, test_data in test_values:
+      metadata_type = spotlight_storedb.SpotlightStorePropertyValue(1)
+      metadata_type.key_name = 'test'
+      metadata_type.property_type = property_type
+      metadata_type.value_type = value_type
+
+      _, expected_data_offset = test_file._ReadMetadataAttribute(
+          metadata_type, test_data, 1)
+      self.assertEqual(expected_data_offset, len(test_data) - 1)
+
+      data_offset = test_file._SkipMetadataAttribute(
+          metadata_type, test_data, 1)
+      self.assertEqual(data_offset, expected_data_offset)
+
+  def testIterateMetadataItems(self):
+    """Tests the IterateMetadataItems function."""
+    file_object = io.BytesIO(_CreateTestStoreDatabaseData())
+
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+    test_file.ReadFileObject(file_object)
+    test_file._file_object = file_object
+
+    # Use a map that contains the LZ4 compressed record page first.
+    test_file._map_values.reverse()
+
+    metadata_items = list(test_file.IterateMetadataItems())
+    self.assertEqual(len(metadata_items), 7)
+
+    identifiers = [metadata_item.identifier for metadata_item in metadata_items]
+    self.assertEqual(identifiers, [1, 2, 3, 4, 5, 6, 7])
+
+    for metadata_item in metadata_items:
+      expected_metadata_item = test_file._GetMetadataItemByIdentifier(
+          file_object, metadata_item.identifier)
+
+      self.assertEqual(
+          metadata_item.parent_identifier,
+          expected_metadata_item.parent_identifier)
+      self.assertEqual(
+          sorted(metadata_item.attributes.keys()),
+          sorted(expected_metadata_item.attributes.keys()))
+
+      metadata_attribute = metadata_item.attributes['kMDItemFSSize']
+      self.assertEqual(metadata_attribute.value, metadata_item.identifier)
+
+    metadata_items = list(test_file.IterateMetadataItems(
+        attribute_names=set(['_kMDItemFileName'])))
+    self.assertEqual(len(metadata_items), 7)
+
+    file_names = [
+        metadata_item.attributes['_kMDItemFileName'].value
+        for metadata_item in metadata_items]
+    self.assertEqual(file_names, [
+        'root', 'Users', 'test', 'Documents', 'file1.txt', 'file2.txt',
+        'Desktop'])
+
+    # Only the most recent version of a record is returned.
+    test_file._record_descriptors.AddRecordDescriptor(
+        2, 1002, 1600000002, 0x6000, 0, 1)
+
+    metadata_items = list(test_file.IterateMetadataItems())
+    identifiers = [metadata_item.identifier for metadata_item in metadata_items]
+    self.assertEqual(identifiers, [1, 3, 4, 5, 6, 7])
+
+    test_file._file_object = None
+
+  def testIteratePaths(self):
+    """Tests the IteratePaths function."""
+    file_object = io.BytesIO(_CreateTestStoreDatabaseData())
+
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+    test_file.ReadFileObject(file_object)
+    test_file._file_object = file_object
+
+    paths = list(test_file.IteratePaths())
+    self.assertEqual(paths, [
+        (2, '/Users'),
+        (3, '/Users/test'),
+        (4, '/Users/test/Documents'),
+        (5, '/Users/test/Documents/file1.txt'),
+        (6, '/Users/test/Documents/file2.txt'),
+        (7, '/Users/test/Desktop')])
+
+    # Only the paths of parents are cached.
+    self.assertEqual(sorted(test_file._paths.keys()), [2, 3, 4])
+
+    path = test_file.GetPathByIdentifier(1)
+    self.assertIsNone(path)
+
+    path = test_file.GetPathByIdentifier(99)
+    self.assertIsNone(path)
+
+    test_file._file_object = None
+
   def testReadFileObject(self):
     """Tests the ReadFileObject function."""
+    file_object = io.BytesIO(_CreateTestStoreDatabaseData())
+
+    test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+    test_file.ReadFileObject(file_object)
+
+    self.assertEqual(test_file.number_of_metadata_items, 7)
+    self.assertEqual(len(test_file._metadata_types), 5)
+    self.assertEqual(len(test_file._metadata_values), 2)
+    self.assertEqual(len(test_file._metadata_lists), 1)
+
+    record_descriptor = test_file._record_descriptors.GetRecordDescriptor(5)
+    self.assertIsNotNone(record_descriptor)
+    self.assertEqual(record_descriptor.page_offset, 0x6000)
+    self.assertEqual(record_descriptor.page_value_offset, 20)
+    self.assertEqual(record_descriptor.parent_identifier, 4)
+
+    # The record pages are not cached when reading the file.
+    self.assertEqual(len(test_file._record_pages_cache), 0)
+    self.assertEqual(test_file._record_pages_cache_size, 0)
+
+  def testReadFileObjectWithIndexCache(self):
+    """Tests the ReadFileObject function with an index cache."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      test_file_path = os.path.join(temporary_directory, 'store.db')
+      with open(test_file_path, 'wb') as file_object:
+        file_object.write(_CreateTestStoreDatabaseData())
+
+      index_cache_path = os.path.join(temporary_directory, 'store.db.idx')
+
+      test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile(
+          index_cache_path=index_cache_path)
+      test_file.Open(test_file_path)
+
+      try:
+        expected_metadata_item = test_file.GetMetadataItemByIdentifier(6)
+      finally:
+        test_file.Close()
+
+      self.assertTrue(os.path.exists(index_cache_path))
+
+      test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile(
+          index_cache_path=index_cache_path)
+
+      # The property and record pages are not read when using the index cache.
+      test_file._ReadPropertyPages = None
+      test_file._ReadRecordPages = None
+
+      test_file.Open(test_file_path)
+
+      try:
+        self.assertEqual(test_file.number_of_metadata_items, 7)
+
+        record_descriptor = test_file._record_descriptors.GetRecordDescriptor(
+            5)
+        self.assertIsNotNone(record_descriptor)
+        self.assertEqual(record_descriptor.item_identifier, 1005)
+        self.assertEqual(record_descriptor.last_update_time, 1600000005)
+        self.assertEqual(record_descriptor.page_offset, 0x6000)
+        self.assertEqual(record_descriptor.page_value_offset, 20)
+        self.assertEqual(record_descriptor.parent_identifier, 4)
+
+        metadata_item = test_file.GetMetadataItemByIdentifier(6)
+      finally:
+        test_file.Close()
+
+      self.assertIsNotNone(metadata_item)
+      self.assertEqual(
+          {name: metadata_attribute.value for name, metadata_attribute in (
+              metadata_item.attributes.items())},
+          {name: metadata_attribute.value for name, metadata_attribute in (
+              expected_metadata_item.attributes.items())})
+
+      # An index cache of another file is not used.
+      test_file = spotlight_storedb.AppleSpotlightStoreDatabaseFile()
+      result = test_file._ReadIndexCache(index_cache_path, [0])
+      self.assertFalse(result)
+      self.assertEqual(test_file.number_of_metadata_items, 0)
+
+  def testReadFileObjectWithTestFile(self):
+    """Tests the ReadFileObject function with a test file."""
     test_file_path = self._GetTestFilePath(['store.db'])
     self._SkipIfPathNotExists(test_file_path)
 
@@ -1,8 +1,15 @@
 # -*- coding: utf-8 -*-
 """Tests for Apple Unified Logging and Activity Tracing files."""
 
+import multiprocessing
+import os
+import shutil
+import struct
+import tempfile
 import unittest
+import uuid
 
+from dtformats import errors
 from dtformats import unified_logging
 
 from tests import test_lib
@@ -44,6 +51,7 @@ class DSCFileTest(test_lib.BaseTestCase):
       ranges = list(test_file._ReadRangeDescriptors(file_object, 16, 1, 252))
 
     self.assertEqual(len(ranges), 252)
+    self.assertEqual(ranges[64].data_offset, 792393)
     self.assertEqual(ranges[64].range_offset, 1756712)
     self.assertEqual(ranges[64].range_size, 3834)
 
@@ -55,7 +63,8 @@ class DSCFileTest(test_lib.BaseTestCase):
       ranges = list(test_file._ReadRangeDescriptors(file_object, 16, 2, 263))
 
     self.assertEqual(len(ranges), 263)
-    self.assertEqual(ranges[10].range_offset, 64272)
+    self.assertEqual(ranges[10].data_offset, 64272)
+    self.assertEqual(ranges[10].range_offset, 194710)
     self.assertEqual(ranges[10].range_size, 39755)
 
   def testReadUUIDPath(self):
@@ -122,6 +131,464 @@ class DSCFileTest(test_lib.BaseTestCase):
     test_file.Close()
 
 
+class FormatStringResolverTest(test_lib.BaseTestCase):
+  """Format string resolver tests."""
+
+  # pylint: disable=protected-access
+
+  def testGetIndex(self):
+    """Tests the _GetIndex function."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      test_resolver = unified_logging.FormatStringResolver(temporary_directory)
+
+      try:
+        test_file_path = os.path.join(temporary_directory, 'corrupt')
+        with open(test_file_path, 'wb') as file_object:
+          file_object.write(struct.pack('<4sHHII', b'hcsd', 2, 0, 1000, 0))
+
+        with self.assertLogs(level='WARNING'):
+          index = test_resolver._GetIndex(
+              test_file_path, test_resolver._IndexDSCFile)
+
+        self.assertIsNone(index)
+        self.assertIn(test_file_path, test_resolver._indexes)
+
+        # The failure is cached and the file is not indexed again.
+        index = test_resolver._GetIndex(test_file_path, None)
+        self.assertIsNone(index)
+
+        format_string = test_resolver._GetString(
+            test_file_path, test_resolver._IndexDSCFile, 0x100)
+        self.assertIsNone(format_string)
+
+      finally:
+        test_resolver.Close()
+
+  def testGetMappedFileData(self):
+    """Tests the _GetMappedFileData function."""
+    test_path = self._GetTestFilePath(['uuidtext'])
+    self._SkipIfPathNotExists(test_path)
+
+    test_resolver = unified_logging.FormatStringResolver(
+        test_path, maximum_number_of_mapped_files=1)
+
+    try:
+      test_file_path = self._GetTestFilePath([
+          'uuidtext', '22', '0D3C2953A33917B333DD8366AC25F2'])
+      file_data = test_resolver._GetMappedFileData(test_file_path)
+      self.assertIsNotNone(file_data)
+      self.assertEqual(len(file_data), 33)
+
+      test_file_path = self._GetTestFilePath([
+          'uuidtext', '00', '7EF56328D53A78B59CCCE3E3189F57'])
+      file_data = test_resolver._GetMappedFileData(test_file_path)
+      self.assertIsNotNone(file_data)
+      self.assertEqual(len(test_resolver._mapped_files), 1)
+
+      test_file_path = self._GetTestFilePath(['uuidtext', 'bogus'])
+      file_data = test_resolver._GetMappedFileData(test_file_path)
+      self.assertIsNone(file_data)
+
+    finally:
+      test_resolver.Close()
+
+  def testIndexDSCFile(self):
+    """Tests the _IndexDSCFile function."""
+    test_resolver = unified_logging.FormatStringResolver('')
+
+    for filename, expected_range in (
+        ('dsc-version1', (0x980, 9536, 12311)),
+        ('dsc-version2', (0x9e0, 12728, 15459))):
+      test_file_path = self._GetTestFilePath(['uuidtext', 'dsc', filename])
+      self._SkipIfPathNotExists(test_file_path)
+
+      with open(test_file_path, 'rb') as file_object:
+        file_data = file_object.read()
+
+      ranges = test_resolver._IndexDSCFile(file_data, test_file_path)
+      self.assertEqual(ranges[0], expected_range)
+
+      range_offset, data_offset, _ = ranges[0]
+      self.assertEqual(file_data[data_offset:data_offset + 15], (
+          b'cc.debug.enable'))
+
+    with self.assertRaises(errors.ParseError):
+      test_resolver._IndexDSCFile(b'hcsd', 'test')
+
+  def testGetDSCFormatString(self):
+    """Tests the GetDSCFormatString function."""
+    test_path = self._GetTestFilePath(['uuidtext'])
+    self._SkipIfPathNotExists(test_path)
+
+    test_resolver = unified_logging.FormatStringResolver(test_path)
+
+    try:
+      dsc_uuid = uuid.UUID('8e21cab1-dcf9-36b4-9f85-cf860e6f34ec')
+
+      format_string = test_resolver.GetDSCFormatString(dsc_uuid, 0x48a40)
+      self.assertEqual(format_string, '%s Unknown app vocabulary type - %@')
+
+      format_string = test_resolver.GetDSCFormatString(dsc_uuid, 0x100)
+      self.assertIsNone(format_string)
+
+      dsc_uuid = uuid.UUID('00000000-0000-0000-0000-000000000000')
+
+      format_string = test_resolver.GetDSCFormatString(dsc_uuid, 0x48a40)
+      self.assertIsNone(format_string)
+
+    finally:
+      test_resolver.Close()
+
+  def testGetUUIDTextFormatString(self):
+    """Tests the GetUUIDTextFormatString function."""
+    test_path = self._GetTestFilePath(['uuidtext'])
+    self._SkipIfPathNotExists(test_path)
+
+    test_resolver = unified_logging.FormatStringResolver(test_path)
+
+    try:
+      uuidtext_uuid = uuid.UUID('007ef563-28d5-3a78-b59c-cce3e3189f57')
+
+      format_string = test_resolver.GetUUIDTextFormatString(
+          uuidtext_uuid, 21905)
+      self.assertEqual(format_string, 'system.install.apple-software')
+
+      format_string = test_resolver.GetUUIDTextFormatString(
+          uuidtext_uuid, 21905 + 30)
+      self.assertEqual(
+          format_string, 'system.install.apple-software.standard-user')
+
+      format_string = test_resolver.GetUUIDTextFormatString(
+          uuidtext_uuid, 21905 + 864)
+      self.assertIsNone(format_string)
+
+    finally:
+      test_resolver.Close()
+
+
+class LogArchiveTest(test_lib.BaseTestCase):
+  """Apple Unified Logging and Activity Tracing log archive tests."""
+
+  # pylint: disable=protected-access
+
+  _FORMAT_STRING = b'Test format string: %s\x00'
+
+  def _CreateTestLogArchive(self, path):
+    """Creates a test log archive.
+
+    The log archive contains the same tracev3 file in the Persist and Special
+    sub directories and an uuidtext file of the main executable.
+
+    Args:
+      path (str): path of the log archive.
+    """
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    for directory_name in ('Persist', 'Special'):
+      os.mkdir(os.path.join(path, directory_name))
+      shutil.copyfile(test_file_path, os.path.join(
+          path, directory_name, '0000000000000030.tracev3'))
+
+    os.mkdir(os.path.join(path, '10'))
+
+    uuidtext_data = b''.join([
+        struct.pack('<IIII', 0x66778899, 2, 1, 1),
+        struct.pack('<II', 0x0035a710, len(self._FORMAT_STRING)),
+        self._FORMAT_STRING])
+
+    uuidtext_file_path = os.path.join(
+        path, '10', '1674443A9A33FCAF11D0ADEBBF5B95')
+    with open(uuidtext_file_path, 'wb') as file_object:
+      file_object.write(uuidtext_data)
+
+  def testGetTraceV3FilePaths(self):
+    """Tests the _GetTraceV3FilePaths function."""
+    test_archive = unified_logging.LogArchive()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      self._CreateTestLogArchive(temporary_directory)
+
+      tracev3_file_paths = test_archive._GetTraceV3FilePaths(
+          temporary_directory)
+
+    self.assertEqual(tracev3_file_paths, [
+        os.path.join(
+            temporary_directory, 'Persist', '0000000000000030.tracev3'),
+        os.path.join(
+            temporary_directory, 'Special', '0000000000000030.tracev3')])
+
+  def testIterateEntries(self):
+    """Tests the IterateEntries function."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      self._CreateTestLogArchive(temporary_directory)
+
+      test_archive = unified_logging.LogArchive()
+      test_archive.Open(temporary_directory)
+
+      try:
+        self.assertEqual(test_archive.number_of_tracev3_files, 2)
+
+        log_archive_entries = list(test_archive.IterateEntries())
+
+      finally:
+        test_archive.Close()
+
+    self.assertEqual(len(log_archive_entries), 10)
+
+    wall_clock_times = [
+        log_archive_entry.wall_clock_time
+        for log_archive_entry in log_archive_entries]
+    self.assertEqual(wall_clock_times, sorted(wall_clock_times))
+
+    log_archive_entry = log_archive_entries[0]
+    self.assertEqual(log_archive_entry.format_string, 'Test format string: %s')
+    self.assertEqual(log_archive_entry.path, os.path.join(
+        'Persist', '0000000000000030.tracev3'))
+    self.assertEqual(log_archive_entry.wall_clock_time, 1548580686335680594)
+
+    log_archive_entry = log_archive_entries[1]
+    self.assertEqual(log_archive_entry.format_string, 'Test format string: %s')
+    self.assertEqual(log_archive_entry.path, os.path.join(
+        'Special', '0000000000000030.tracev3'))
+
+    log_archive_entry = log_archive_entries[2]
+    self.assertIsNone(log_archive_entry.format_string)
+
+  def testIterateEntriesWithCorruptUUIDTextFile(self):
+    """Tests the IterateEntries function with a corrupt uuidtext file."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      self._CreateTestLogArchive(temporary_directory)
+
+      uuidtext_file_path = os.path.join(
+          temporary_directory, '10', '1674443A9A33FCAF11D0ADEBBF5B95')
+      with open(uuidtext_file_path, 'wb') as file_object:
+        file_object.write(struct.pack('<IIII', 0x66778899, 2, 1, 1000))
+
+      test_archive = unified_logging.LogArchive()
+      test_archive.Open(temporary_directory)
+
+      try:
+        with self.assertLogs(level='WARNING'):
+          log_archive_entries = list(test_archive.IterateEntries())
+
+      finally:
+        test_archive.Close()
+
+    self.assertEqual(len(log_archive_entries), 10)
+
+    for log_archive_entry in log_archive_entries:
+      self.assertIsNone(log_archive_entry.format_string)
+
+  def testIterateEntriesWithOutOfOrderFirehoseChunks(self):
+    """Tests the IterateEntries function with out of order firehose chunks."""
+    chunk_set_data = []
+    for continuous_time in (435700000000, 435600000000):
+      firehose_data = b''.join([
+          struct.pack(
+              '<QIIHHHHQ', 100, 101, 0, 16 + 24 + 3, 0x1000, 0, 0,
+              continuous_time),
+          struct.pack('<BBHIQIHH', 4, 0, 0, 0x1234, 42, 0, 0, 3), b'abc'])
+
+      chunk_set_data.extend([
+          struct.pack('<IIII', 0x6001, 0, len(firehose_data), 0),
+          firehose_data, b'\x00' * (-len(firehose_data) % 8)])
+
+    chunk_set_data = b''.join(chunk_set_data)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      self._CreateTestLogArchive(temporary_directory)
+
+      test_archive = unified_logging.LogArchive()
+      test_archive.Open(temporary_directory)
+
+      try:
+        _, tracev3_file = test_archive._tracev3_files[0]
+        tracev3_file._DecompressChunkSetData = (
+            lambda chunk_data, file_offset: chunk_set_data)
+
+        log_archive_entries = list(test_archive.IterateEntries())
+
+      finally:
+        test_archive.Close()
+
+    self.assertEqual(len(log_archive_entries), 7)
+
+    wall_clock_times = [
+        log_archive_entry.wall_clock_time
+        for log_archive_entry in log_archive_entries]
+    self.assertEqual(wall_clock_times, sorted(wall_clock_times))
+
+    continuous_times = [
+        log_archive_entry.firehose_tracepoint.continuous_time
+        for log_archive_entry in log_archive_entries
+        if log_archive_entry.path.startswith('Persist')]
+    self.assertEqual(continuous_times, [435600000000, 435700000000])
+
+  def testIterateEntriesWithTimeRange(self):
+    """Tests the IterateEntries function with a time range."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      self._CreateTestLogArchive(temporary_directory)
+
+      test_archive = unified_logging.LogArchive()
+      test_archive.Open(temporary_directory)
+
+      try:
+        continuous_times = [
+            log_archive_entry.firehose_tracepoint.continuous_time
+            for log_archive_entry in test_archive.IterateEntries(
+                start_time=1548580686381242310, end_time=1548580686381299410)]
+
+      finally:
+        test_archive.Close()
+
+    self.assertEqual(continuous_times, [
+        435709527991, 435709527991, 435709585091, 435709585091])
+
+  def testIterateEntriesWithTimeRangeAndDifferentHeaders(self):
+    """Tests the IterateEntries function with different header times."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      self._CreateTestLogArchive(temporary_directory)
+
+      test_archive = unified_logging.LogArchive()
+      test_archive.Open(temporary_directory)
+
+      try:
+        # Move the wall clock time of the tracepoints of the tracev3 file in
+        # the Special sub directory back by 23913959 nanoseconds.
+        _, tracev3_file = test_archive._tracev3_files[1]
+        tracev3_file.header.continuous_time += 23913959
+
+        log_archive_entries = [
+            (log_archive_entry.path[:7],
+             log_archive_entry.firehose_tracepoint.continuous_time)
+            for log_archive_entry in test_archive.IterateEntries(
+                start_time=1548580686357328351, end_time=1548580686381242310)]
+
+      finally:
+        test_archive.Close()
+
+    self.assertEqual(log_archive_entries, [
+        ('Persist', 435685614032), ('Special', 435709527991),
+        ('Special', 435709585091), ('Persist', 435709527991)])
+
+  def testIterateEntriesWithWorkers(self):
+    """Tests the IterateEntries function with worker processes."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      self._CreateTestLogArchive(temporary_directory)
+
+      test_archive = unified_logging.LogArchive()
+      test_archive.Open(temporary_directory)
+
+      try:
+        expected_entries = [
+            (log_archive_entry.path, log_archive_entry.wall_clock_time,
+             log_archive_entry.format_string)
+            for log_archive_entry in test_archive.IterateEntries()]
+
+      finally:
+        test_archive.Close()
+
+      test_archive = unified_logging.LogArchive(number_of_workers=2)
+      test_archive.Open(temporary_directory)
+
+      try:
+        log_archive_entries = [
+            (log_archive_entry.path, log_archive_entry.wall_clock_time,
+             log_archive_entry.format_string)
+            for log_archive_entry in test_archive.IterateEntries()]
+
+      finally:
+        test_archive.Close()
+
+    self.assertEqual(len(log_archive_entries), 10)
+    self.assertEqual(log_archive_entries, expected_entries)
+
+  def testOpenWithIndexCache(self):
+    """Tests the Open function with an index cache directory."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      self._CreateTestLogArchive(temporary_directory)
+
+      index_cache_path = os.path.join(temporary_directory, 'index_cache')
+      os.mkdir(index_cache_path)
+
+      test_archive = unified_logging.LogArchive(
+          index_cache_path=index_cache_path)
+      test_archive.Open(temporary_directory)
+      test_archive.Close()
+
+      self.assertEqual(sorted(os.listdir(index_cache_path)), [
+          'Persist_0000000000000030.tracev3.idx',
+          'Special_0000000000000030.tracev3.idx'])
+
+      test_archive = unified_logging.LogArchive(
+          index_cache_path=os.path.join(temporary_directory, 'bogus'))
+
+      with self.assertRaises(IOError):
+        test_archive.Open(temporary_directory)
+
+  def testOpenClose(self):
+    """Tests the Open and Close functions."""
+    test_archive = unified_logging.LogArchive()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      self._CreateTestLogArchive(temporary_directory)
+
+      test_archive.Open(temporary_directory)
+
+      with self.assertRaises(IOError):
+        test_archive.Open(temporary_directory)
+
+      test_archive.Close()
+
+      self.assertEqual(test_archive.number_of_tracev3_files, 0)
+
+      test_file_path = os.path.join(
+          temporary_directory, 'Persist', '0000000000000030.tracev3')
+      with self.assertRaises(IOError):
+        test_archive.Open(test_file_path)
+
+
+class TraceV3ChunkSetSchedulerTest(test_lib.BaseTestCase):
+  """TraceV3 chunk set scheduler tests."""
+
+  # pylint: disable=protected-access
+
+  def testSubmitAndGetResult(self):
+    """Tests the Submit and GetResult functions."""
+    test_file = unified_logging.TraceV3File()
+
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+
+    try:
+      chunk_offset, chunk_data = next(test_file._IterateChunkSets(
+          test_file._file_object))
+    finally:
+      test_file.Close()
+
+    with multiprocessing.Pool(
+        processes=1,
+        initializer=unified_logging.TraceV3ChunkSetWorker.Initialize) as pool:
+      scheduler = unified_logging.TraceV3ChunkSetScheduler(pool, 1)
+      self.assertTrue(scheduler.has_capacity)
+
+      first_result = scheduler.Submit(chunk_offset, chunk_data)
+      self.assertFalse(scheduler.has_capacity)
+
+      second_result = scheduler.Submit(chunk_offset, chunk_data)
+      self.assertEqual(scheduler.number_of_pending_chunk_sets, 2)
+
+      tracepoints_values = scheduler.GetResult(first_result)
+      self.assertEqual(len(tracepoints_values), 5)
+      self.assertEqual(scheduler.number_of_pending_chunk_sets, 1)
+
+      scheduler.Release(second_result)
+      self.assertTrue(scheduler.has_capacity)
+
+
 class TraceV3FileTest(test_lib.BaseTestCase):
   """Apple Unified Logging and Activity Tracing (tracev3) file tests."""
 
@@ -131,6 +598,87 @@ class TraceV3FileTest(test_lib.BaseTestCase):
   # TODO: add tests for _FormatArrayOfUUIDS
   # TODO: add tests for _FormatStreamAsSignature
 
+  def testDecompressChunkSetData(self):
+    """Tests the _DecompressChunkSetData function."""
+    test_file = unified_logging.TraceV3File()
+
+    chunk_set_data = b''.join([
+        struct.pack('<IIII', 0x6001, 0, 8, 0), b'firehose'])
+
+    # An uncompressed block has an 8-byte header that contains the signature
+    # and the data size.
+    compressed_data = b''.join([
+        b'bv4-', struct.pack('<I', len(chunk_set_data)), chunk_set_data,
+        b'bv4$'])
+
+    uncompressed_data = test_file._DecompressChunkSetData(
+        compressed_data, 0x1a8)
+    self.assertEqual(bytes(uncompressed_data), chunk_set_data)
+
+    with self.assertRaises(errors.ParseError):
+      test_file._DecompressChunkSetData(compressed_data[:-4], 0x1a8)
+
+  def testIterateChunkSets(self):
+    """Tests the _IterateChunkSets function."""
+    test_file = unified_logging.TraceV3File()
+
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+
+    try:
+      chunk_sets = list(test_file._IterateChunkSets(test_file._file_object))
+      self.assertEqual(len(chunk_sets), 1)
+
+      chunk_offset, chunk_data = chunk_sets[0]
+      self.assertEqual(chunk_offset, 0x1a8)
+      self.assertEqual(len(chunk_data), 498)
+
+      chunk_sets = list(test_file._IterateChunkSets(
+          test_file._file_object, start_time=435700000000,
+          end_time=435700000001))
+      self.assertEqual(len(chunk_sets), 1)
+
+      chunk_sets = list(test_file._IterateChunkSets(
+          test_file._file_object, start_time=435760861360))
+      self.assertEqual(len(chunk_sets), 0)
+
+      chunk_sets = list(test_file._IterateChunkSets(
+          test_file._file_object, end_time=435663966274))
+      self.assertEqual(len(chunk_sets), 0)
+
+    finally:
+      test_file.Close()
+
+  def testIterateFirehoseTracepoints(self):
+    """Tests the _IterateFirehoseTracepoints function."""
+    test_file = unified_logging.TraceV3File()
+
+    firehose_data = b''.join([
+        struct.pack('<QIIHHHHQ', 100, 101, 0, 16 + 24 + 3, 0x1000, 0, 0, 5000),
+        struct.pack('<BBHIQIHH', 4, 0, 0x0602, 0x1234, 42, 7, 1, 3), b'abc'])
+
+    chunk_set_data = b''.join([
+        struct.pack('<IIII', 0x6001, 0, len(firehose_data), 0),
+        firehose_data])
+
+    firehose_tracepoints = list(test_file._IterateFirehoseTracepoints(
+        0x1a8, chunk_set_data))
+    self.assertEqual(len(firehose_tracepoints), 1)
+
+    firehose_tracepoint = firehose_tracepoints[0]
+    self.assertEqual(firehose_tracepoint.chunk_offset, 0x1a8)
+    self.assertEqual(firehose_tracepoint.continuous_time, 5000 + (1 << 32) + 7)
+    self.assertEqual(bytes(firehose_tracepoint.data), b'abc')
+    self.assertEqual(firehose_tracepoint.format_string_location, 0x1234)
+    self.assertEqual(firehose_tracepoint.process_identifier1, 100)
+    self.assertEqual(firehose_tracepoint.process_identifier2, 101)
+    self.assertEqual(firehose_tracepoint.thread_identifier, 42)
+
+    with self.assertRaises(errors.ParseError):
+      list(test_file._IterateFirehoseTracepoints(0x1a8, chunk_set_data[:-1]))
+
   def testReadChunkHeader(self):
     """Tests the _ReadChunkHeader function."""
     output_writer = test_lib.TestOutputWriter()
@@ -142,9 +690,232 @@ class TraceV3FileTest(test_lib.BaseTestCase):
     with open(test_file_path, 'rb') as file_object:
       test_file._ReadChunkHeader(file_object, 0)
 
-  # TODO: add tests for _ReadCatalog
+  def testReadHeader(self):
+    """Tests the _ReadHeader function."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = unified_logging.TraceV3File(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      header = test_file._ReadHeader(file_object, 16)
+
+    self.assertEqual(header.timebase_numerator, 1)
+    self.assertEqual(header.timebase_denominator, 1)
+    self.assertEqual(header.continuous_time, 3207632681)
+    self.assertEqual(header.wall_clock_time, 1548580253)
+    self.assertEqual(header.wall_clock_time_microseconds, 879347)
+    self.assertEqual(header.time_zone_offset, -60)
+
+  def testReadCatalog(self):
+    """Tests the _ReadCatalog function."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = unified_logging.TraceV3File(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      chunk_header = test_file._ReadChunkHeader(file_object, 0xe0)
+      catalog = test_file._ReadCatalog(file_object, 0xf0, chunk_header)
+
+    self.assertEqual(len(catalog.uuids), 2)
+    self.assertEqual(
+        catalog.sub_system_strings[:2], ('com.apple.AssetCache', 'builtin'))
+
+    self.assertEqual(len(catalog.process_information_entries), 1)
+
+    process_information_entry = catalog.process_information_entries[0]
+    self.assertEqual(process_information_entry.process_identifier, 14225)
+    self.assertEqual(process_information_entry.process_identifier1, 14225)
+    self.assertEqual(process_information_entry.process_identifier2, 14226)
+    self.assertEqual(len(process_information_entry.sub_system_entries), 1)
+
+    self.assertEqual(len(catalog.sub_chunks), 1)
+
+    sub_chunk = catalog.sub_chunks[0]
+    self.assertEqual(sub_chunk.start_time, 435663966275)
+    self.assertEqual(sub_chunk.end_time, 435760861359)
+    self.assertEqual(sub_chunk.uncompressed_data_size, 544)
+
   # TODO: add tests for _ReadChunkSet
 
+  def testGetContinuousTime(self):
+    """Tests the GetContinuousTime function."""
+    test_file = unified_logging.TraceV3File()
+
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+
+    try:
+      continuous_time = test_file.GetContinuousTime(1548580686335680594)
+      self.assertEqual(continuous_time, 435663966275)
+
+      test_file.header.timebase_numerator = 125
+      test_file.header.timebase_denominator = 3
+
+      continuous_time = test_file.GetContinuousTime(1548580686335680594)
+      self.assertEqual(continuous_time, 13586584688)
+      self.assertGreaterEqual(
+          test_file.GetWallClockTime(continuous_time), 1548580686335680594)
+      self.assertLess(
+          test_file.GetWallClockTime(continuous_time - 1),
+          1548580686335680594)
+
+      test_file.header = None
+
+      continuous_time = test_file.GetContinuousTime(1548580686335680594)
+      self.assertIsNone(continuous_time)
+
+    finally:
+      test_file.Close()
+
+  def testGetProcessUUIDs(self):
+    """Tests the GetProcessUUIDs function."""
+    test_file = unified_logging.TraceV3File()
+
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+
+    try:
+      firehose_tracepoint = next(test_file.IterateTracepoints())
+
+      main_uuid, dsc_uuid = test_file.GetProcessUUIDs(firehose_tracepoint)
+      self.assertEqual(
+          main_uuid, uuid.UUID('10167444-3a9a-33fc-af11-d0adebbf5b95'))
+      self.assertEqual(
+          dsc_uuid, uuid.UUID('8e21cab1-dcf9-36b4-9f85-cf860e6f34ec'))
+
+      firehose_tracepoint.process_identifier2 = 0
+
+      main_uuid, dsc_uuid = test_file.GetProcessUUIDs(firehose_tracepoint)
+      self.assertIsNone(main_uuid)
+      self.assertIsNone(dsc_uuid)
+
+      firehose_tracepoint.chunk_offset = 0
+
+      main_uuid, dsc_uuid = test_file.GetProcessUUIDs(firehose_tracepoint)
+      self.assertIsNone(main_uuid)
+      self.assertIsNone(dsc_uuid)
+
+    finally:
+      test_file.Close()
+
+  def testGetWallClockTime(self):
+    """Tests the GetWallClockTime function."""
+    test_file = unified_logging.TraceV3File()
+
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+
+    try:
+      wall_clock_time = test_file.GetWallClockTime(435663966275)
+      self.assertEqual(wall_clock_time, 1548580686335680594)
+
+      test_file.header = None
+
+      wall_clock_time = test_file.GetWallClockTime(435663966275)
+      self.assertIsNone(wall_clock_time)
+
+    finally:
+      test_file.Close()
+
+  def testIterateTracepoints(self):
+    """Tests the IterateTracepoints function."""
+    test_file = unified_logging.TraceV3File()
+
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+
+    try:
+      firehose_tracepoints = list(test_file.IterateTracepoints())
+    finally:
+      test_file.Close()
+
+    self.assertEqual(len(firehose_tracepoints), 5)
+
+    firehose_tracepoint = firehose_tracepoints[0]
+    self.assertEqual(firehose_tracepoint.chunk_offset, 0x1a8)
+    self.assertEqual(firehose_tracepoint.continuous_time, 435663966275)
+    self.assertEqual(len(firehose_tracepoint.data), 57)
+    self.assertEqual(firehose_tracepoint.flags, 0x0602)
+    self.assertEqual(firehose_tracepoint.format_string_location, 0x0035a710)
+    self.assertEqual(firehose_tracepoint.process_identifier1, 14225)
+    self.assertEqual(firehose_tracepoint.process_identifier2, 14226)
+    self.assertEqual(firehose_tracepoint.thread_identifier, 28030)
+
+    firehose_tracepoint = firehose_tracepoints[4]
+    self.assertEqual(firehose_tracepoint.thread_identifier, 28058)
+    self.assertEqual(len(firehose_tracepoint.data), 29)
+
+  def testIterateTracepointsWithTimeRange(self):
+    """Tests the IterateTracepoints function with a time range."""
+    test_file = unified_logging.TraceV3File()
+
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+
+    try:
+      continuous_times = [
+          firehose_tracepoint.continuous_time
+          for firehose_tracepoint in test_file.IterateTracepoints(
+              start_time=435685614032, end_time=435709585091)]
+      self.assertEqual(continuous_times, [
+          435685614032, 435709527991, 435709585091])
+
+      continuous_times = [
+          firehose_tracepoint.continuous_time
+          for firehose_tracepoint in test_file.IterateTracepoints(
+              number_of_workers=2, start_time=435709527991)]
+      self.assertEqual(continuous_times, [
+          435709527991, 435709585091, 435760861359])
+
+      # The chunk set is not decompressed if it does not overlap.
+      test_file._DecompressChunkSetData = None
+
+      firehose_tracepoints = list(test_file.IterateTracepoints(
+          end_time=435663966274))
+      self.assertEqual(firehose_tracepoints, [])
+
+    finally:
+      test_file.Close()
+
+  def testIterateTracepointsWithWorkers(self):
+    """Tests the IterateTracepoints function with worker processes."""
+    test_file = unified_logging.TraceV3File()
+
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_file.Open(test_file_path)
+
+    try:
+      expected_tracepoints = [
+          (firehose_tracepoint.continuous_time, bytes(firehose_tracepoint.data))
+          for firehose_tracepoint in test_file.IterateTracepoints()]
+
+      firehose_tracepoints = [
+          (firehose_tracepoint.continuous_time, bytes(firehose_tracepoint.data))
+          for firehose_tracepoint in test_file.IterateTracepoints(
+              number_of_workers=2)]
+
+    finally:
+      test_file.Close()
+
+    self.assertEqual(len(firehose_tracepoints), 5)
+    self.assertEqual(firehose_tracepoints, expected_tracepoints)
+
   def testReadFileObject(self):
     """Tests the ReadFileObject function."""
     output_writer = test_lib.TestOutputWriter()
@@ -155,8 +926,70 @@ class TraceV3FileTest(test_lib.BaseTestCase):
     self._SkipIfPathNotExists(test_file_path)
 
     test_file.Open(test_file_path)
+
+    self.assertEqual(len(test_file.catalogs), 1)
+    self.assertEqual(len(test_file.chunk_sets), 1)
+
+    chunk_set = test_file.chunk_sets[0]
+    self.assertEqual(chunk_set.chunk_data_size, 498)
+    self.assertEqual(chunk_set.chunk_offset, 0x1a8)
+    self.assertEqual(chunk_set.end_time, 435760861359)
+    self.assertEqual(chunk_set.start_time, 435663966275)
+
     test_file.Close()
 
+  def testReadFileObjectWithIndexCache(self):
+    """Tests the ReadFileObject function with an index cache."""
+    test_file_path = self._GetTestFilePath(['0000000000000030.tracev3'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      temporary_file_path = os.path.join(
+          temporary_directory, '0000000000000030.tracev3')
+      shutil.copyfile(test_file_path, temporary_file_path)
+
+      index_cache_path = os.path.join(
+          temporary_directory, '0000000000000030.tracev3.idx')
+
+      test_file = unified_logging.TraceV3File(
+          index_cache_path=index_cache_path)
+      test_file.Open(temporary_file_path)
+      test_file.Close()
+
+      self.assertTrue(os.path.exists(index_cache_path))
+
+      test_file = unified_logging.TraceV3File(
+          index_cache_path=index_cache_path)
+
+      # The chunk headers are only read for the header and catalogs when using
+      # the index cache.
+      read_chunk_header = test_file._ReadChunkHeader
+      chunk_header_offsets = []
+
+      def _ReadChunkHeader(file_object, file_offset):
+        chunk_header_offsets.append(file_offset)
+        return read_chunk_header(file_object, file_offset)
+
+      test_file._ReadChunkHeader = _ReadChunkHeader
+
+      test_file.Open(temporary_file_path)
+
+      try:
+        self.assertEqual(chunk_header_offsets, [0, 0xe0])
+        self.assertEqual(len(test_file.catalogs), 1)
+        self.assertEqual(len(test_file.chunk_sets), 1)
+
+        chunk_set = test_file.chunk_sets[0]
+        self.assertEqual(chunk_set.chunk_offset, 0x1a8)
+        self.assertEqual(chunk_set.end_time, 435760861359)
+        self.assertEqual(chunk_set.start_time, 435663966275)
+
+        firehose_tracepoints = list(test_file.IterateTracepoints())
+        self.assertEqual(len(firehose_tracepoints), 5)
+
+      finally:
+        test_file.Close()
+
 
 class UUIDTextFileTest(test_lib.BaseTestCase):
   """Apple Unified Logging and Activity Tracing (uuidtext) file tests."""
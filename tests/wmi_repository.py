@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 """Tests for WMI Common Information Model (CIM) repository files."""
 
+import io
+import multiprocessing
 import os
+import types
 import unittest
 
 from dtformats import wmi_repository
@@ -14,6 +17,80 @@ from tests import test_lib
 # TODO: add tests for ObjectsDataPage
 
 
+def _CreateTestClassDefinition():
+  """Creates a class definition for testing.
+
+  Returns:
+    ClassDefinition: class definition.
+  """
+  class_definition = wmi_repository.ClassDefinition()
+  class_definition.name = 'MyClass'
+
+  for index, (name, data_type, offset, type_qualifier) in enumerate([
+      ('Name', 0x00000008, 0, 'string'),
+      ('Count', 0x00000013, 4, 'uint32'),
+      ('Enabled', 0x0000000b, 8, 'boolean')]):
+    class_definition_property = wmi_repository.ClassDefinitionProperty()
+    class_definition_property.index = index
+    class_definition_property.name = name
+    class_definition_property.qualifiers = {'type': type_qualifier}
+    class_definition_property.value_data_offset = offset
+    class_definition_property.value_data_type = data_type
+
+    class_definition.properties[name] = class_definition_property
+
+  return class_definition
+
+
+class ClassValueDataMapTest(test_lib.BaseTestCase):
+  """Class value data map tests."""
+
+  def testBuild(self):
+    """Tests the Build function."""
+    class_value_data_map = wmi_repository.ClassValueDataMap()
+    class_value_data_map.Build([_CreateTestClassDefinition()])
+
+    self.assertEqual(class_value_data_map.class_name, 'MyClass')
+    self.assertEqual(len(class_value_data_map.properties), 3)
+    self.assertEqual(class_value_data_map.properties_size, 10)
+    self.assertEqual(class_value_data_map.property_state_bits_size, 1)
+    self.assertIsNotNone(class_value_data_map.property_values_struct)
+    self.assertEqual(class_value_data_map.property_values_struct.size, 10)
+
+
+class InstanceTest(test_lib.BaseTestCase):
+  """Instance tests."""
+
+  _INSTANCE_BLOCK_DATA = bytes(bytearray([
+      0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x09, 0x00, 0x00, 0x00, 0x39, 0x30,
+      0x00, 0x00, 0xff, 0xff, 0x04, 0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00,
+      0x00, 0x00, 0x4d, 0x79, 0x43, 0x6c, 0x61, 0x73, 0x73, 0x00, 0x00, 0x66,
+      0x6f, 0x6f, 0x00]))
+
+  def testReadInstanceBlockData(self):
+    """Tests the ReadInstanceBlockData function."""
+    class_value_data_map = wmi_repository.ClassValueDataMap()
+    class_value_data_map.Build([_CreateTestClassDefinition()])
+
+    expected_properties = {'Count': 12345, 'Enabled': True, 'Name': 'foo'}
+
+    instance = wmi_repository.Instance()
+    instance.ReadInstanceBlockData(
+        class_value_data_map, self._INSTANCE_BLOCK_DATA)
+
+    self.assertEqual(instance.class_name, 'MyClass')
+    self.assertEqual(instance.properties, expected_properties)
+
+    # Test without the compiled property values structure.
+    output_writer = test_lib.TestOutputWriter()
+    instance = wmi_repository.Instance(debug=True, output_writer=output_writer)
+    instance.ReadInstanceBlockData(
+        class_value_data_map, self._INSTANCE_BLOCK_DATA)
+
+    self.assertEqual(instance.class_name, 'MyClass')
+    self.assertEqual(instance.properties, expected_properties)
+
+
 class IndexBinaryTreeFileTest(test_lib.BaseTestCase):
   """Index binary-tree (Index.btr) file tests."""
 
@@ -106,6 +183,20 @@ class MappingFileTest(test_lib.BaseTestCase):
 
       test_file._ReadUnknownTable(file_object)
 
+  def testReadFileHeaderAndFooter(self):
+    """Tests the ReadFileHeaderAndFooter function."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = wmi_repository.MappingFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['cim', 'MAPPING1.MAP'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      test_file.ReadFileHeaderAndFooter(file_object)
+
+    self.assertEqual(test_file.format_version, 1)
+    self.assertEqual(test_file.sequence_number, 8592)
+
   def testReadFileObject(self):
     """Tests the ReadFileObject."""
     output_writer = test_lib.TestOutputWriter()
@@ -122,12 +213,38 @@ class MappingFileTest(test_lib.BaseTestCase):
 class ObjectsDataFileTest(test_lib.BaseTestCase):
   """Index binary-tree (Index.btr) file tests."""
 
+  # pylint: disable=protected-access
+
   # TODO: add tests _GetKeyValues
   # TODO: add tests _GetPage
   # TODO: add tests _ReadPage
   # TODO: add tests GetMappedPage
   # TODO: add tests GetObjectRecordByKey
 
+  def testReadObjectRecordData(self):
+    """Tests the ReadObjectRecordData function."""
+    mapping_table = wmi_repository.MappingTable(types.SimpleNamespace(entries=[
+        types.SimpleNamespace(page_number=page_number)
+        for page_number in (1, 2, 4, 5)]))
+
+    data = b''.join([bytes([page_number]) * 8192 for page_number in range(6)])
+
+    test_file = wmi_repository.ObjectsDataFile()
+    test_file._file_object = io.BytesIO(data)
+
+    # Test object record data in a single page.
+    object_record_data = test_file.ReadObjectRecordData(
+        mapping_table, 0, 100, 200)
+    self.assertEqual(object_record_data, b'\x01' * 200)
+
+    # Test object record data in physically contiguous and non-contiguous
+    # pages.
+    object_record_data = test_file.ReadObjectRecordData(
+        mapping_table, 0, 100, 3 * 8192)
+    self.assertEqual(len(object_record_data), 3 * 8192)
+    self.assertEqual(object_record_data, b''.join([
+        b'\x01' * 8092, b'\x02' * 8192, b'\x04' * 8192, b'\x05' * 100]))
+
   def testReadFileObject(self):
     """Tests the ReadFileObject."""
     test_file_path = self._GetTestFilePath(['cim', 'OBJECTS.MAP'])
@@ -143,7 +260,510 @@ class ObjectsDataFileTest(test_lib.BaseTestCase):
     test_file.Open(test_file_path)
 
 
-# TODO: add tests for CIMRepository
+class RepositoryFileTest(test_lib.BaseTestCase):
+  """Repository file tests."""
+
+  # pylint: disable=protected-access
+
+  _REPOSITORY_FILE_DATA = bytes(bytearray([
+      0x01, 0x00, 0x00, 0x00, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+      0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+      0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+      0x40, 0x00, 0x00, 0x00, 0x0c, 0x00, 0x00, 0x00, 0x61, 0x61, 0x61, 0x61,
+      0x61, 0x61, 0x61, 0x61, 0x0c, 0x00, 0x00, 0x00, 0x62, 0x62, 0x62, 0x62,
+      0x62, 0x62, 0x62, 0x62, 0x00, 0x10, 0x00, 0x00, 0x08, 0x00, 0x00, 0x00,
+      0x63, 0x63, 0x63, 0x63, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]))
+
+  def testGetNodeCellOffset(self):
+    """Tests the _GetNodeCellOffset function."""
+    file_object = io.BytesIO(self._REPOSITORY_FILE_DATA)
+
+    test_file = wmi_repository.RepositoryFile()
+    test_file.ReadFileObject(file_object)
+
+    self.assertEqual(test_file._GetNodeCellOffset(file_object, 0), 40)
+    self.assertEqual(test_file._GetNodeCellOffset(file_object, 2), 68)
+    self.assertIsNone(test_file._GetNodeCellOffset(file_object, 3))
+
+  def testReadNodeAtOffset(self):
+    """Tests the _ReadNodeAtOffset function."""
+    file_object = io.BytesIO(self._REPOSITORY_FILE_DATA)
+
+    test_file = wmi_repository.RepositoryFile()
+    test_file.ReadFileObject(file_object)
+
+    node_values = []
+
+    def _ReadNode(block_data, file_offset):
+      node_values.append((block_data, file_offset))
+      return file_offset
+
+    node = test_file._ReadNodeAtOffset(file_object, 72, _ReadNode)
+    self.assertEqual(node, 72)
+    self.assertEqual(node_values, [(b'cccc', 72)])
+
+  def testReadNodeCell(self):
+    """Tests the _ReadNodeCell function."""
+    file_object = io.BytesIO(self._REPOSITORY_FILE_DATA)
+
+    test_file = wmi_repository.RepositoryFile()
+    test_file.ReadFileObject(file_object)
+
+    node_cell = test_file._ReadNodeCell(file_object, 68)
+    self.assertEqual(node_cell.size, 8)
+    self.assertEqual(node_cell.data, b'cccc')
+
+    cached_node_cell = test_file._ReadNodeCell(file_object, 68)
+    self.assertIs(cached_node_cell, node_cell)
+
+  def testReadFileObject(self):
+    """Tests the ReadFileObject."""
+    file_object = io.BytesIO(self._REPOSITORY_FILE_DATA)
+
+    test_file = wmi_repository.RepositoryFile()
+    test_file.ReadFileObject(file_object)
+
+    self.assertEqual(list(test_file._node_cell_offsets), [40, 52, 68])
+    self.assertEqual(test_file._root_namespace_node_offset, 72)
+    self.assertEqual(test_file._system_class_definition_root_node_offset, 56)
+
+    output_writer = test_lib.TestOutputWriter()
+    test_file = wmi_repository.RepositoryFile(
+        debug=True, output_writer=output_writer)
+    test_file.ReadFileObject(file_object)
+
+    self.assertEqual(list(test_file._node_cell_offsets), [40, 52, 68])
+    self.assertEqual(test_file._root_namespace_node_offset, 72)
+    self.assertEqual(test_file._system_class_definition_root_node_offset, 56)
+
+
+class CIMRepositoryTest(test_lib.BaseTestCase):
+  """CIM repository tests."""
+
+  # pylint: disable=protected-access
+
+  def testGetActiveMappingFile(self):
+    """Tests the _GetActiveMappingFile function."""
+    test_path = self._GetTestFilePath(['cim'])
+    test_file_path = self._GetTestFilePath(['cim', 'MAPPING1.MAP'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    output_writer = test_lib.TestOutputWriter()
+    cim_repository = wmi_repository.CIMRepository(output_writer=output_writer)
+
+    mapping_file = cim_repository._GetActiveMappingFile(test_path)
+    self.assertIsNotNone(mapping_file)
+
+    try:
+      self.assertEqual(mapping_file.sequence_number, 8592)
+      self.assertIsNotNone(mapping_file.GetObjectsMappingTable())
+    finally:
+      mapping_file.Close()
+
+  def testGetEventConsumerBindings(self):
+    """Tests the GetEventConsumerBindings function."""
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.format_version = '2.2'
+
+    def _CreateInstance(class_name, properties):
+      instance = wmi_repository.Instance()
+      instance.class_name = class_name
+      instance.properties = properties
+      return instance
+
+    namespace_instance = _CreateInstance('__NAMESPACE', {'Name': 'Custom'})
+
+    namespace_hash = cim_repository._GetHashFromString('ROOT\\Custom')
+    binding_class_hash = cim_repository._GetHashFromString(
+        '__FilterToConsumerBinding')
+    filter_class_hash = cim_repository._GetHashFromString('__EventFilter')
+    command_line_class_hash = cim_repository._GetHashFromString(
+        'CommandLineEventConsumer')
+    active_script_class_hash = cim_repository._GetHashFromString(
+        'ActiveScriptEventConsumer')
+
+    instances = {
+        'binding1': _CreateInstance('__FilterToConsumerBinding', {
+            'Consumer': 'CommandLineEventConsumer.Name="My Consumer"',
+            'Filter': '__EventFilter.Name="my filter"'}),
+        'binding2': _CreateInstance('__FilterToConsumerBinding', {
+            'Consumer': (
+                '\\\\.\\ROOT\\Custom:ActiveScriptEventConsumer.'
+                'Name="my consumer"'),
+            'Filter': '__EventFilter.Name="Missing"'}),
+        'filter': _CreateInstance('__EventFilter', {'Name': 'My Filter'}),
+        'command_line': _CreateInstance(
+            'CommandLineEventConsumer', {'Name': 'my consumer'}),
+        'active_script': _CreateInstance(
+            'ActiveScriptEventConsumer', {'Name': 'My Consumer'})}
+
+    root_namespace_hash = cim_repository._GetHashFromString('ROOT')
+    namespace_class_hash = cim_repository._GetHashFromString('__NAMESPACE')
+
+    object_record_values_per_class = {
+        (namespace_hash, binding_class_hash): ['binding1', 'binding2'],
+        (namespace_hash, filter_class_hash): ['filter'],
+        (namespace_hash, command_line_class_hash): ['command_line'],
+        (namespace_hash, active_script_class_hash): ['active_script'],
+        (root_namespace_hash, namespace_class_hash): [
+            ('I', 1, 1, 100)]}
+
+    instances[('I', 1, 1, 100)] = namespace_instance
+
+    namespace_lookups = []
+
+    def _GetInstanceObjectRecordValuesByClass(
+        lookup_namespace_hash, class_name_hash):
+      if class_name_hash == namespace_class_hash:
+        namespace_lookups.append(lookup_namespace_hash)
+
+      return object_record_values_per_class.get(
+          (lookup_namespace_hash, class_name_hash), [])
+
+    cim_repository._index_binary_tree_file = True
+    cim_repository._objects_data_file = True
+
+    cim_repository._GetInstanceObjectRecordValuesByClass = (
+        _GetInstanceObjectRecordValuesByClass)
+    cim_repository._GetNamespaceHashesFromIndex = lambda: [namespace_hash]
+    cim_repository._GetSubClassNameHashes = lambda _, __: [
+        active_script_class_hash, command_line_class_hash]
+    cim_repository._ReadInstanceFromObjectRecordValues = instances.get
+
+    event_consumer_bindings = list(cim_repository.GetEventConsumerBindings())
+    self.assertEqual(len(event_consumer_bindings), 2)
+
+    # Only the namespace instances of ROOT are needed to resolve ROOT\Custom.
+    self.assertEqual(namespace_lookups, [root_namespace_hash])
+
+    event_consumer_binding = event_consumer_bindings[0]
+    self.assertEqual(event_consumer_binding.namespace, 'ROOT\\Custom')
+    self.assertEqual(event_consumer_binding.namespace_hash, namespace_hash)
+    self.assertIs(event_consumer_binding.binding, instances['binding1'])
+    self.assertIs(event_consumer_binding.filter, instances['filter'])
+    self.assertIs(event_consumer_binding.consumer, instances['command_line'])
+
+    event_consumer_binding = event_consumer_bindings[1]
+    self.assertEqual(event_consumer_binding.namespace, 'ROOT\\Custom')
+    self.assertIsNone(event_consumer_binding.filter)
+    self.assertIs(event_consumer_binding.consumer, instances['active_script'])
+
+    # The resolved namespaces are cached.
+    event_consumer_bindings = list(cim_repository.GetEventConsumerBindings())
+    self.assertEqual(len(event_consumer_bindings), 2)
+    self.assertEqual(namespace_lookups, [root_namespace_hash])
+
+  def testGetFirstKeyFromIndex(self):
+    """Tests the _GetFirstKeyFromIndex function."""
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.BTR'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.Open(test_file_path)
+
+    try:
+      index_key = cim_repository._GetFirstKeyFromIndex('\\NS_')
+      self.assertEqual(index_key, (
+          '\\NS_0E275507EB154D8A9953FFC0338321EF'
+          '\\CD_6BE08A2E17BAE8A635AB3E1B0D9C9CF2.453.1.57001'))
+
+      index_key = cim_repository._GetFirstKeyFromIndex('\\X')
+      self.assertIsNone(index_key)
+
+    finally:
+      cim_repository.Close()
+
+  def testGetHashFromString(self):
+    """Tests the _GetHashFromString function."""
+    cim_repository = wmi_repository.CIMRepository()
+
+    cim_repository.format_version = '2.1'
+    string_hash = cim_repository._GetHashFromString('__NAMESPACE')
+    self.assertEqual(string_hash, 'e5844d1645b0b6e6f2af610eb14bfc34')
+
+    cim_repository.format_version = '2.2'
+    string_hash = cim_repository._GetHashFromString('__NAMESPACE')
+    self.assertEqual(string_hash, (
+        '64659ab9f8f1c4b568db6438bae11b26ee8f93cb5f8195e21e8c383d6c44cc41'))
+
+    self.assertEqual(len(cim_repository._string_hashes), 2)
+
+  def testGetHashesFromStrings(self):
+    """Tests the _GetHashesFromStrings function."""
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.format_version = '2.1'
+
+    string_hashes = cim_repository._GetHashesFromStrings([
+        '__NAMESPACE', 'ROOT'])
+    self.assertEqual(len(string_hashes), 2)
+    self.assertEqual(
+        string_hashes['__NAMESPACE'], 'e5844d1645b0b6e6f2af610eb14bfc34')
+
+  def testGetIndexKeys(self):
+    """Tests the GetIndexKeys function."""
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.BTR'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.Open(test_file_path)
+
+    try:
+      index_keys = list(cim_repository.GetIndexKeys())
+    finally:
+      cim_repository.Close()
+
+    self.assertEqual(len(index_keys), 10288)
+    self.assertEqual(index_keys[0], (
+        '\\NS_86C68CC88277F15FBE6F6D9A6A2F560A'
+        '\\CR_C01894CC18600DA20F2D9BDE9C0BE9FA'
+        '\\C_02F5B889FF285CF85922906D9EAD88B1'))
+
+  def testGetInstanceObjectRecordValuesByClass(self):
+    """Tests the _GetInstanceObjectRecordValuesByClass function."""
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.BTR'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.Open(test_file_path)
+
+    try:
+      object_record_values = list(
+          cim_repository._GetInstanceObjectRecordValuesByClass(
+              'e98854f51c0c7d3ba51357d7346c8d70',
+              cim_repository._GetHashFromString('__FilterToConsumerBinding')))
+    finally:
+      cim_repository.Close()
+
+    self.assertEqual(object_record_values, [
+        ('IL', 515, 699418, 344), ('IL', 527, 686618, 247)])
+
+  def testGetKeysFromIndexByPrefix(self):
+    """Tests the _GetKeysFromIndexByPrefix function."""
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.BTR'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.Open(test_file_path)
+
+    key_prefix = '\\NS_E98854F51C0C7D3BA51357D7346C8D70\\CI_'
+
+    try:
+      expected_index_keys = sorted(
+          index_key for index_key in cim_repository.GetIndexKeys()
+          if index_key.startswith(key_prefix))
+
+      index_keys = list(cim_repository._GetKeysFromIndexByPrefix(key_prefix))
+      self.assertEqual(len(index_keys), 42)
+      self.assertEqual(index_keys, expected_index_keys)
+
+      index_keys = list(cim_repository._GetKeysFromIndexByPrefix('\\X'))
+      self.assertEqual(index_keys, [])
+
+    finally:
+      cim_repository.Close()
+
+  def testGetKeysFromIndexByRange(self):
+    """Tests the _GetKeysFromIndexByRange function."""
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.BTR'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.Open(test_file_path)
+
+    try:
+      expected_index_keys = sorted(cim_repository.GetIndexKeys())
+
+      index_keys = list(cim_repository._GetKeysFromIndexByRange('\\NS_'))
+      self.assertEqual(index_keys, expected_index_keys)
+
+      first_key = expected_index_keys[1000]
+      last_key = expected_index_keys[2000]
+
+      index_keys = list(cim_repository._GetKeysFromIndexByRange(
+          first_key, last_key=last_key))
+      self.assertEqual(index_keys, expected_index_keys[1000:2000])
+
+    finally:
+      cim_repository.Close()
+
+  def testGetNamespaceHashesFromIndex(self):
+    """Tests the _GetNamespaceHashesFromIndex function."""
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.BTR'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.Open(test_file_path)
+
+    try:
+      namespace_hashes = list(cim_repository._GetNamespaceHashesFromIndex())
+    finally:
+      cim_repository.Close()
+
+    self.assertEqual(len(namespace_hashes), 34)
+    self.assertEqual(namespace_hashes, sorted(namespace_hashes))
+    self.assertIn('e98854f51c0c7d3ba51357d7346c8d70', namespace_hashes)
+
+  def testGetNamespacesByHash(self):
+    """Tests the _GetNamespacesByHash function."""
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.format_version = '2.2'
+
+    namespace_lookups = []
+
+    def _GetInstanceObjectRecordValuesByClass(namespace_hash, _):
+      namespace_lookups.append(namespace_hash)
+      return []
+
+    cim_repository._GetInstanceObjectRecordValuesByClass = (
+        _GetInstanceObjectRecordValuesByClass)
+
+    root_namespace_hash = cim_repository._GetHashFromString('ROOT')
+    cimv2_namespace_hash = cim_repository._GetHashFromString('ROOT\\CIMV2')
+    unknown_namespace_hash = cim_repository._GetHashFromString('ROOT\\Bogus')
+
+    namespaces_per_hash = cim_repository._GetNamespacesByHash([
+        cimv2_namespace_hash, unknown_namespace_hash])
+    self.assertEqual(namespaces_per_hash, {
+        cimv2_namespace_hash: 'ROOT\\CIMV2'})
+    self.assertEqual(namespace_lookups, [root_namespace_hash])
+
+    # A namespace hierarchy without namespace instances is not traversed again.
+    namespaces_per_hash = cim_repository._GetNamespacesByHash([
+        unknown_namespace_hash])
+    self.assertEqual(namespaces_per_hash, {})
+    self.assertEqual(namespace_lookups, [root_namespace_hash])
+
+  def testGetSubClassNameHashes(self):
+    """Tests the _GetSubClassNameHashes function."""
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.BTR'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.Open(test_file_path)
+
+    try:
+      class_name_hashes = cim_repository._GetSubClassNameHashes(
+          'e98854f51c0c7d3ba51357d7346c8d70',
+          cim_repository._GetHashFromString('__EventConsumer'))
+    finally:
+      cim_repository.Close()
+
+    self.assertEqual(len(class_name_hashes), 9)
+    self.assertEqual(class_name_hashes[0], 'a096ec58b7844a8139a37b838e4def6b')
+    self.assertIn('e6c579f59fcbd59f5f40d32f3a505e0a', class_name_hashes)
+
+  def testGetInstancesWithWorkers(self):
+    """Tests the GetInstances function with worker processes."""
+    if multiprocessing.get_start_method() != 'fork':
+      raise unittest.SkipTest('requires the fork start method')
+
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.BTR'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    def _ReadInstanceFromObjectRecordValues(_, object_record_values):
+      data_type, mapped_page_number, record_identifier, data_size = (
+          object_record_values)
+
+      instance = wmi_repository.Instance()
+      instance.class_name = f'{data_type:s}{mapped_page_number:d}'
+      instance.derivation = []
+      instance.dynasty = instance.class_name
+      instance.super_class_name = None
+      instance.properties = {
+          'RecordIdentifier': record_identifier, 'DataSize': data_size}
+      return instance
+
+    # The worker processes are forked and inherit the synthetic instance
+    # object records.
+    read_instance_function = (
+        wmi_repository.CIMRepository._ReadInstanceFromObjectRecordValues)
+    wmi_repository.CIMRepository._ReadInstanceFromObjectRecordValues = (
+        _ReadInstanceFromObjectRecordValues)
+
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.Open(test_file_path)
+
+    try:
+      expected_instances = [
+          (instance.class_name, instance.properties)
+          for instance in cim_repository.GetInstances()]
+
+      instances = [
+          (instance.class_name, instance.properties)
+          for instance in cim_repository.GetInstances(number_of_workers=2)]
+      self.assertEqual(instances, expected_instances)
+
+      instances = [
+          (instance.class_name, instance.properties)
+          for instance in cim_repository.GetInstances(
+              number_of_workers=2, ordered=False)]
+
+    finally:
+      cim_repository.Close()
+      wmi_repository.CIMRepository._ReadInstanceFromObjectRecordValues = (
+          read_instance_function)
+
+    self.assertGreater(len(expected_instances), 256)
+
+    def _GetSortKey(instance_values):
+      class_name, properties = instance_values
+      return class_name, properties['RecordIdentifier']
+
+    self.assertEqual(
+        sorted(instances, key=_GetSortKey),
+        sorted(expected_instances, key=_GetSortKey))
+
+  def testParseObjectPath(self):
+    """Tests the _ParseObjectPath function."""
+    cim_repository = wmi_repository.CIMRepository()
+
+    class_name, name = cim_repository._ParseObjectPath(
+        '__EventFilter.Name="SCM Event Log Filter"')
+    self.assertEqual(class_name, '__EventFilter')
+    self.assertEqual(name, 'SCM Event Log Filter')
+
+    class_name, name = cim_repository._ParseObjectPath((
+        '\\\\.\\ROOT\\subscription:CommandLineEventConsumer.'
+        'Name="C:\\\\a \\"b\\""'))
+    self.assertEqual(class_name, 'CommandLineEventConsumer')
+    self.assertEqual(name, 'C:\\a "b"')
+
+    class_name, name = cim_repository._ParseObjectPath('MyClass=@')
+    self.assertEqual(class_name, 'MyClass')
+    self.assertIsNone(name)
+
+    class_name, name = cim_repository._ParseObjectPath(None)
+    self.assertIsNone(class_name)
+    self.assertIsNone(name)
+
+  def testReadNamespacesFromObjectRecords(self):
+    """Tests the _ReadNamespacesFromObjectRecords function."""
+    cim_repository = wmi_repository.CIMRepository()
+    cim_repository.format_version = '2.2'
+
+    instances_per_parent = {}
+
+    parent_namespace = 'ROOT'
+    for name in ('a', 'b', 'c', 'd', 'e', 'f', 'g'):
+      instance = wmi_repository.Instance()
+      instance.properties['Name'] = name
+
+      parent_namespace_hash = cim_repository._GetHashFromString(
+          parent_namespace)
+      instances_per_parent[parent_namespace_hash] = [instance]
+
+      parent_namespace = '\\'.join([parent_namespace, name])
+
+    cim_repository._ReadNamespaceInstancesPerParent = (
+        lambda: instances_per_parent)
+
+    cim_repository._ReadNamespacesFromObjectRecords()
+
+    namespaces = [
+        instance.namespace for instance in cim_repository._namespace_instances]
+    self.assertEqual(len(namespaces), 7)
+    self.assertEqual(namespaces[0], 'ROOT\\a')
+    self.assertEqual(namespaces[-1], 'ROOT\\a\\b\\c\\d\\e\\f\\g')
 
 
 if __name__ == '__main__':